@@ -4,6 +4,9 @@ from infrastructure.broker.amqp_handler import amqp_process
 from infrastructure.config.config import settings
 from infrastructure.server.server import Server
 from presentation.auth import AuthRouter
+from presentation.authz import AuthzRouter
+from presentation.jwks import JWKSRouter
+from presentation.metrics import MetricsRouter
 from presentation.permission import PermissionRouter
 from presentation.role import RoleRouter
 from presentation.user import UserRouter
@@ -15,18 +18,34 @@ auth_service = Server(
         RoleRouter().api_router,
         PermissionRouter().api_router,
         AuthRouter().api_router,
+        AuthzRouter().api_router,
+        MetricsRouter().api_router,
+        JWKSRouter().api_router,
     ],
     start_callbacks=[
         amqp_process.start,
         background_process.start,
         Container.producer_client().connect,
         Container.consumer_client().connect,
+        Container.auth_handler().scripts.load,
+        Container.session_cache().start,
+        Container.generation_cache().start,
+        Container.permission_near_cache().start,
+        Container.revocations().start,
     ],
     stop_callbacks=[
-        Container.redis().close,
+        Container.user_import_jobs().stop,
+        # Redis listeners first: they close their pub/sub and stream connections
+        Container.session_cache().stop,
+        Container.generation_cache().stop,
+        Container.permission_near_cache().stop,
+        Container.revocations().stop,
+        Container.redis().aclose,
+        Container.hash_pool().shutdown,
         Container.producer_client().disconnect,
         Container.consumer_client().disconnect,
         amqp_process.close,
         background_process.close,
     ],
+    default_response_class=Container.response_serializer().response_class,
 ).app
@@ -0,0 +1,227 @@
+"""
+Compare batched bitset authorization checks with walking the role relationships.
+
+    python -m application.commands.bench_authz_checks --users 100 --roles-per-user 40 --checks 1000
+
+Seeds roles with random permission sets and users holding `--roles-per-user`
+of them inside a transaction that is rolled back afterwards; the permission
+bit index lives under a scratch Redis key that is deleted at the end. A
+batch of random (user, permission) checks is answered by AuthzService.check
+with a cold and a warm cache, and by loading each user's roles and their
+permissions and walking them, with and without the load. The command fails
+if any decision differs between the two.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from application.commands.scratch_database import QueryStats, ScratchDatabase
+from application.container import Container
+from domain.authz.registry import AuthzReadRepository
+from domain.authz.schema import AuthzCheck, AuthzCheckBatch
+from infrastructure.auth.permission_bits import PermissionBitIndex
+from infrastructure.database.models import Permission, Role, RolePermission, User, UserRole
+from service.authz import AuthzService
+
+
+async def _seed(
+    database: ScratchDatabase,
+    rng: random.Random,
+    users: int,
+    roles: int,
+    roles_per_user: int,
+    permissions: int,
+    permissions_per_role: int,
+) -> tuple[list[UUID], list[UUID]]:
+    connection = database.connection
+    role_uuids = [uuid.uuid4() for _ in range(roles)]
+    permission_uuids = [uuid.uuid4() for _ in range(permissions)]
+    await connection.execute(
+        insert(Role),
+        [
+            {"uuid": role_uuid, "name": f"{database.prefix}{number}", "jdata": {}}
+            for number, role_uuid in enumerate(role_uuids)
+        ],
+    )
+    await connection.execute(
+        insert(Permission),
+        [
+            {
+                "uuid": permission_uuid,
+                "name": f"{database.prefix}{number}",
+                "layer": "backend",
+                "jdata": {},
+            }
+            for number, permission_uuid in enumerate(permission_uuids)
+        ],
+    )
+    await connection.execute(
+        insert(RolePermission),
+        [
+            {"role_uuid": role_uuid, "permission_uuid": permission_uuid}
+            for role_uuid in role_uuids
+            for permission_uuid in rng.sample(permission_uuids, permissions_per_role)
+        ],
+    )
+    user_uuids = await database.seed_users(users, returning=True)
+    await connection.execute(
+        insert(UserRole),
+        [
+            {"user_uuid": user_uuid, "role_uuid": role_uuid}
+            for user_uuid in user_uuids
+            for role_uuid in rng.sample(role_uuids, roles_per_user)
+        ],
+    )
+    return user_uuids, permission_uuids
+
+
+async def _load_users(
+    database: ScratchDatabase, checks: AuthzCheckBatch
+) -> dict[UUID, User]:
+    stmt = (
+        select(User)
+        .where(User.uuid.in_({check.user_uuid for check in checks.checks}))
+        .options(selectinload(User.roles).selectinload(Role.permissions))
+    )
+    async with database.async_session_factory() as session:
+        return {user.uuid: user for user in (await session.execute(stmt)).scalars()}
+
+
+def _walk(users: dict[UUID, User], checks: AuthzCheckBatch) -> list[bool]:
+    return [
+        any(
+            permission.uuid == check.permission_uuid
+            for role in users[check.user_uuid].roles
+            for permission in role.permissions
+        )
+        for check in checks.checks
+    ]
+
+
+async def _measure(
+    stats: QueryStats,
+    run: Callable[[], Awaitable[Any]],
+    rounds: int,
+    before: Optional[Callable[[], Awaitable[Any]]] = None,
+) -> tuple[int, float]:
+    latencies, statements = [], 0
+    for _ in range(rounds):
+        if before:
+            await before()
+        stats.reset()
+        started = time.perf_counter()
+        await run()
+        latencies.append(time.perf_counter() - started)
+        statements = stats.statements
+    return statements, statistics.median(latencies)
+
+
+async def run(args: argparse.Namespace) -> bool:
+    rng = random.Random(args.seed)
+    redis_client = Container.redis()
+    permission_cache = Container.permission_cache()
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        user_uuids, permission_uuids = await _seed(
+            database,
+            rng,
+            users=args.users,
+            roles=args.roles,
+            roles_per_user=args.roles_per_user,
+            permissions=args.permissions,
+            permissions_per_role=args.permissions_per_role,
+        )
+        permission_bits = PermissionBitIndex(
+            redis_client=redis_client,
+            key=f"authz:bench:{database.prefix}permission_bits",
+        )
+        service = AuthzService(
+            read_repository=AuthzReadRepository(session_manager=database),
+            write_repository=None,
+            permission_cache=permission_cache,
+            permission_bits=permission_bits,
+            auth_handler=None,
+            kafka_handler=None,
+        )
+        checks = AuthzCheckBatch(
+            checks=[
+                AuthzCheck(
+                    user_uuid=rng.choice(user_uuids),
+                    permission_uuid=rng.choice(permission_uuids),
+                )
+                for _ in range(args.checks)
+            ]
+        )
+        stats = QueryStats(database.connection)
+        try:
+            decisions = [
+                decision.allowed for decision in (await service.check(checks)).results
+            ]
+            users = await _load_users(database, checks)
+            walked = _walk(users, checks)
+
+            async def cold_cache() -> None:
+                await permission_cache.invalidate(*user_uuids)
+
+            async def walk_loaded() -> None:
+                _walk(users, checks)
+
+            async def load_and_walk() -> None:
+                _walk(await _load_users(database, checks), checks)
+
+            cases = {
+                "bitset cold": await _measure(
+                    stats, lambda: service.check(checks), args.rounds, cold_cache
+                ),
+                "bitset warm": await _measure(
+                    stats, lambda: service.check(checks), args.rounds
+                ),
+                "walk": await _measure(stats, load_and_walk, args.rounds),
+                "walk loaded": await _measure(stats, walk_loaded, args.rounds),
+            }
+        finally:
+            await permission_cache.invalidate(*user_uuids)
+            await redis_client.delete(permission_bits.key)
+
+    print(
+        f"{len(checks.checks)} checks over {args.users} users with {args.roles_per_user} roles each, "
+        f"{sum(decisions)} allowed"
+    )
+    print(f"{'path':<12} {'statements':>10} {'median ms':>10} {'us/check':>9}")
+    for name, (statements, latency) in cases.items():
+        print(
+            f"{name:<12} {statements:>10} {latency * 1e3:>10.2f} {latency / len(checks.checks) * 1e6:>9.2f}"
+        )
+    if mismatches := sum(left != right for left, right in zip(decisions, walked)):
+        print(f"{mismatches} decisions differ from the relationship walk")
+    return not mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--roles", type=int, default=200)
+    parser.add_argument("--roles-per-user", type=int, default=40)
+    parser.add_argument("--permissions", type=int, default=500)
+    parser.add_argument("--permissions-per-role", type=int, default=20)
+    parser.add_argument(
+        "--checks", type=int, default=1000, help="checks per batch, at most 1000"
+    )
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compare the login credential projection with the entity load it replaced.
+
+    python -m application.commands.bench_credentials --roles 50 --members 100 --permissions 20
+
+Seeds one user holding `--roles` roles, each shared with `--members` other
+users and granting `--permissions` permissions, inside a transaction that
+is rolled back afterwards. It then reports statements, result rows, the
+text size of the returned values and latency for
+UserReadRepository.get_credentials_by_login and for the User load that
+eagerly joined roles with their users and permissions.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload
+
+from application.commands.scratch_database import QueryStats, ScratchDatabase
+from application.container import Container
+from domain.user.registry import UserReadRepository
+from infrastructure.database.models import Permission, Role, RolePermission, User, UserRole
+
+
+async def _seed(
+    database: ScratchDatabase, roles: int, members: int, permissions: int
+) -> str:
+    connection = database.connection
+    role_uuids = [uuid.uuid4() for _ in range(roles)]
+    permission_uuids = [uuid.uuid4() for _ in range(permissions)]
+    await connection.execute(
+        insert(Role),
+        [
+            {"uuid": role_uuid, "name": f"{database.prefix}{number}", "jdata": {}}
+            for number, role_uuid in enumerate(role_uuids)
+        ],
+    )
+    await connection.execute(
+        insert(Permission),
+        [
+            {
+                "uuid": permission_uuid,
+                "name": f"{database.prefix}{number}",
+                "layer": "backend",
+                "jdata": {},
+            }
+            for number, permission_uuid in enumerate(permission_uuids)
+        ],
+    )
+    user_uuids = await database.seed_users(members + 1, returning=True)
+    await connection.execute(
+        insert(UserRole),
+        [
+            {"user_uuid": user_uuid, "role_uuid": role_uuid}
+            for user_uuid in user_uuids
+            for role_uuid in role_uuids
+        ],
+    )
+    await connection.execute(
+        insert(RolePermission),
+        [
+            {"role_uuid": role_uuid, "permission_uuid": permission_uuid}
+            for role_uuid in role_uuids
+            for permission_uuid in permission_uuids
+        ],
+    )
+    return f"{database.prefix}1"
+
+
+async def _entity_load(database: ScratchDatabase, login: str) -> User:
+    # What authentication loaded while every relationship was lazy="joined"
+    stmt = (
+        select(User)
+        .where(User.login == login)
+        .options(
+            joinedload(User.roles).joinedload(Role.users),
+            joinedload(User.roles).joinedload(Role.permissions),
+        )
+    )
+    async with database.async_session_factory() as session:
+        return (await session.execute(stmt)).scalars().unique().first()
+
+
+async def _measure(
+    stats: QueryStats, load: Callable[[], Awaitable[Any]], rounds: int
+) -> tuple[tuple[int, int, int], float]:
+    stats.reset()
+    await load()
+    counted = (stats.statements, stats.rows, stats.bytes)
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await load()
+        latencies.append(time.perf_counter() - started)
+    return counted, statistics.median(latencies)
+
+
+async def run(roles: int, members: int, permissions: int, rounds: int) -> None:
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        login = await _seed(database, roles, members, permissions)
+        stats = QueryStats(database.connection)
+        repository = UserReadRepository(session_manager=database)
+        cases = {
+            "projection": lambda: repository.get_credentials_by_login(login=login),
+            "entity load": lambda: _entity_load(database, login),
+        }
+        print(
+            f"{'path':<12} {'statements':>10} {'rows':>8} {'bytes':>10} {'median ms':>10}"
+        )
+        for name, load in cases.items():
+            (statements, rows, size), latency = await _measure(stats, load, rounds)
+            print(
+                f"{name:<12} {statements:>10} {rows:>8} {size:>10} {latency * 1e3:>10.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", type=int, default=50)
+    parser.add_argument("--members", type=int, default=100, help="other users per role")
+    parser.add_argument(
+        "--permissions", type=int, default=20, help="permissions per role"
+    )
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.roles, args.members, args.permissions, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Measure SQL statements, result rows, peak memory and latency of each read endpoint per loader profile.
+
+    python -m application.commands.bench_loaders --roles 5 --members 1000 --permissions 20
+
+Seeds `--roles` roles, each held by the same `--members` users and granting
+the same `--permissions` permissions, inside a transaction that is rolled
+back afterwards. Every read repository method behind a GET endpoint is then
+run with each LoaderProfile it accepts (and the column projection where the
+endpoint has one), next to the role listing as it was while every
+relationship was lazy="joined". Peak memory is traced with tracemalloc.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import joinedload
+
+from application.commands.scratch_database import QueryStats, ScratchDatabase
+from application.container import Container
+from domain.permission.registry import PermissionReadRepository
+from domain.role.registry import RoleReadRepository
+from domain.user.registry import UserReadRepository
+from infrastructure.database.loaders import LoaderProfile
+from infrastructure.database.models import Permission, Role, RolePermission, UserRole
+
+
+async def _seed(
+    database: ScratchDatabase, roles: int, members: int, permissions: int
+) -> tuple[list[uuid.UUID], list[uuid.UUID], list[uuid.UUID]]:
+    connection = database.connection
+    role_uuids = [uuid.uuid4() for _ in range(roles)]
+    permission_uuids = [uuid.uuid4() for _ in range(permissions)]
+    await connection.execute(
+        insert(Role),
+        [
+            {"uuid": role_uuid, "name": f"{database.prefix}{number}", "jdata": {}}
+            for number, role_uuid in enumerate(role_uuids)
+        ],
+    )
+    await connection.execute(
+        insert(Permission),
+        [
+            {
+                "uuid": permission_uuid,
+                "name": f"{database.prefix}{number}",
+                "layer": "backend",
+                "jdata": {},
+            }
+            for number, permission_uuid in enumerate(permission_uuids)
+        ],
+    )
+    await connection.execute(
+        insert(RolePermission),
+        [
+            {"role_uuid": role_uuid, "permission_uuid": permission_uuid}
+            for role_uuid in role_uuids
+            for permission_uuid in permission_uuids
+        ],
+    )
+    user_uuids = await database.seed_users(members, returning=True)
+    for start in range(0, members, 10000):
+        await connection.execute(
+            insert(UserRole),
+            [
+                {"user_uuid": user_uuid, "role_uuid": role_uuid}
+                for user_uuid in user_uuids[start : start + 10000]
+                for role_uuid in role_uuids
+            ],
+        )
+    await database.analyze(
+        "roles", "permissions", "role_permissions", "user_roles", "users"
+    )
+    return role_uuids, user_uuids, permission_uuids
+
+
+async def _eager_role_list(database: ScratchDatabase) -> list[Role]:
+    # GET /role/all while Role.users and Role.permissions were lazy="joined"
+    stmt = select(Role).options(joinedload(Role.users), joinedload(Role.permissions))
+    async with database.async_session_factory() as session:
+        return (await session.execute(stmt)).scalars().unique().all()
+
+
+async def _measure(
+    stats: QueryStats, load: Callable[[], Awaitable[Any]], rounds: int
+) -> tuple[int, int, float, float]:
+    stats.reset()
+    tracemalloc.start()
+    await load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    statements, rows = stats.statements, stats.rows
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await load()
+        latencies.append(time.perf_counter() - started)
+    return statements, rows, peak, statistics.median(latencies)
+
+
+async def run(args: argparse.Namespace) -> None:
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        role_uuids, user_uuids, permission_uuids = await _seed(
+            database, args.roles, args.members, args.permissions
+        )
+        roles = RoleReadRepository(session_manager=database)
+        users = UserReadRepository(session_manager=database)
+        permissions = PermissionReadRepository(session_manager=database)
+        cases: dict[str, Callable[[], Awaitable[Any]]] = {
+            "/role/all": lambda: roles.get_list(),
+            "/role/all projection": lambda: roles.get_list(projection=True),
+        }
+        if not args.skip_eager:
+            cases["/role/all eager (before)"] = lambda: _eager_role_list(database)
+        endpoints: dict[str, Callable[[LoaderProfile], Awaitable[Any]]] = {
+            "/role/one": lambda profile: roles.get(
+                role_uuid=role_uuids[0], loader=profile
+            ),
+            "/user/all": lambda profile: users.get_list(loader=profile),
+            "/user/one": lambda profile: users.get(
+                user_uuid=user_uuids[0], loader=profile
+            ),
+            "/permission/all": lambda profile: permissions.get_list(loader=profile),
+            "/permission/one": lambda profile: permissions.get(
+                perm_uuid=permission_uuids[0], loader=profile
+            ),
+        }
+        projections = {"/user/all": users, "/permission/all": permissions}
+        for endpoint, load in endpoints.items():
+            for profile in LoaderProfile:
+                cases[f"{endpoint} {profile.value}"] = (
+                    lambda load=load, profile=profile: load(profile)
+                )
+            if repository := projections.get(endpoint):
+                cases[f"{endpoint} projection"] = (
+                    lambda repository=repository: repository.get_list(projection=True)
+                )
+
+        stats = QueryStats(database.connection)
+        print(
+            f"{'endpoint / loader':<28} {'statements':>10} {'rows':>9} {'peak MiB':>9} {'median ms':>10}"
+        )
+        for name, load in cases.items():
+            statements, rows, peak, latency = await _measure(stats, load, args.rounds)
+            print(
+                f"{name:<28} {statements:>10} {rows:>9} {peak / 2**20:>9.1f} {latency * 1e3:>10.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", type=int, default=5)
+    parser.add_argument(
+        "--members", type=int, default=1000, help="users holding every role"
+    )
+    parser.add_argument(
+        "--permissions", type=int, default=20, help="permissions of every role"
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--skip-eager",
+        action="store_true",
+        help="leave out the eager role listing, which grows with roles x members x permissions",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
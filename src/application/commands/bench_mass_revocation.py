@@ -0,0 +1,188 @@
+"""
+Compare revoking tokens through generation counters with scanning the session keyspace.
+
+    python -m application.commands.bench_mass_revocation --sessions 1000000 --users 100000 --roles 20
+
+Runs against the configured Redis. Seeds `--sessions` sessions in the
+SessionStore layout for `--users` fresh users, each holding one of `--roles`
+fresh roles. Every scenario (one user, one role, everyone) is revoked twice:
+with one generation INCR, timed together with the first check of a token it
+revokes, and the way it had to be done without generations, by SCANning the
+session keys, reading the owner of every match and deleting the affected
+sessions. The scan only deletes seeded sessions, and the "everyone" counter
+is a scratch key, so live sessions and tokens are untouched. All keys
+created here are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Callable, Optional
+
+from redis.asyncio import Redis
+
+from application.container import Container
+from infrastructure.auth.generations import GenerationRegistry
+from infrastructure.auth.session_store import SESSION_PREFIX, SESSION_VERSION, SessionStore
+
+BATCH = 10000
+
+
+async def _seed(
+    sessions: SessionStore, user_uuids: list[str], count: int, keys: list[str]
+) -> None:
+    """
+    Seed the sessions, recording every key written in `keys`
+    """
+    redis_client = sessions.redis_client
+    now = int(time.time())
+    keys += [sessions.index_key(user_uuid) for user_uuid in user_uuids]
+    for start in range(0, count, BATCH):
+        pipe = redis_client.pipeline(transaction=False)
+        for number in range(start, min(start + BATCH, count)):
+            user_uuid = user_uuids[number % len(user_uuids)]
+            session_id = uuid.uuid4().hex
+            session_key = sessions.session_key(user_uuid, session_id)
+            pipe.hset(
+                session_key,
+                mapping={
+                    "v": SESSION_VERSION,
+                    "u": user_uuid,
+                    "rt": uuid.uuid4().hex,
+                    "aj": uuid.uuid4().hex,
+                    "c": now,
+                    "e": now + sessions.ttl,
+                },
+            )
+            pipe.expire(session_key, sessions.ttl)
+            pipe.zadd(sessions.index_key(user_uuid), {session_id: now + sessions.ttl})
+            keys.append(session_key)
+        await pipe.execute()
+
+
+async def _scan_revoke(
+    redis_client: Redis, affected: Callable[[str], bool], pattern: str
+) -> tuple[float, int, int]:
+    """
+    SCAN the session keys, read the owner of every match and delete the
+    sessions of affected users
+    """
+    started = time.perf_counter()
+    scanned = deleted = 0
+    batch: list[str] = []
+
+    async def flush() -> int:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in batch:
+            pipe.hget(key, "u")
+        owners = await pipe.execute()
+        doomed = [key for key, owner in zip(batch, owners) if owner and affected(owner)]
+        if doomed:
+            await redis_client.unlink(*doomed)
+        batch.clear()
+        return len(doomed)
+
+    async for key in redis_client.scan_iter(match=pattern, count=1000):
+        scanned += 1
+        batch.append(key)
+        if len(batch) >= 1000:
+            deleted += await flush()
+    deleted += await flush()
+    return time.perf_counter() - started, scanned, deleted
+
+
+async def _bump_and_check(
+    generations: GenerationRegistry, key: str, payload: dict[str, Any]
+) -> tuple[float, Optional[bool]]:
+    started = time.perf_counter()
+    await generations._bump(key)
+    current = await generations.is_current(payload) if payload else None
+    return time.perf_counter() - started, current
+
+
+async def run(args: argparse.Namespace) -> None:
+    auth_handler = Container.auth_handler()
+    sessions, generations = auth_handler.sessions, auth_handler.generations
+    redis_client = auth_handler.redis_client
+    prefix = uuid.uuid4().hex[:6]
+    role_uuids = [str(uuid.uuid4()) for _ in range(args.roles)]
+    user_uuids = [str(uuid.uuid4()) for _ in range(args.users)]
+    role_of = {
+        user_uuid: role_uuids[number % len(role_uuids)]
+        for number, user_uuid in enumerate(user_uuids)
+    }
+    seeded = set(user_uuids)
+    global_key = f"auth:bench:{prefix}:gen:global"
+    scratch_keys = [
+        global_key,
+        *[generations.user_key(user_uuid) for user_uuid in user_uuids[:1]],
+        *[generations.role_key(role_uuid) for role_uuid in role_uuids[:1]],
+    ]
+    keys: list[str] = []
+    try:
+        started = time.perf_counter()
+        await _seed(sessions, user_uuids, args.sessions, keys)
+        print(
+            f"seeded {args.sessions} sessions of {args.users} users in"
+            f" {time.perf_counter() - started:.1f} s; keyspace {await redis_client.dbsize()} keys"
+        )
+        user_uuid, role_uuid = user_uuids[0], role_uuids[0]
+        generation = await generations.current(
+            user_uuid=user_uuid, role_uuids=[role_uuid]
+        )
+        payload = {"sub": user_uuid, "gen": generation}
+        scenarios = [
+            (
+                "one user",
+                generations.user_key(user_uuid),
+                payload,
+                lambda owner: owner == user_uuid,
+                f"{SESSION_PREFIX}{{{user_uuid}}}:*",
+            ),
+            (
+                "one role",
+                generations.role_key(role_uuid),
+                payload,
+                lambda owner: role_of.get(owner) == role_uuid,
+                f"{SESSION_PREFIX}*",
+            ),
+            (
+                "everyone",
+                global_key,
+                None,
+                lambda owner: owner in seeded,
+                f"{SESSION_PREFIX}*",
+            ),
+        ]
+        print(
+            f"{'scenario':<10} {'INCR+check ms':>13} {'revoked':>8}"
+            f" {'scan s':>8} {'scanned':>9} {'deleted':>9}"
+        )
+        for name, key, checked, affected, pattern in scenarios:
+            bump, current = await _bump_and_check(generations, key, checked)
+            elapsed, scanned, deleted = await _scan_revoke(
+                redis_client, affected, pattern
+            )
+            print(
+                f"{name:<10} {bump * 1e3:>13.3f} {'-' if current is None else str(not current):>8}"
+                f" {elapsed:>8.2f} {scanned:>9} {deleted:>9}"
+            )
+    finally:
+        for start in range(0, len(keys), BATCH):
+            await redis_client.unlink(*keys[start : start + BATCH])
+        await redis_client.delete(*scratch_keys)
+        await redis_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--roles", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
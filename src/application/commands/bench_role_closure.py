@@ -0,0 +1,254 @@
+"""
+Measure role closure maintenance and permission resolution on a large role hierarchy.
+
+    python -m application.commands.bench_role_closure --roles 2000 --fanout 8 --extra-parents 200
+
+Seeds `--roles` roles inside a transaction that is rolled back afterwards
+and links them into a tree with `--fanout` children per role plus
+`--extra-parents` random second parents, adding the edges in random order
+through AuthzWriteRepository.add_parent. It then removes `--removals`
+random edges, checking the closure against a breadth-first walk of the
+remaining edges after each phase, and times ancestor and
+effective-permission lookups for users holding leaf roles. The command
+fails if the closure ever disagrees with the walk.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import insert, select
+
+from application.commands.scratch_database import ScratchDatabase
+from application.container import Container
+from domain.authz.registry import AuthzReadRepository, AuthzWriteRepository
+from infrastructure.database.models import Permission, Role, RoleClosure, RolePermission, UserRole
+
+
+def _edges(
+    rng: random.Random, roles: int, fanout: int, extra_parents: int
+) -> list[tuple[int, int]]:
+    # Parents always have a lower number than their children, so no edge closes a cycle
+    edges = {(child, (child - 1) // fanout) for child in range(1, roles)}
+    while len(edges) < roles - 1 + extra_parents:
+        child = rng.randrange(2, roles)
+        edges.add((child, rng.randrange(0, child)))
+    edges = sorted(edges)
+    rng.shuffle(edges)
+    return edges
+
+
+def _expected_closure(
+    role_uuids: list[UUID], edges: set[tuple[int, int]]
+) -> dict[tuple[UUID, UUID], int]:
+    parents: dict[int, list[int]] = {}
+    for child, parent in edges:
+        parents.setdefault(child, []).append(parent)
+    closure = {}
+    for role in range(len(role_uuids)):
+        depth, frontier, seen = 0, [role], set()
+        while frontier:
+            depth += 1
+            reached = []
+            for child in frontier:
+                for parent in parents.get(child, ()):
+                    if parent not in seen:
+                        seen.add(parent)
+                        reached.append(parent)
+                        closure[(role_uuids[role], role_uuids[parent])] = depth
+            frontier = reached
+    return closure
+
+
+async def _closure(
+    database: ScratchDatabase, role_uuids: list[UUID]
+) -> dict[tuple[UUID, UUID], int]:
+    stmt = select(
+        RoleClosure.role_uuid, RoleClosure.inherited_uuid, RoleClosure.depth
+    ).where(RoleClosure.role_uuid.in_(role_uuids))
+    async with database.async_session_factory() as session:
+        rows = (await session.execute(stmt)).all()
+    return {
+        (role_uuid, inherited_uuid): depth for role_uuid, inherited_uuid, depth in rows
+    }
+
+
+async def _timed(calls: list[Callable[[], Awaitable[Any]]]) -> list[float]:
+    latencies = []
+    for call in calls:
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    print(
+        f"{name:<24} {len(latencies):>6} {statistics.median(latencies) * 1e3:>10.2f}"
+        f" {latencies[int(len(latencies) * 0.99)] * 1e3:>10.2f} {sum(latencies):>9.2f}"
+    )
+
+
+async def _seed_grants(
+    database: ScratchDatabase,
+    rng: random.Random,
+    role_uuids: list[UUID],
+    args: argparse.Namespace,
+) -> list[UUID]:
+    permission_uuids = [uuid.uuid4() for _ in range(args.permissions)]
+    await database.connection.execute(
+        insert(Permission),
+        [
+            {
+                "uuid": permission_uuid,
+                "name": f"{database.prefix}{number}",
+                "layer": "backend",
+                "jdata": {},
+            }
+            for number, permission_uuid in enumerate(permission_uuids)
+        ],
+    )
+    await database.connection.execute(
+        insert(RolePermission),
+        [
+            {"role_uuid": role_uuid, "permission_uuid": permission_uuid}
+            for role_uuid in role_uuids
+            for permission_uuid in rng.sample(
+                permission_uuids, args.permissions_per_role
+            )
+        ],
+    )
+    user_uuids = await database.seed_users(args.users, returning=True)
+    leaves = role_uuids[len(role_uuids) // 2 :]
+    await database.connection.execute(
+        insert(UserRole),
+        [
+            {"user_uuid": user_uuid, "role_uuid": role_uuid}
+            for user_uuid in user_uuids
+            for role_uuid in rng.sample(leaves, args.roles_per_user)
+        ],
+    )
+    return user_uuids
+
+
+async def run(args: argparse.Namespace) -> bool:
+    rng = random.Random(args.seed)
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        read_repository = AuthzReadRepository(session_manager=database)
+        write_repository = AuthzWriteRepository(session_manager=database)
+        role_uuids = [uuid.uuid4() for _ in range(args.roles)]
+        await database.connection.execute(
+            insert(Role),
+            [
+                {"uuid": role_uuid, "name": f"{database.prefix}{number}", "jdata": {}}
+                for number, role_uuid in enumerate(role_uuids)
+            ],
+        )
+        edges = _edges(rng, args.roles, args.fanout, args.extra_parents)
+        print(
+            f"{'operation':<24} {'calls':>6} {'median ms':>10} {'p99 ms':>10} {'total s':>9}"
+        )
+        _report(
+            "add_parent",
+            await _timed(
+                [
+                    lambda child=child, parent=parent: write_repository.add_parent(
+                        role_uuid=role_uuids[child], parent_uuid=role_uuids[parent]
+                    )
+                    for child, parent in edges
+                ]
+            ),
+        )
+        closure = await _closure(database, role_uuids)
+        consistent = closure == _expected_closure(role_uuids, set(edges))
+        rows = len(closure)
+
+        removed = rng.sample(edges, min(args.removals, len(edges)))
+        _report(
+            "remove_parent",
+            await _timed(
+                [
+                    lambda child=child, parent=parent: write_repository.remove_parent(
+                        role_uuid=role_uuids[child], parent_uuid=role_uuids[parent]
+                    )
+                    for child, parent in removed
+                ]
+            ),
+        )
+        remaining = set(edges) - set(removed)
+        consistent &= await _closure(database, role_uuids) == _expected_closure(
+            role_uuids, remaining
+        )
+
+        user_uuids = await _seed_grants(database, rng, role_uuids, args)
+        await database.analyze(
+            "role_closure", "role_permissions", "permissions", "user_roles", "users"
+        )
+        _report(
+            "get_ancestors",
+            await _timed(
+                [
+                    lambda role_uuid=role_uuid: read_repository.get_ancestors(
+                        role_uuid=role_uuid
+                    )
+                    for role_uuid in rng.sample(
+                        role_uuids, min(args.lookups, len(role_uuids))
+                    )
+                ]
+            ),
+        )
+        _report(
+            "get_effective",
+            await _timed(
+                [
+                    lambda user_uuid=user_uuid: read_repository.get_effective(
+                        user_uuid=user_uuid
+                    )
+                    for user_uuid in user_uuids
+                ]
+            ),
+        )
+        _report(
+            f"get_effective_many x{len(user_uuids)}",
+            await _timed(
+                [lambda: read_repository.get_effective_many(user_uuids=user_uuids)] * 5
+            ),
+        )
+
+    print(
+        f"{len(edges)} edges, {rows} closure rows; closure matches the edge walk: {consistent}"
+    )
+    return consistent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", type=int, default=2000)
+    parser.add_argument(
+        "--fanout", type=int, default=8, help="children per role in the base tree"
+    )
+    parser.add_argument(
+        "--extra-parents", type=int, default=200, help="edges added on top of the tree"
+    )
+    parser.add_argument("--removals", type=int, default=100)
+    parser.add_argument(
+        "--lookups", type=int, default=200, help="roles whose ancestors are read"
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--roles-per-user", type=int, default=5)
+    parser.add_argument("--permissions", type=int, default=500)
+    parser.add_argument("--permissions-per-role", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
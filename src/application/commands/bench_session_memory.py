@@ -0,0 +1,122 @@
+"""
+Measure Redis memory per session for the baseline JSON blob and the hash record.
+
+    python -m application.commands.bench_session_memory --sessions 10000
+
+Runs against the configured Redis. Writes `--sessions` sessions of fresh
+users in each layout: the baseline one (an orjson blob with both tokens
+under the bare user uuid) and the current one (SessionStore.create, i.e.
+the hash record plus the user's session index). Reports the growth of
+used_memory per session and the mean MEMORY USAGE of the keys of one
+session. All keys created here are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import uuid
+from typing import Awaitable, Callable
+
+import orjson
+from redis.asyncio import Redis
+
+from application.container import Container
+from infrastructure.auth.token_handler import AuthHandler
+
+BATCH = 1000
+
+
+async def _used_memory(redis_client: Redis) -> int:
+    return int((await redis_client.info("memory"))["used_memory"])
+
+
+async def _write_baseline(
+    auth_handler: AuthHandler, user_uuids: list[str]
+) -> list[list[str]]:
+    pipe = auth_handler.redis_client.pipeline(transaction=False)
+    for user_uuid in user_uuids:
+        tokens = {
+            "access_token": auth_handler.encode_token(user_id=user_uuid),
+            "refresh_token": auth_handler.encode_refresh_token(user_id=user_uuid),
+        }
+        pipe.set(
+            auth_handler.sessions.legacy_key(user_uuid),
+            orjson.dumps(tokens),
+            ex=auth_handler.sessions.ttl,
+        )
+    await pipe.execute()
+    return [[auth_handler.sessions.legacy_key(user_uuid)] for user_uuid in user_uuids]
+
+
+async def _write_records(
+    auth_handler: AuthHandler, user_uuids: list[str]
+) -> list[list[str]]:
+    sessions = auth_handler.sessions
+    keys = []
+    for user_uuid in user_uuids:
+        session_id = uuid.uuid4().hex
+        await sessions.create(
+            session_id=session_id,
+            user_uuid=user_uuid,
+            refresh_token=auth_handler.encode_refresh_token(
+                user_id=user_uuid, session_id=session_id
+            ),
+            access_jti=uuid.uuid4().hex,
+        )
+        keys.append(
+            [sessions.session_key(user_uuid, session_id), sessions.index_key(user_uuid)]
+        )
+    return keys
+
+
+async def _measure(
+    auth_handler: AuthHandler,
+    write: Callable[[AuthHandler, list[str]], Awaitable[list[list[str]]]],
+    count: int,
+    samples: int,
+) -> tuple[float, float]:
+    redis_client = auth_handler.redis_client
+    keys: list[list[str]] = []
+    before = await _used_memory(redis_client)
+    try:
+        for start in range(0, count, BATCH):
+            keys += await write(
+                auth_handler,
+                [str(uuid.uuid4()) for _ in range(min(BATCH, count - start))],
+            )
+        grown = await _used_memory(redis_client) - before
+        usage = [
+            sum([await redis_client.memory_usage(key, samples=0) for key in session])
+            for session in keys[:samples]
+        ]
+    finally:
+        for start in range(0, len(keys), BATCH):
+            await redis_client.delete(
+                *[key for session in keys[start : start + BATCH] for key in session]
+            )
+    return grown / count, statistics.fmean(usage)
+
+
+async def run(count: int, samples: int) -> None:
+    auth_handler = Container.auth_handler()
+    print(f"{'layout':<10} {'used_memory B/session':>22} {'MEMORY USAGE B':>15}")
+    try:
+        for name, write in (("baseline", _write_baseline), ("record", _write_records)):
+            grown, usage = await _measure(auth_handler, write, count, samples)
+            print(f"{name:<10} {grown:>22.0f} {usage:>15.0f}")
+    finally:
+        await auth_handler.redis_client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument(
+        "--samples", type=int, default=200, help="sessions read with MEMORY USAGE"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure access token encode and verify cost for each supported signing algorithm.
+
+    python -m application.commands.bench_signing --algorithms HS256 RS256 EdDSA
+
+Every algorithm gets its own KeyRing with a freshly generated key loaded the
+way AUTH.SIGNING_KEYS entries are, so the timings cover the whole
+AuthHandler.encode_token / verify_access_token path including the kid lookup.
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from application.container import Container
+from infrastructure.auth.key_ring import SYMMETRIC_ALGORITHMS, KeyRing
+from infrastructure.config.config import settings
+
+PRIVATE_KEYS = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def _timed(func: Callable[[], Any], min_time: float) -> float:
+    rounds, started = 0, time.perf_counter()
+    while True:
+        func()
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return elapsed / rounds
+
+
+def _key_ring(algorithm: str, directory: Path) -> KeyRing:
+    if algorithm in SYMMETRIC_ALGORITHMS:
+        return KeyRing(secret=uuid.uuid4().hex * 2, algorithm=algorithm)
+    path = directory / f"{algorithm}.pem"
+    path.write_bytes(
+        PRIVATE_KEYS[algorithm]().private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    return KeyRing(
+        secret=settings.AUTH.secret,
+        algorithm=algorithm,
+        keys=[{"kid": algorithm, "algorithm": algorithm, "private_key_path": path}],
+        active_kid=algorithm,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--algorithms",
+        nargs="+",
+        default=["HS256", "RS256", "EdDSA"],
+        choices=[*SYMMETRIC_ALGORITHMS, *PRIVATE_KEYS],
+    )
+    parser.add_argument("--min-time", type=float, default=1.0, help="seconds per case")
+    args = parser.parse_args()
+
+    auth_handler = Container.auth_handler()
+    user_uuid = uuid.uuid4()
+    print(
+        f"{'algorithm':<10} {'encode us':>10} {'verify us':>10} {'verify/s':>9} {'bytes':>6}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for algorithm in args.algorithms:
+            auth_handler.key_ring = _key_ring(algorithm, Path(directory))
+            token = auth_handler.encode_token(user_id=user_uuid)
+            encode = _timed(
+                lambda: auth_handler.encode_token(user_id=user_uuid), args.min_time
+            )
+            verify = _timed(
+                lambda: auth_handler.verify_access_token(token), args.min_time
+            )
+            print(
+                f"{algorithm:<10} {encode * 1e6:>10.1f} {verify * 1e6:>10.1f} {1 / verify:>9.0f} {len(token):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure password hashing throughput on this host and suggest cost parameters.
+
+    python -m application.commands.calibrate_hashing --target-ms 250 --logins 200
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from infrastructure.auth import hashers
+from infrastructure.config.config import settings
+
+# Parameter that scales hashing time linearly for each scheme
+COST_PARAMETERS = {
+    hashers.PBKDF2Hasher.scheme: "iterations",
+    hashers.ScryptHasher.scheme: "n",
+    hashers.Argon2Hasher.scheme: "time_cost",
+}
+
+
+def _measure(scheme: str, params: dict[str, Any], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        hashers.hash_password("calibration-password", scheme, params)
+    return (time.perf_counter() - started) / rounds
+
+
+def _scaled(scheme: str, params: dict[str, int], factor: float) -> dict[str, int]:
+    name = COST_PARAMETERS[scheme]
+    if scheme == hashers.ScryptHasher.scheme:
+        # n must stay a power of two
+        value = 2 ** max(1, round(math.log2(params[name] * factor)))
+    else:
+        value = max(1, round(params[name] * factor))
+    return {**params, name: value}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scheme", default=settings.PASSWORD_HASHING.scheme)
+    parser.add_argument("--target-ms", type=float, default=None)
+    parser.add_argument("--logins", type=float, default=None, help="logins per second")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    hasher = hashers.get_hasher(args.scheme)
+    configured = settings.PASSWORD_HASHING.params
+    params = hasher.params(
+        configured if args.scheme == settings.PASSWORD_HASHING.scheme else None
+    )
+
+    seconds = _measure(args.scheme, params, args.rounds)
+    print(f"scheme: {args.scheme} {params}")
+    print(f"single core: {seconds * 1000:.1f} ms/hash, {1 / seconds:.1f} hashes/s")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        started = time.perf_counter()
+        list(
+            executor.map(
+                _measure,
+                [args.scheme] * args.workers,
+                [params] * args.workers,
+                [args.rounds] * args.workers,
+            ),
+        )
+        elapsed = time.perf_counter() - started
+    total = args.workers * args.rounds / elapsed
+    print(
+        f"{args.workers} workers: {total:.1f} hashes/s, {total / args.workers:.1f} per core"
+    )
+
+    if args.target_ms:
+        suggested = _scaled(args.scheme, params, args.target_ms / 1000 / seconds)
+        suggested_seconds = _measure(args.scheme, suggested, args.rounds)
+        print(
+            f"suggested for {args.target_ms:.0f} ms: {suggested} ({suggested_seconds * 1000:.1f} ms/hash)"
+        )
+        seconds = suggested_seconds
+    if args.logins:
+        print(
+            f"{args.logins:.0f} logins/s need {math.ceil(args.logins * seconds)} cores for hashing"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Check that the user export streams in bounded memory however many rows it returns.
+
+    python -m application.commands.check_export_memory --rows 100000 1000000
+
+Seeds users up to each size in `--rows` inside a transaction that is rolled
+back afterwards (existing users are exported too) and drains
+UserService.export in every format, tracing peak memory with tracemalloc.
+The check fails if the peak at the largest size exceeds the peak at the
+smallest by more than `--tolerance`, i.e. if memory grows with the export.
+"""
+
+import argparse
+import asyncio
+import resource
+import sys
+import time
+import tracemalloc
+
+from application.commands.scratch_database import ScratchDatabase
+from application.container import Container
+from domain.user.registry import UserReadRepository
+from infrastructure.utils.export.row_encoders import ExportFormat
+from service.user import UserService
+
+
+async def _drain(
+    service: UserService, export_format: ExportFormat
+) -> tuple[int, int, int, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = lines = 0
+    async for chunk in service.export(export_format, [], None):
+        size += len(chunk)
+        lines += chunk.count(b"\n")
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return lines, size, peak, elapsed
+
+
+async def run(sizes: list[int], tolerance: float) -> bool:
+    peaks: dict[int, int] = {}
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        service = UserService(
+            read_repository=UserReadRepository(session_manager=database),
+            write_repository=None,
+            auth_handler=None,
+            kafka_handler=None,
+            unknown_logins=None,
+        )
+        seeded = 0
+        print(
+            f"{'rows':>9} {'format':<7} {'lines':>9} {'out MiB':>8} {'peak MiB':>9} {'rows/s':>8} {'max rss MiB':>11}"
+        )
+        for size in sorted(sizes):
+            await database.seed_users(size - seeded)
+            await database.analyze("users")
+            seeded = size
+            for export_format in ExportFormat:
+                lines, out, peak, elapsed = await _drain(service, export_format)
+                peaks[size] = max(peaks.get(size, 0), peak)
+                print(
+                    f"{size:>9} {export_format.value:<7} {lines:>9} {out / 2**20:>8.1f} {peak / 2**20:>9.1f}"
+                    f" {lines / elapsed:>8.0f} {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:>11.0f}"
+                )
+    smallest, largest = peaks[min(peaks)], peaks[max(peaks)]
+    bounded = largest <= smallest * tolerance
+    print(
+        f"peak at {max(peaks)} rows is {largest / smallest:.2f}x the peak at {min(peaks)} rows"
+        f" (tolerance {tolerance}x): {'bounded' if bounded else 'GROWS'}"
+    )
+    return bounded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument(
+        "--tolerance", type=float, default=1.5, help="allowed peak ratio"
+    )
+    args = parser.parse_args()
+    if not asyncio.run(run(args.rows, args.tolerance)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Roll the signing key under steady traffic and check that no live token stops verifying.
+
+    python -m application.commands.check_key_rotation --lifetime 3 --rotations 2 --clients 20
+
+Runs in real time with a short token lifetime instead of AUTH.EXPIRATION.
+The KeyRing starts with the shared HS256 key and gets `--rotations` keys
+scheduled `--lifetime` seconds apart. Simulated clients keep issuing
+access tokens and verifying every one they hold until it expires. Any
+unexpired token that fails verification would send its client back to
+login. The check fails if that happens, if the ring does not switch keys
+on schedule, or if a superseded key still verifies after its tokens
+expired.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+
+from application.container import Container
+from infrastructure.auth.key_ring import DEFAULT_KID, KeyRing
+from infrastructure.auth.token_handler import AuthHandler
+from infrastructure.config.config import settings
+from infrastructure.exceptions.token_exceptions import InvalidToken, TokenExpired
+
+# Tokens this close to their expiry are dropped instead of verified
+EXPIRY_MARGIN = 0.2
+
+
+def _auth_handler(key_ring: KeyRing, lifetime: int) -> AuthHandler:
+    return AuthHandler(
+        key_ring=key_ring,
+        exp=lifetime,
+        api_x_key_header=settings.AUTH.api_x_key_header,
+        iterations=settings.AUTH.iterations,
+        hash_name=settings.AUTH.hash_name,
+        formats=settings.AUTH.formats,
+        leeway=0,
+        password_scheme=settings.PASSWORD_HASHING.scheme,
+        password_params=settings.PASSWORD_HASHING.params,
+        redis_client=Container.redis(),
+        hash_pool=Container.hash_pool(),
+        generations=Container.generations(),
+        revocations=Container.revocations(),
+    )
+
+
+def run(lifetime: int, rotations: int, clients: int, interval: float) -> bool:
+    started = time.time()
+    kids = [DEFAULT_KID, *[f"rotation-{number}" for number in range(1, rotations + 1)]]
+    key_ring = KeyRing(
+        secret=uuid.uuid4().hex * 2,
+        algorithm="HS256",
+        keys=[
+            {
+                "kid": kid,
+                "algorithm": "HS256",
+                "secret": uuid.uuid4().hex * 2,
+                "activates_at": started + lifetime * number,
+            }
+            for number, kid in enumerate(kids[1:], start=1)
+        ],
+        max_token_lifetime=lifetime,
+    )
+    auth_handler = _auth_handler(key_ring, lifetime)
+    held: list[list[tuple[float, str]]] = [[] for _ in range(clients)]
+    signed_by: list[str] = []
+    issued = verified = forced_logins = 0
+
+    while (now := time.time()) < started + lifetime * (rotations + 1) + interval:
+        if not signed_by or signed_by[-1] != key_ring.active.kid:
+            signed_by.append(key_ring.active.kid)
+            print(f"{now - started:6.2f}s signing with {key_ring.active.kid}")
+        for tokens in held:
+            tokens.append(
+                (int(now) + lifetime, auth_handler.encode_token(user_id=uuid.uuid4()))
+            )
+            issued += 1
+            tokens[:] = [item for item in tokens if item[0] - EXPIRY_MARGIN > now]
+            for _, token in tokens:
+                try:
+                    auth_handler.verify_access_token(token)
+                    verified += 1
+                except (InvalidToken, TokenExpired):
+                    forced_logins += 1
+        time.sleep(interval)
+
+    retired_but_verifying = []
+    for kid in kids[:-1]:
+        try:
+            key_ring.get(kid)
+            retired_but_verifying.append(kid)
+        except InvalidToken:
+            pass
+    print(f"issued {issued}, verified {verified}, forced logins {forced_logins}")
+    print(f"signing keys in order: {signed_by}")
+    print(f"superseded keys still verifying: {retired_but_verifying}")
+    return not forced_logins and signed_by == kids and not retired_but_verifying
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--lifetime", type=int, default=3, help="token lifetime in seconds"
+    )
+    parser.add_argument("--rotations", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument(
+        "--interval", type=float, default=0.05, help="seconds between requests"
+    )
+    args = parser.parse_args()
+    if not run(args.lifetime, args.rotations, args.clients, args.interval):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
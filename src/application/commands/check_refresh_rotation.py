@@ -0,0 +1,135 @@
+"""
+Check that concurrent refreshes of one token rotate it exactly once and time the rotation.
+
+    python -m application.commands.check_refresh_rotation --parallel 50 --rounds 20 --samples 2000
+
+Runs against the configured Redis. Every round opens a session for a fresh
+user uuid, fires `--parallel` refreshes with its refresh token at once and
+fails unless exactly one of them succeeds. The latency part compares the
+ROTATE_SESSION script with the GET, compare and SET sequence it replaced,
+replayed on a scratch key. All keys created here are removed afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from application.container import Container
+from infrastructure.auth.session_store import refresh_digest
+from infrastructure.auth.token_handler import AuthHandler
+
+LEGACY_KEY = "auth:bench:legacy_session"
+
+
+async def _rotation_round(auth_handler: AuthHandler, parallel: int) -> int:
+    user_uuid = uuid.uuid4()
+    tokens = await auth_handler.create_session(user_id=user_uuid)
+    try:
+        results = await asyncio.gather(
+            *[
+                auth_handler.rotate_session(tokens["refresh_token"])
+                for _ in range(parallel)
+            ]
+        )
+    finally:
+        await auth_handler.sessions.revoke_all(str(user_uuid))
+    return sum(result is not None for result in results)
+
+
+async def _legacy_rotate(auth_handler: AuthHandler, presented: str, new: str) -> bool:
+    # The pre-script path: read, compare in Python, write back
+    redis_client = auth_handler.redis_client
+    if await redis_client.get(LEGACY_KEY) != refresh_digest(presented):
+        return False
+    await redis_client.set(
+        LEGACY_KEY, refresh_digest(new), ex=auth_handler.sessions.ttl
+    )
+    return True
+
+
+async def _latencies(
+    rotate: Callable[[str, str], Awaitable[bool]], samples: int, first: str
+) -> list[float]:
+    latencies, current = [], first
+    for _ in range(samples):
+        new = uuid.uuid4().hex
+        started = time.perf_counter()
+        if not await rotate(current, new):
+            raise RuntimeError("rotation with the current token failed")
+        latencies.append(time.perf_counter() - started)
+        current = new
+    return latencies
+
+
+def _report(name: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    print(
+        f"{name:<10} mean {statistics.fmean(latencies) * 1e3:7.3f} ms"
+        f"  p50 {latencies[len(latencies) // 2] * 1e3:7.3f} ms"
+        f"  p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.3f} ms"
+    )
+
+
+async def run(parallel: int, rounds: int, samples: int) -> bool:
+    auth_handler = Container.auth_handler()
+    sessions = auth_handler.sessions
+
+    failed = 0
+    for number in range(rounds):
+        if (succeeded := await _rotation_round(auth_handler, parallel)) != 1:
+            failed += 1
+            print(f"round {number}: {succeeded} of {parallel} refreshes succeeded")
+    print(f"concurrency: {rounds - failed}/{rounds} rounds rotated exactly once")
+
+    user_uuid, session_id = str(uuid.uuid4()), uuid.uuid4().hex
+    try:
+        first = uuid.uuid4().hex
+        await sessions.create(
+            session_id=session_id,
+            user_uuid=user_uuid,
+            refresh_token=first,
+            access_jti=uuid.uuid4().hex,
+        )
+        script = await _latencies(
+            lambda presented, new: sessions.rotate(
+                session_id=session_id,
+                user_uuid=user_uuid,
+                presented_refresh_token=presented,
+                refresh_token=new,
+                access_jti=uuid.uuid4().hex,
+            ),
+            samples,
+            first=first,
+        )
+        await auth_handler.redis_client.set(LEGACY_KEY, refresh_digest(first))
+        legacy = await _latencies(
+            lambda presented, new: _legacy_rotate(auth_handler, presented, new),
+            samples,
+            first=first,
+        )
+    finally:
+        await sessions.revoke_all(user_uuid)
+        await auth_handler.redis_client.delete(LEGACY_KEY)
+    _report("lua", script)
+    _report("get+set", legacy)
+    return not failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--parallel", type=int, default=50, help="refreshes per round")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--samples", type=int, default=2000, help="sequential rotations timed per path"
+    )
+    args = parser.parse_args()
+    if not asyncio.run(run(args.parallel, args.rounds, args.samples)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Check that every /user/search filter is served by an index.
+
+    python -m application.commands.check_search_indexes --rows 300000
+
+Seeds `--rows` users inside a transaction that is rolled back afterwards,
+analyzes the table and runs EXPLAIN on UserReadRepository.search_stmt for
+every filter and operator, sorted by created_at and by login. The check
+fails if any plan contains a sequential scan on users. Run it against a
+database migrated to head: the trigram and partial indexes come from
+migration 0005.
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.dialects import postgresql
+
+from application.commands.scratch_database import ScratchDatabase
+from application.container import Container
+from domain.user.registry import UserReadRepository
+from domain.user.schema import UserSearchFilters
+
+SORTS = ("created_at", "login")
+# "Index Scan using ix on users", "Bitmap Index Scan on ix"
+INDEX_NODE = re.compile(r"Index (?:Only )?Scan (?:Backward )?(?:using|on) (\S+)")
+
+
+def _cases(prefix: str) -> dict[str, dict[str, Any]]:
+    # Values match what ScratchDatabase.seed_users generates
+    return {
+        "login eq": {"login": {"eq": f"{prefix}123"}},
+        "login in": {"login": {"in": [f"{prefix}1", f"{prefix}2"]}},
+        "login like": {"login": {"like": f"{prefix}1234"}},
+        "login ilike": {"login": {"ilike": f"{prefix[-3:]}4567"}},
+        "email eq": {"email": {"eq": f"{prefix}77@example.io"}},
+        "email in": {
+            "email": {"in": [f"{prefix}7@example.io", f"{prefix}8@example.io"]}
+        },
+        "email like": {"email": {"like": f"{prefix}9999"}},
+        "email ilike": {"email": {"ilike": "_12345@"}},
+        "phone_number eq": {"phone_number": {"eq": "10000007919"}},
+        "phone_number in": {"phone_number": {"in": ["10000007919", "10000015838"]}},
+        "phone_number like": {"phone_number": {"like": "1000012"}},
+        "phone_number ilike": {"phone_number": {"ilike": "79190"}},
+        "is_active true": {"is_active": {"eq": True}},
+        "is_active false": {"is_active": {"eq": False}},
+        "is_verified true": {"is_verified": {"eq": True}},
+        "is_verified false": {"is_verified": {"eq": False}},
+        "created_at range": {
+            "created_at": {"ge": datetime(2025, 3, 1), "lt": datetime(2025, 3, 2)},
+        },
+        "created_at gt": {"created_at": {"gt": datetime(2025, 6, 1)}},
+        "created_at le": {"created_at": {"le": datetime(2025, 1, 2)}},
+        "combined": {
+            "email": {"ilike": f"{prefix}12"},
+            "is_active": {"eq": False},
+            "created_at": {"ge": datetime(2025, 2, 1)},
+        },
+    }
+
+
+async def _plan(
+    database: ScratchDatabase, repository: UserReadRepository, filters: dict, sort: str
+) -> str:
+    stmt = repository.search_stmt(UserSearchFilters.create(**filters), parameter=sort)
+    # IN lists are expanded at execution time; render them for EXPLAIN
+    compiled = stmt.compile(
+        dialect=postgresql.asyncpg.dialect(),
+        compile_kwargs={"render_postcompile": True},
+    )
+    result = await database.connection.exec_driver_sql(
+        f"EXPLAIN {compiled}",
+        tuple(compiled.params[name] for name in compiled.positiontup),
+    )
+    return "\n".join(result.scalars())
+
+
+async def run(rows: int, verbose: bool) -> bool:
+    failed = 0
+    async with ScratchDatabase(Container.alchemy_manager()) as database:
+        await database.seed_users(rows)
+        await database.analyze("users")
+        repository = UserReadRepository(session_manager=database)
+        for sort in SORTS:
+            for name, filters in _cases(database.prefix).items():
+                plan = await _plan(database, repository, filters, sort)
+                seq_scan = "Seq Scan on users" in plan
+                failed += seq_scan
+                indexes = sorted(
+                    {
+                        match.group(1)
+                        for line in plan.splitlines()
+                        if (match := INDEX_NODE.search(line))
+                    }
+                )
+                print(
+                    f"{sort:<10} {name:<20} {'SEQ SCAN' if seq_scan else 'ok':<8} {', '.join(indexes)}"
+                )
+                if seq_scan or verbose:
+                    print(plan)
+    total = len(SORTS) * len(_cases(""))
+    print(f"{total - failed}/{total} plans use an index")
+    if failed:
+        print("Sequential scans found; is the database migrated to head?")
+    return not failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300000, help="users to seed")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+    if not asyncio.run(run(args.rows, args.verbose)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
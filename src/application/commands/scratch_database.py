@@ -0,0 +1,106 @@
+"""
+Seeding helpers shared by the commands that measure the database layer.
+Nothing seeded through them outlives the command.
+"""
+
+import uuid
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker
+
+from infrastructure.database.alchemy_gateway import SessionManager
+
+SEED_USERS = """
+    INSERT INTO users (
+        uuid, login, hashed_password, email, age, phone_number,
+        is_verified, is_superuser, is_active, created_at, updated_at
+    )
+    SELECT gen_random_uuid(), CAST(:prefix AS text) || i, 'x',
+           CAST(:prefix AS text) || i || '@example.io', 30,
+           lpad((10000000000 + i)::text, 11, '0'),
+           i % 50 <> 0, false, i % 100 <> 0,
+           timestamp '2025-01-01' + i * interval '1 minute',
+           timestamp '2025-01-01' + i * interval '1 minute'
+    FROM generate_series(CAST(:first AS integer), CAST(:last AS integer)) i
+"""
+
+SAVEPOINT_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class ScratchDatabase:
+    """
+    Stands in for SessionManager: every repository session joins one outer
+    transaction on a single connection as a savepoint, and leaving the
+    context rolls the outer transaction back. Repositories built on it
+    commit as usual while the configured database stays untouched.
+    """
+
+    def __init__(self, session_manager: SessionManager) -> None:
+        self.session_manager = session_manager
+        self.prefix = f"bench{uuid.uuid4().hex[:6]}_"
+        self._seeded = 0
+
+    async def __aenter__(self) -> "ScratchDatabase":
+        self.connection: AsyncConnection = await self.session_manager.engine.connect()
+        self._transaction = await self.connection.begin()
+        self.transactional_session = async_sessionmaker(
+            bind=self.connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        self.async_session_factory = async_sessionmaker(
+            bind=self.connection,
+            join_transaction_mode="create_savepoint",
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._transaction.rollback()
+        await self.connection.close()
+        # Commands are short-lived: release the pool before the loop closes
+        await self.session_manager.engine.dispose()
+
+    async def seed_users(self, count: int, returning: bool = False) -> list[uuid.UUID]:
+        """
+        Insert `count` users with unique logins, emails and phone numbers;
+        one in 100 is inactive and one in 50 unverified
+        """
+        result = await self.connection.execute(
+            text(SEED_USERS + (" RETURNING uuid" if returning else "")),
+            {
+                "prefix": self.prefix,
+                "first": self._seeded + 1,
+                "last": self._seeded + count,
+            },
+        )
+        self._seeded += count
+        return list(result.scalars()) if returning else []
+
+    async def analyze(self, *tables: str) -> None:
+        for table in tables:
+            await self.connection.execute(text(f"ANALYZE {table}"))
+
+
+class QueryStats:
+    """
+    Counts statements, result rows and the text size of their values on a
+    connection, leaving out the savepoints of ScratchDatabase sessions.
+    Rows are read from the asyncpg cursor buffer, so rows of server-side
+    cursors are not counted.
+    """
+
+    def __init__(self, connection: AsyncConnection) -> None:
+        self.statements = self.rows = self.bytes = 0
+        event.listen(connection.sync_connection, "after_cursor_execute", self._count)
+
+    def reset(self) -> None:
+        self.statements = self.rows = self.bytes = 0
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith(SAVEPOINT_STATEMENTS):
+            return
+        rows = getattr(cursor, "_rows", None) or ()
+        self.statements += 1
+        self.rows += len(rows)
+        self.bytes += sum(len(str(value)) for row in rows for value in row)
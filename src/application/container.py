@@ -1,14 +1,30 @@
 from redis.asyncio import Redis
 
+from domain.authz.registry import AuthzReadRepository, AuthzWriteRepository
 from domain.permission.registry import PermissionReadRepository, PermissionWriteRepository
+from domain.permission.schema import PermissionReturnData
 from domain.role.registry import RoleReadRepository, RoleWriteRepository
+from domain.role.schema import RoleReturnData
 from domain.user.registry import UserReadRepository, UserWriteRepository
+from domain.user.schema import UserReturnData
+from infrastructure.auth.generations import GenerationRegistry
+from infrastructure.auth.hash_pool import HashWorkerPool
+from infrastructure.auth.key_ring import KeyRing
+from infrastructure.auth.login_throttle import LoginThrottle
+from infrastructure.auth.permission_bits import PermissionBitIndex
+from infrastructure.auth.permission_cache import EffectivePermissionCache
+from infrastructure.auth.revocation import RevocationList
 from infrastructure.auth.token_handler import AuthHandler
+from infrastructure.auth.unknown_logins import UnknownLoginCache
 from infrastructure.base_entities.singleton import OnlyContainer, Singleton
 from infrastructure.broker.kafka import KafkaConsumer, KafkaProducer
+from infrastructure.cache.import_jobs import ImportJobStore
+from infrastructure.cache.near_cache import NearCache
 from infrastructure.config.config import settings
 from infrastructure.database.alchemy_gateway import SessionManager
 from infrastructure.database.clickhouse_gateway import ClickHouseManager
+from infrastructure.server.serialization import ResponseSerializer
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
 
 
 class Container(Singleton):
@@ -19,6 +35,14 @@ class Container(Singleton):
         decode_responses=True,
     )
 
+    metrics = OnlyContainer(MetricsRegistry)
+
+    response_serializer = OnlyContainer(
+        ResponseSerializer,
+        enabled=settings.SERIALIZATION.fast,
+        models=[UserReturnData, RoleReturnData, PermissionReturnData],
+    )
+
     alchemy_manager = OnlyContainer(
         SessionManager,
         dialect=settings.POSTGRES.dialect,
@@ -69,16 +93,133 @@ class Container(Singleton):
         session_manager=alchemy_manager(),
     )
 
+    authz_read_repository = OnlyContainer(
+        AuthzReadRepository,
+        session_manager=alchemy_manager(),
+    )
+
+    authz_write_repository = OnlyContainer(
+        AuthzWriteRepository,
+        session_manager=alchemy_manager(),
+    )
+
+    hash_pool = OnlyContainer(
+        HashWorkerPool,
+        workers=settings.AUTH.hash_workers,
+        queue_size=settings.AUTH.hash_queue_size,
+        metrics=metrics(),
+    )
+
+    key_ring = OnlyContainer(
+        KeyRing,
+        secret=settings.AUTH.secret,
+        algorithm=settings.AUTH.algorythm,
+        keys=settings.AUTH.signing_keys,
+        active_kid=settings.AUTH.active_kid,
+        max_token_lifetime=settings.AUTH.expiration + settings.AUTH.leeway,
+        secret_not_after=settings.AUTH.secret_not_after,
+    )
+
+    session_cache = OnlyContainer(
+        NearCache,
+        name="sessions",
+        redis_client=redis(),
+        channel="auth:invalidate:sessions",
+        metrics=metrics(),
+        enabled=settings.NEAR_CACHE.enabled,
+        max_size=settings.NEAR_CACHE.max_size,
+        ttl=settings.NEAR_CACHE.ttl,
+    )
+
+    generation_cache = OnlyContainer(
+        NearCache,
+        name="generations",
+        redis_client=redis(),
+        channel="auth:invalidate:generations",
+        metrics=metrics(),
+        max_size=settings.GENERATIONS.cache_size,
+        ttl=settings.GENERATIONS.cache_ttl,
+    )
+
+    permission_near_cache = OnlyContainer(
+        NearCache,
+        name="permissions",
+        redis_client=redis(),
+        channel="auth:invalidate:permissions",
+        metrics=metrics(),
+        max_size=settings.AUTHZ.near_cache_size,
+        ttl=settings.AUTHZ.near_cache_ttl,
+    )
+
+    permission_cache = OnlyContainer(
+        EffectivePermissionCache,
+        redis_client=redis(),
+        near_cache=permission_near_cache(),
+        ttl=settings.AUTHZ.cache_ttl,
+    )
+
+    permission_bits = OnlyContainer(
+        PermissionBitIndex,
+        redis_client=redis(),
+    )
+
+    generations = OnlyContainer(
+        GenerationRegistry,
+        redis_client=redis(),
+        near_cache=generation_cache(),
+    )
+
+    revocations = OnlyContainer(
+        RevocationList,
+        redis_client=redis(),
+        metrics=metrics(),
+        capacity=settings.REVOCATION.bloom_capacity,
+        error_rate=settings.REVOCATION.bloom_error_rate,
+        rebuild_interval=settings.REVOCATION.rebuild_interval,
+        stream_maxlen=settings.REVOCATION.stream_maxlen,
+    )
+
+    login_throttle = OnlyContainer(
+        LoginThrottle,
+        redis_client=redis(),
+        metrics=metrics(),
+        limits=settings.LOGIN_THROTTLE.limits,
+        timeout=settings.LOGIN_THROTTLE.timeout,
+        enabled=settings.LOGIN_THROTTLE.enabled,
+        fallback_size=settings.LOGIN_THROTTLE.fallback_size,
+    )
+
+    unknown_logins = OnlyContainer(
+        UnknownLoginCache,
+        redis_client=redis(),
+        metrics=metrics(),
+        ttl=settings.UNKNOWN_LOGINS.ttl,
+        enabled=settings.UNKNOWN_LOGINS.enabled,
+    )
+
+    user_import_jobs = OnlyContainer(
+        ImportJobStore,
+        redis_client=redis(),
+        ttl=settings.USER_IMPORT.job_ttl,
+        max_errors=settings.USER_IMPORT.max_errors,
+    )
+
     auth_handler = OnlyContainer(
         AuthHandler,
-        secret=settings.AUTH.secret,
+        key_ring=key_ring(),
         exp=settings.AUTH.expiration,
         api_x_key_header=settings.AUTH.api_x_key_header,
         iterations=settings.AUTH.iterations,
         hash_name=settings.AUTH.hash_name,
         formats=settings.AUTH.formats,
-        algorythm=settings.AUTH.algorythm,
+        leeway=settings.AUTH.leeway,
+        password_scheme=settings.PASSWORD_HASHING.scheme,
+        password_params=settings.PASSWORD_HASHING.params,
         redis_client=redis(),
+        hash_pool=hash_pool(),
+        generations=generations(),
+        revocations=revocations(),
+        session_cache=session_cache(),
     )
 
     producer_client = OnlyContainer(
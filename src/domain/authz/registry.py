@@ -0,0 +1,439 @@
+from collections import defaultdict
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import UUID as SA_UUID
+from sqlalchemy import (
+    CompoundSelect,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    union,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from domain.authz.schema import EffectivePermission, EffectivePermissions, RoleAncestor
+from infrastructure.database.alchemy_gateway import SessionManager
+from infrastructure.database.models import Permission, Role, RoleClosure, RoleInherit, RolePermission, User, UserRole
+from infrastructure.exceptions.authz_exceptions import PermissionNotFound, RoleHierarchyCycle, RoleInUse, RoleNotFound
+from infrastructure.exceptions.user_exceptions import UserNotFound
+
+ROLE_HIERARCHY_LOCK = 0x726F6C65
+
+
+def _uuid_array(user_uuids: list[UUID]):
+    # One array parameter instead of an IN list keeps the statement
+    # identical (and prepared once) for any batch size
+    return bindparam("user_uuids", user_uuids, type_=ARRAY(SA_UUID(as_uuid=True)))
+
+
+class AuthzReadRepository:
+    """
+    Permission resolution straight over the association tables, without
+    walking the joined ORM relationships
+    """
+
+    def __init__(self, session_manager: SessionManager) -> None:
+        self.async_session_factory: async_sessionmaker = (
+            session_manager.async_session_factory
+        )
+
+    @staticmethod
+    def _with_descendants(role_uuids: Select) -> CompoundSelect:
+        """
+        Roles in `role_uuids` plus every role inheriting from them
+        """
+        return union(
+            role_uuids,
+            select(RoleClosure.role_uuid).where(
+                RoleClosure.inherited_uuid.in_(role_uuids)
+            ),
+        )
+
+    async def get_effective(self, user_uuid: UUID) -> EffectivePermissions:
+        return (await self.get_effective_many(user_uuids=[user_uuid]))[user_uuid]
+
+    async def get_effective_many(
+        self, user_uuids: list[UUID]
+    ) -> dict[UUID, EffectivePermissions]:
+        """
+        Resolve any number of users with the same three queries as one
+        """
+        direct_stmt = select(UserRole.user_uuid, UserRole.role_uuid).where(
+            UserRole.user_uuid == any_(_uuid_array(user_uuids)),
+        )
+        inherited_stmt = (
+            select(UserRole.user_uuid, RoleClosure.inherited_uuid.label("role_uuid"))
+            .join(RoleClosure, RoleClosure.role_uuid == UserRole.role_uuid)
+            .where(UserRole.user_uuid == any_(_uuid_array(user_uuids)))
+            .distinct()
+        )
+        user_roles = union(direct_stmt, inherited_stmt).subquery()
+        permissions_stmt = (
+            select(
+                user_roles.c.user_uuid,
+                Permission.uuid,
+                Permission.name,
+                Permission.layer,
+                Permission.jdata,
+            )
+            .join(
+                RolePermission,
+                RolePermission.role_uuid == user_roles.c.role_uuid,
+            )
+            .join(Permission, Permission.uuid == RolePermission.permission_uuid)
+            .distinct()
+        )
+        async with self.async_session_factory() as session:
+            direct = (await session.execute(direct_stmt)).all()
+            inherited = (await session.execute(inherited_stmt)).all()
+            permissions = (await session.execute(permissions_stmt)).mappings().all()
+        role_uuids, inherited_uuids = defaultdict(list), defaultdict(list)
+        user_permissions = defaultdict(list)
+        for user_uuid, role_uuid in direct:
+            role_uuids[user_uuid].append(role_uuid)
+        for user_uuid, role_uuid in inherited:
+            if role_uuid not in role_uuids[user_uuid]:
+                inherited_uuids[user_uuid].append(role_uuid)
+        for row in permissions:
+            user_permissions[row["user_uuid"]].append(
+                EffectivePermission(
+                    uuid=row["uuid"],
+                    name=row["name"],
+                    layer=row["layer"],
+                    jdata=row["jdata"],
+                ),
+            )
+        return {
+            user_uuid: EffectivePermissions(
+                user_uuid=user_uuid,
+                role_uuids=role_uuids[user_uuid],
+                inherited_role_uuids=inherited_uuids[user_uuid],
+                permissions=user_permissions[user_uuid],
+            )
+            for user_uuid in user_uuids
+        }
+
+    async def get_role_user_uuids(self, role_uuid: UUID) -> list[UUID]:
+        """
+        Users holding the role directly or through a role inheriting from it
+        """
+        roles = self._with_descendants(
+            select(Role.uuid).where(Role.uuid == role_uuid),
+        )
+        async with self.async_session_factory() as session:
+            stmt = (
+                select(UserRole.user_uuid)
+                .where(UserRole.role_uuid.in_(roles))
+                .distinct()
+            )
+            return list((await session.execute(stmt)).scalars().all())
+
+    async def get_permission_user_uuids(self, perm_uuid: UUID) -> list[UUID]:
+        roles = self._with_descendants(
+            select(RolePermission.role_uuid).where(
+                RolePermission.permission_uuid == perm_uuid
+            ),
+        )
+        async with self.async_session_factory() as session:
+            stmt = (
+                select(UserRole.user_uuid)
+                .where(UserRole.role_uuid.in_(roles))
+                .distinct()
+            )
+            return list((await session.execute(stmt)).scalars().all())
+
+    async def get_ancestors(self, role_uuid: UUID) -> list[RoleAncestor]:
+        async with self.async_session_factory() as session:
+            stmt = (
+                select(
+                    RoleClosure.inherited_uuid.label("uuid"),
+                    RoleClosure.depth,
+                )
+                .where(RoleClosure.role_uuid == role_uuid)
+                .order_by(RoleClosure.depth)
+            )
+            rows = (await session.execute(stmt)).mappings().all()
+        return [RoleAncestor(**row) for row in rows]
+
+
+class AuthzWriteRepository:
+    def __init__(self, session_manager: SessionManager) -> None:
+        self.transactional_session: async_sessionmaker = (
+            session_manager.transactional_session
+        )
+
+    async def _role_exists(self, role_uuid: UUID) -> bool:
+        async with self.transactional_session() as session:
+            return await session.scalar(select(exists().where(Role.uuid == role_uuid)))
+
+    async def assign_role(self, user_uuid: UUID, role_uuid: UUID) -> bool:
+        try:
+            async with self.transactional_session() as session:
+                stmt = (
+                    insert(UserRole)
+                    .values(user_uuid=user_uuid, role_uuid=role_uuid)
+                    .on_conflict_do_nothing(constraint="idx_unique_user_role")
+                )
+                result = await session.execute(stmt)
+                await session.commit()
+        except IntegrityError:
+            # A foreign key failed; only then is it worth asking which one
+            if not await self._role_exists(role_uuid):
+                raise RoleNotFound
+            raise UserNotFound
+        return result.rowcount > 0
+
+    async def unassign_role(self, user_uuid: UUID, role_uuid: UUID) -> bool:
+        async with self.transactional_session() as session:
+            stmt = delete(UserRole).where(
+                UserRole.user_uuid == user_uuid,
+                UserRole.role_uuid == role_uuid,
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount > 0
+
+    async def assign_role_bulk(
+        self, role_uuid: UUID, user_uuids: list[UUID]
+    ) -> tuple[set[UUID], set[UUID]]:
+        """
+        Assign the role to many users in one INSERT ... SELECT. Returns the
+        requested users that exist and the ones that got the role now
+        """
+        requested = _uuid_array(user_uuids)
+        async with self.transactional_session() as session:
+            if not await session.scalar(select(exists().where(Role.uuid == role_uuid))):
+                raise RoleNotFound
+            found = await session.execute(
+                select(User.uuid).where(User.uuid == any_(requested)),
+            )
+            assigned = await session.execute(
+                insert(UserRole)
+                .from_select(
+                    ["uuid", "user_uuid", "role_uuid"],
+                    select(
+                        func.gen_random_uuid(),
+                        User.uuid,
+                        literal(role_uuid, SA_UUID),
+                    ).where(User.uuid == any_(requested)),
+                )
+                .on_conflict_do_nothing(constraint="idx_unique_user_role")
+                .returning(UserRole.user_uuid),
+            )
+            result = set(found.scalars()), set(assigned.scalars())
+            await session.commit()
+        return result
+
+    async def unassign_role_bulk(
+        self, role_uuid: UUID, user_uuids: list[UUID]
+    ) -> set[UUID]:
+        """
+        Take the role from many users in one DELETE; returns who lost it
+        """
+        async with self.transactional_session() as session:
+            result = await session.execute(
+                delete(UserRole)
+                .where(
+                    UserRole.role_uuid == role_uuid,
+                    UserRole.user_uuid == any_(_uuid_array(user_uuids)),
+                )
+                .returning(UserRole.user_uuid),
+            )
+            unassigned = set(result.scalars())
+            await session.commit()
+        return unassigned
+
+    async def grant_permission(self, role_uuid: UUID, perm_uuid: UUID) -> bool:
+        try:
+            async with self.transactional_session() as session:
+                stmt = (
+                    insert(RolePermission)
+                    .values(role_uuid=role_uuid, permission_uuid=perm_uuid)
+                    .on_conflict_do_nothing(constraint="idx_unique_role_permission")
+                )
+                result = await session.execute(stmt)
+                await session.commit()
+        except IntegrityError:
+            if not await self._role_exists(role_uuid):
+                raise RoleNotFound
+            raise PermissionNotFound
+        return result.rowcount > 0
+
+    async def revoke_permission(self, role_uuid: UUID, perm_uuid: UUID) -> bool:
+        async with self.transactional_session() as session:
+            stmt = delete(RolePermission).where(
+                RolePermission.role_uuid == role_uuid,
+                RolePermission.permission_uuid == perm_uuid,
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def _lock_hierarchy(session: AsyncSession) -> None:
+        # Serializes hierarchy writes so concurrent edges can not form a cycle
+        await session.execute(select(func.pg_advisory_xact_lock(ROLE_HIERARCHY_LOCK)))
+
+    @staticmethod
+    async def _descendants(session: AsyncSession, role_uuid: UUID) -> list[UUID]:
+        stmt = select(RoleClosure.role_uuid).where(
+            RoleClosure.inherited_uuid == role_uuid
+        )
+        return [role_uuid, *(await session.execute(stmt)).scalars().all()]
+
+    @staticmethod
+    async def _rebuild_closure(session: AsyncSession, role_uuids: list[UUID]) -> None:
+        """
+        Recompute closure rows of the given roles from the edge table
+        """
+        await session.execute(
+            delete(RoleClosure).where(RoleClosure.role_uuid.in_(role_uuids)),
+        )
+        walk = (
+            select(
+                RoleInherit.role_uuid,
+                RoleInherit.parent_uuid.label("inherited_uuid"),
+                literal(1).label("depth"),
+            )
+            .where(RoleInherit.role_uuid.in_(role_uuids))
+            .cte("walk", recursive=True)
+        )
+        walk = walk.union(
+            select(
+                walk.c.role_uuid,
+                RoleInherit.parent_uuid,
+                walk.c.depth + 1,
+            ).join(RoleInherit, RoleInherit.role_uuid == walk.c.inherited_uuid),
+        )
+        await session.execute(
+            insert(RoleClosure).from_select(
+                ["uuid", "role_uuid", "inherited_uuid", "depth"],
+                select(
+                    func.gen_random_uuid(),
+                    walk.c.role_uuid,
+                    walk.c.inherited_uuid,
+                    func.min(walk.c.depth),
+                ).group_by(walk.c.role_uuid, walk.c.inherited_uuid),
+            ),
+        )
+
+    async def add_parent(self, role_uuid: UUID, parent_uuid: UUID) -> bool:
+        """
+        Add the edge and extend the closure incrementally: every role that
+        inherits `role_uuid` (and itself) now inherits `parent_uuid` and all
+        of its ancestors
+        """
+        async with self.transactional_session() as session:
+            await self._lock_hierarchy(session)
+            creates_cycle = role_uuid == parent_uuid or await session.scalar(
+                select(
+                    exists().where(
+                        RoleClosure.role_uuid == parent_uuid,
+                        RoleClosure.inherited_uuid == role_uuid,
+                    ),
+                ),
+            )
+            if creates_cycle:
+                raise RoleHierarchyCycle
+            edge = await session.execute(
+                insert(RoleInherit)
+                .values(role_uuid=role_uuid, parent_uuid=parent_uuid)
+                .on_conflict_do_nothing(constraint="idx_unique_role_inherit"),
+            )
+            if not edge.rowcount:
+                return False
+            descendants = union_all(
+                select(
+                    literal(role_uuid, SA_UUID).label("role_uuid"),
+                    literal(0).label("depth"),
+                ),
+                select(RoleClosure.role_uuid, RoleClosure.depth).where(
+                    RoleClosure.inherited_uuid == role_uuid
+                ),
+            ).subquery()
+            ancestors = union_all(
+                select(
+                    literal(parent_uuid, SA_UUID).label("inherited_uuid"),
+                    literal(0).label("depth"),
+                ),
+                select(RoleClosure.inherited_uuid, RoleClosure.depth).where(
+                    RoleClosure.role_uuid == parent_uuid
+                ),
+            ).subquery()
+            stmt = insert(RoleClosure).from_select(
+                ["uuid", "role_uuid", "inherited_uuid", "depth"],
+                select(
+                    func.gen_random_uuid(),
+                    descendants.c.role_uuid,
+                    ancestors.c.inherited_uuid,
+                    descendants.c.depth + ancestors.c.depth + 1,
+                ).select_from(descendants.join(ancestors, true())),
+            )
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    constraint="idx_unique_role_closure",
+                    set_={"depth": func.least(RoleClosure.depth, stmt.excluded.depth)},
+                ),
+            )
+            await session.commit()
+        return True
+
+    async def remove_parent(self, role_uuid: UUID, parent_uuid: UUID) -> bool:
+        """
+        Drop the edge and rebuild the closure of `role_uuid` and its
+        descendants only; other paths to the same ancestors are preserved
+        """
+        async with self.transactional_session() as session:
+            await self._lock_hierarchy(session)
+            edge = await session.execute(
+                delete(RoleInherit).where(
+                    RoleInherit.role_uuid == role_uuid,
+                    RoleInherit.parent_uuid == parent_uuid,
+                ),
+            )
+            if not edge.rowcount:
+                return False
+            await self._rebuild_closure(
+                session, await self._descendants(session, role_uuid)
+            )
+            await session.commit()
+        return True
+
+    async def delete_role(self, role_uuid: UUID) -> Optional[Role]:
+        """
+        Delete the role together with every edge touching it and rebuild the
+        closure of its descendants, all in one transaction. A role still
+        held by users or granting permissions is left untouched.
+        """
+        try:
+            async with self.transactional_session() as session:
+                await self._lock_hierarchy(session)
+                descendants = await self._descendants(session, role_uuid)
+                await session.execute(
+                    delete(RoleInherit).where(
+                        or_(
+                            RoleInherit.role_uuid == role_uuid,
+                            RoleInherit.parent_uuid == role_uuid,
+                        ),
+                    ),
+                )
+                await self._rebuild_closure(session, descendants)
+                result = await session.execute(
+                    delete(Role).where(Role.uuid == role_uuid).returning(Role),
+                )
+                await session.commit()
+                answer = result.scalars().unique().first()
+        except IntegrityError:
+            raise RoleInUse
+        return answer
@@ -0,0 +1,57 @@
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class EffectivePermission(BaseModel):
+    uuid: UUID
+    name: str
+    layer: str
+    jdata: Optional[dict]
+
+
+class EffectivePermissions(BaseModel):
+    user_uuid: UUID
+    role_uuids: list[UUID]
+    inherited_role_uuids: list[UUID] = []
+    permissions: list[EffectivePermission]
+
+
+class RoleAncestor(BaseModel):
+    uuid: UUID
+    depth: int
+
+
+class AuthzCheck(BaseModel):
+    user_uuid: UUID
+    permission_uuid: UUID
+
+
+class AuthzCheckBatch(BaseModel):
+    checks: list[AuthzCheck] = Field(min_length=1, max_length=1000)
+
+
+class AuthzDecision(AuthzCheck):
+    allowed: bool
+
+
+class AuthzCheckResult(BaseModel):
+    results: list[AuthzDecision]
+
+
+class RoleMembersBatch(BaseModel):
+    user_uuids: list[UUID] = Field(min_length=1, max_length=10000)
+
+
+class RoleMemberOutcome(BaseModel):
+    user_uuid: UUID
+    status: str
+
+
+class RoleMembersResult(BaseModel):
+    role_uuid: UUID
+    changed: int
+    elapsed_ms: float
+    assignments_per_second: float
+    results: list[RoleMemberOutcome]
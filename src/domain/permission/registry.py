@@ -1,4 +1,4 @@
-from typing import Any, List, Optional
+from typing import Optional
 from uuid import UUID
 
 from asyncpg import UniqueViolationError
@@ -8,8 +8,12 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from domain.permission.schema import CreatePermission, PermissionReturnData
 from infrastructure.base_entities.abs_repository import AbstractReadRepository, AbstractWriteRepository
+from infrastructure.base_entities.base_model import Page
+from infrastructure.config.config import settings
 from infrastructure.database.alchemy_gateway import SessionManager
+from infrastructure.database.loaders import LoaderProfile, loader_options, schema_columns
 from infrastructure.database.models import Permission
+from infrastructure.database.pagination import Keyset, SortOrder
 from infrastructure.exceptions.user_exceptions import UserAlreadyExists
 
 
@@ -24,25 +28,62 @@ class PermissionReadRepository(AbstractReadRepository):
         self.async_session_factory: async_sessionmaker = (
             session_manager.async_session_factory
         )
+        self.keyset = Keyset(
+            created_at=(self.model.created_at, self.model.uuid),
+            updated_at=(self.model.updated_at, self.model.uuid),
+            name=(self.model.name, self.model.uuid),
+        )
+        self.list_columns = schema_columns(self.model, PermissionReturnData)
 
-    async def get(self, perm_uuid: UUID) -> Optional[Permission]:
+    async def get(
+        self,
+        perm_uuid: UUID,
+        loader: LoaderProfile = LoaderProfile.NONE,
+    ) -> Optional[Permission]:
         async with self.async_session_factory() as session:
-            stmt = select(self.model).filter(self.model.uuid == perm_uuid)
+            stmt = (
+                select(self.model)
+                .filter(self.model.uuid == perm_uuid)
+                .options(*loader_options(loader, self.model.roles))
+            )
             answer = await session.execute(stmt)
             result = answer.scalars().unique().first()
         return result
 
     async def get_list(
         self,
-        parameter: Any = "created_at",
-    ) -> Optional[List[PermissionReturnData]]:
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = settings.PAGINATION.default_limit,
+        cursor: Optional[str] = None,
+        loader: LoaderProfile = LoaderProfile.NONE,
+        projection: bool = False,
+    ) -> Page[PermissionReturnData]:
+        """
+        With `projection` only the PermissionReturnData columns are selected
+        and the page holds plain dicts instead of entities
+        """
+        if projection:
+            stmt = select(*self.list_columns)
+        else:
+            stmt = select(self.model).options(*loader_options(loader, self.model.roles))
         async with self.async_session_factory() as session:
-            final = None
-            if option := getattr(self.model, parameter):
-                stmt = select(self.model).order_by(option)
-                result = await session.execute(stmt)
-                final = result.scalars().unique().all()
-        return final
+            stmt = self.keyset.apply(
+                stmt,
+                sort=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+            )
+            result = await session.execute(stmt)
+            items = result.all() if projection else result.scalars().unique().all()
+        return self.keyset.page(
+            items,
+            sort=parameter,
+            order=order,
+            limit=limit,
+            projection=projection,
+        )
 
 
 class PermissionWriteRepository(AbstractWriteRepository):
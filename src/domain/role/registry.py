@@ -1,15 +1,19 @@
-from typing import Any, List, Optional
+from typing import Optional
 from uuid import UUID
 
 from asyncpg import UniqueViolationError
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from domain.role.schema import CreateRole, RoleReturnData
+from domain.role.schema import CreateRole, RoleListData
 from infrastructure.base_entities.abs_repository import AbstractReadRepository, AbstractWriteRepository
+from infrastructure.base_entities.base_model import Page
+from infrastructure.config.config import settings
 from infrastructure.database.alchemy_gateway import SessionManager
-from infrastructure.database.models import Role
+from infrastructure.database.loaders import LoaderProfile, loader_options
+from infrastructure.database.models import Role, RolePermission, UserRole
+from infrastructure.database.pagination import Keyset, SortOrder
 from infrastructure.exceptions.user_exceptions import UserAlreadyExists
 
 
@@ -24,25 +28,76 @@ class RoleReadRepository(AbstractReadRepository):
         self.async_session_factory: async_sessionmaker = (
             session_manager.async_session_factory
         )
+        self.keyset = Keyset(
+            created_at=(self.model.created_at, self.model.uuid),
+            updated_at=(self.model.updated_at, self.model.uuid),
+            name=(self.model.name,),
+        )
 
-    async def get(self, role_uuid: UUID) -> Optional[Role]:
+    async def get(
+        self,
+        role_uuid: UUID,
+        loader: LoaderProfile = LoaderProfile.NONE,
+    ) -> Optional[Role]:
         async with self.async_session_factory() as session:
-            stmt = select(self.model).filter(self.model.uuid == role_uuid)
+            stmt = (
+                select(self.model)
+                .filter(self.model.uuid == role_uuid)
+                .options(
+                    *loader_options(loader, self.model.permissions, self.model.users)
+                )
+            )
             answer = await session.execute(stmt)
             result = answer.scalars().unique().first()
         return result
 
     async def get_list(
         self,
-        parameter: Any = "created_at",
-    ) -> Optional[List[RoleReturnData]]:
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = settings.PAGINATION.default_limit,
+        cursor: Optional[str] = None,
+        projection: bool = False,
+    ) -> Page[RoleListData]:
+        """
+        Roles with member and permission counts; members are never loaded.
+        Counts are correlated per role of the page, so a page costs the same
+        however many roles and assignments exist elsewhere. With `projection`
+        the page holds the rows as plain dicts instead of RoleListData
+        """
+        user_count = (
+            select(func.count())
+            .where(UserRole.role_uuid == self.model.uuid)
+            .scalar_subquery()
+        )
+        permission_count = (
+            select(func.count())
+            .where(RolePermission.role_uuid == self.model.uuid)
+            .scalar_subquery()
+        )
         async with self.async_session_factory() as session:
-            final = None
-            if option := getattr(self.model, parameter):
-                stmt = select(self.model).order_by(option)
-                result = await session.execute(stmt)
-                final = result.scalars().unique().all()
-        return final
+            stmt = self.keyset.apply(
+                select(
+                    *self.model.__table__.columns,
+                    user_count.label("user_count"),
+                    permission_count.label("permission_count"),
+                ),
+                sort=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+            )
+            result = await session.execute(stmt)
+            items = result.all()
+        if not projection:
+            items = [RoleListData(**row._mapping) for row in items]
+        return self.keyset.page(
+            items,
+            sort=parameter,
+            order=order,
+            limit=limit,
+            projection=projection,
+        )
 
 
 class RoleWriteRepository(AbstractWriteRepository):
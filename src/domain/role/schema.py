@@ -17,3 +17,8 @@ class CreateRole(BaseModel):
 class RoleReturnData(GetRoleByUUID, CreateRole):
     created_at: datetime
     updated_at: datetime
+
+
+class RoleListData(RoleReturnData):
+    user_count: int
+    permission_count: int
@@ -1,17 +1,90 @@
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 
 from asyncpg import UniqueViolationError
-from sqlalchemy import delete, insert, select, update
+from fastapi_filters import FilterOperator
+from fastapi_filters.ext.sqlalchemy import apply_filters
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Select,
+    Table,
+    Text,
+    and_,
+    bindparam,
+    case,
+    delete,
+    exists,
+    false,
+    func,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.schema import CreateTable
 
-from domain.user.schema import CreateUser, UpdateUser, UserReturnData
+from domain.user.schema import (
+    CreateUser,
+    UpdateUser,
+    UserCredentials,
+    UserExportColumn,
+    UserReturnData,
+    UserSearchFilters,
+)
 from infrastructure.base_entities.abs_repository import AbstractReadRepository, AbstractWriteRepository
+from infrastructure.base_entities.base_model import Page
+from infrastructure.config.config import settings
 from infrastructure.database.alchemy_gateway import SessionManager
-from infrastructure.database.models import User
+from infrastructure.database.loaders import LoaderProfile, loader_options, schema_columns
+from infrastructure.database.models import User, UserRole
+from infrastructure.database.pagination import Keyset, SortOrder
+from infrastructure.exceptions.pagination_exceptions import SearchTermTooShort
 from infrastructure.exceptions.user_exceptions import UserAlreadyExists
 
+# Shortest fragment that still yields a trigram the GIN indexes can use
+MIN_PATTERN_LENGTH = 3
+
+# Bulk imports are copied here first; the table lives as long as the pooled
+# connection and its rows are cleared by every commit
+IMPORT_STAGING = Table(
+    "user_import_staging",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("login", Text, nullable=False),
+    Column("hashed_password", Text, nullable=False),
+    Column("email", Text, nullable=False),
+    Column("age", Integer, nullable=False),
+    Column("phone_number", Text, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+IMPORT_COLUMNS = ["login", "hashed_password", "email", "age", "phone_number"]
+IMPORT_UNIQUE_COLUMNS = ["login", "email", "phone_number"]
+
+
+def _search_condition(stmt: Select, ns: dict, field: str, op: FilterOperator, value):
+    """
+    Index-friendly forms of the pattern and boolean filters; everything
+    else falls through to the default fastapi-filters conditions
+    """
+    column = ns[field]
+    if op in (FilterOperator.like, FilterOperator.ilike):
+        if len(value) < MIN_PATTERN_LENGTH:
+            raise SearchTermTooShort
+        if op == FilterOperator.like:
+            return column.startswith(value, autoescape=True)
+        return column.icontains(value, autoescape=True)
+    if op == FilterOperator.eq and isinstance(value, bool):
+        # A bare column (not `= $1`) lets the planner match partial indexes
+        return column if value else ~column
+    raise NotImplementedError
+
 
 class UserReadRepository(AbstractReadRepository):
 
@@ -24,10 +97,40 @@ class UserReadRepository(AbstractReadRepository):
         self.async_session_factory: async_sessionmaker = (
             session_manager.async_session_factory
         )
+        self.keyset = Keyset(
+            created_at=(self.model.created_at, self.model.uuid),
+            updated_at=(self.model.updated_at, self.model.uuid),
+            login=(self.model.login,),
+            email=(self.model.email,),
+        )
+        self.list_columns = schema_columns(self.model, UserReturnData)
+        # Built once: the compiled form is reused from SQLAlchemy's cache and
+        # asyncpg keeps the server-side prepared statement per connection
+        self._credentials_stmt = (
+            select(
+                self.model.uuid,
+                self.model.hashed_password,
+                self.model.is_active,
+                func.array_remove(func.array_agg(UserRole.role_uuid), None).label(
+                    "role_uuids"
+                ),
+            )
+            .outerjoin(UserRole, UserRole.user_uuid == self.model.uuid)
+            .where(self.model.login == bindparam("login"))
+            .group_by(self.model.uuid)
+        )
 
-    async def get(self, user_uuid: UUID) -> Optional[User]:
+    async def get(
+        self,
+        user_uuid: UUID,
+        loader: LoaderProfile = LoaderProfile.NONE,
+    ) -> Optional[User]:
         async with self.async_session_factory() as session:
-            stmt = select(self.model).filter(self.model.uuid == user_uuid)
+            stmt = (
+                select(self.model)
+                .filter(self.model.uuid == user_uuid)
+                .options(*loader_options(loader, self.model.roles))
+            )
             answer = await session.execute(stmt)
             result = answer.scalars().unique().first()
         return result
@@ -39,17 +142,115 @@ class UserReadRepository(AbstractReadRepository):
             result = answer.scalars().unique().first()
         return result
 
+    async def get_credentials_by_login(self, login: str) -> Optional[UserCredentials]:
+        """
+        Column-only lookup for authentication: no entity or relationship loads
+        """
+        async with self.async_session_factory() as session:
+            answer = await session.execute(self._credentials_stmt, {"login": login})
+            row = answer.mappings().first()
+        return UserCredentials(**row) if row else None
+
     async def get_list(
         self,
-        parameter: Any = "created_at",
-    ) -> Optional[List[UserReturnData]]:
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = settings.PAGINATION.default_limit,
+        cursor: Optional[str] = None,
+        loader: LoaderProfile = LoaderProfile.NONE,
+        projection: bool = False,
+    ) -> Page[UserReturnData]:
+        """
+        With `projection` only the UserReturnData columns are selected and
+        the page holds plain dicts instead of entities
+        """
+        if projection:
+            stmt = select(*self.list_columns)
+        else:
+            stmt = select(self.model).options(*loader_options(loader, self.model.roles))
         async with self.async_session_factory() as session:
-            final = None
-            if option := getattr(self.model, parameter):
-                stmt = select(self.model).order_by(option)
-                result = await session.execute(stmt)
-                final = result.scalars().unique().all()
-        return final
+            stmt = self.keyset.apply(
+                stmt,
+                sort=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+            )
+            result = await session.execute(stmt)
+            items = result.all() if projection else result.scalars().unique().all()
+        return self.keyset.page(
+            items,
+            sort=parameter,
+            order=order,
+            limit=limit,
+            projection=projection,
+        )
+
+    def search_stmt(
+        self,
+        filters: UserSearchFilters,
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = settings.PAGINATION.default_limit,
+        cursor: Optional[str] = None,
+        projection: bool = False,
+    ) -> Select:
+        stmt = apply_filters(
+            select(self.model),
+            filters,
+            apply_filter=_search_condition,
+        )
+        if projection:
+            stmt = stmt.with_only_columns(*self.list_columns)
+        return self.keyset.apply(
+            stmt,
+            sort=parameter,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def search(
+        self,
+        filters: UserSearchFilters,
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = settings.PAGINATION.default_limit,
+        cursor: Optional[str] = None,
+        projection: bool = False,
+    ) -> Page[UserReturnData]:
+        stmt = self.search_stmt(filters, parameter, order, limit, cursor, projection)
+        async with self.async_session_factory() as session:
+            result = await session.execute(stmt)
+            items = result.all() if projection else result.scalars().unique().all()
+        return self.keyset.page(
+            items,
+            sort=parameter,
+            order=order,
+            limit=limit,
+            projection=projection,
+        )
+
+    async def stream_columns(
+        self,
+        columns: Sequence[UserExportColumn],
+        updated_since: Optional[datetime] = None,
+        batch_size: int = settings.EXPORT.batch_size,
+    ) -> AsyncIterator[Sequence[Sequence]]:
+        """
+        Yield batches of plain rows from a server-side cursor; no ORM
+        entities are built and at most `batch_size` rows are in memory
+        """
+        stmt = select(*(getattr(self.model, column.value) for column in columns))
+        if updated_since is not None:
+            stmt = stmt.where(self.model.updated_at >= updated_since)
+        stmt = stmt.order_by(self.model.updated_at, self.model.uuid).execution_options(
+            yield_per=batch_size,
+        )
+        async with self.async_session_factory() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                yield rows
 
 
 class UserWriteRepository(AbstractWriteRepository):
@@ -93,6 +294,16 @@ class UserWriteRepository(AbstractWriteRepository):
             answer = result.scalars().unique().first()
         return answer
 
+    async def update_password(self, user_uuid: UUID, hashed_password: str) -> None:
+        async with self.transactional_session() as session:
+            stmt = (
+                update(self.model)
+                .values(hashed_password=hashed_password)
+                .where(self.model.uuid == user_uuid)
+            )
+            await session.execute(stmt)
+            await session.commit()
+
     async def delete(self, user_uuid: UUID) -> Optional[User]:
         async with self.transactional_session() as session:
             stmt = (
@@ -104,3 +315,101 @@ class UserWriteRepository(AbstractWriteRepository):
             await session.commit()
             answer = result.scalars().unique().first()
         return answer
+
+    def _import_stmt(self) -> Select:
+        staging = IMPORT_STAGING.c
+        ranked = select(
+            IMPORT_STAGING,
+            *(
+                func.row_number()
+                .over(partition_by=staging[name], order_by=staging.line)
+                .label(f"{name}_rank")
+                for name in IMPORT_UNIQUE_COLUMNS
+            ),
+        ).subquery("ranked")
+        reason = case(
+            (
+                or_(
+                    *(
+                        func.length(ranked.c[name])
+                        > self.model.__table__.c[name].type.length
+                        for name in IMPORT_UNIQUE_COLUMNS
+                    )
+                ),
+                "too_long",
+            ),
+            (
+                or_(*(ranked.c[f"{name}_rank"] > 1 for name in IMPORT_UNIQUE_COLUMNS)),
+                "duplicate_in_import",
+            ),
+            *(
+                (
+                    exists().where(getattr(self.model, name) == ranked.c[name]),
+                    f"{name}_exists",
+                )
+                for name in IMPORT_UNIQUE_COLUMNS
+            ),
+        )
+        resolved = select(ranked, reason.label("reason")).cte("resolved")
+        inserted = (
+            insert(self.model)
+            .from_select(
+                [
+                    "uuid",
+                    *IMPORT_COLUMNS,
+                    "is_verified",
+                    "is_superuser",
+                    "is_active",
+                    "created_at",
+                    "updated_at",
+                ],
+                select(
+                    func.gen_random_uuid(),
+                    *(resolved.c[name] for name in IMPORT_COLUMNS),
+                    false(),
+                    false(),
+                    true(),
+                    func.now(),
+                    func.now(),
+                ).where(resolved.c.reason.is_(None)),
+                include_defaults=False,
+            )
+            # A user registered concurrently is reported, not an error
+            .on_conflict_do_nothing()
+            .returning(self.model.login, self.model.uuid)
+            .cte("inserted")
+        )
+        return select(
+            resolved.c.line,
+            resolved.c.login,
+            resolved.c.reason,
+            inserted.c.uuid,
+        ).outerjoin(
+            inserted,
+            and_(resolved.c.reason.is_(None), inserted.c.login == resolved.c.login),
+        )
+
+    async def import_batch(
+        self, rows: list[tuple]
+    ) -> list[tuple[int, str, Optional[str], Optional[UUID]]]:
+        """
+        Insert (line, login, hashed_password, email, age, phone_number) rows
+        with one COPY into the staging table and one statement that rejects
+        rows which are too long, repeat a unique value of an earlier line or
+        clash with an existing user, and inserts the rest. Returns per line
+        the rejection reason or the new user's uuid; neither means the row
+        lost a race with a concurrent registration
+        """
+        async with self.transactional_session() as session:
+            # Also opens the transaction, so the COPY below runs inside it
+            await session.execute(CreateTable(IMPORT_STAGING, if_not_exists=True))
+            connection = await session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                IMPORT_STAGING.name,
+                records=rows,
+                columns=[column.name for column in IMPORT_STAGING.columns],
+            )
+            result = (await session.execute(self._import_stmt())).all()
+            await session.commit()
+        return result
@@ -1,6 +1,9 @@
 from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
 from uuid import UUID
 
+from fastapi_filters import FilterField, FilterOperator, FilterSet
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
@@ -48,6 +51,104 @@ class UserReturnFullData(UserReturnData):
     hashed_password: str
 
 
+class UserExportColumn(str, Enum):
+    uuid = "uuid"
+    login = "login"
+    nickname = "nickname"
+    email = "email"
+    age = "age"
+    phone_number = "phone_number"
+    is_verified = "is_verified"
+    is_superuser = "is_superuser"
+    is_active = "is_active"
+    created_at = "created_at"
+    updated_at = "updated_at"
+
+
+# `like` is a prefix and `ilike` a case-insensitive substring match; the
+# value is taken literally. Only operators backed by an index are offered.
+PATTERN_OPERATORS = [
+    FilterOperator.eq,
+    FilterOperator.in_,
+    FilterOperator.like,
+    FilterOperator.ilike,
+]
+RANGE_OPERATORS = [
+    FilterOperator.gt,
+    FilterOperator.ge,
+    FilterOperator.lt,
+    FilterOperator.le,
+]
+
+
+class UserSearchFilters(FilterSet):
+    login: FilterField[str] = FilterField(str, operators=PATTERN_OPERATORS)
+    email: FilterField[str] = FilterField(str, operators=PATTERN_OPERATORS)
+    phone_number: FilterField[str] = FilterField(str, operators=PATTERN_OPERATORS)
+    is_active: FilterField[bool] = FilterField(bool, operators=[FilterOperator.eq])
+    is_verified: FilterField[bool] = FilterField(bool, operators=[FilterOperator.eq])
+    created_at: FilterField[datetime] = FilterField(
+        datetime,
+        operators=RANGE_OPERATORS,
+    )
+
+
+class UserImportStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class UserImportError(BaseModel):
+    line: int
+    error: str
+    login: Optional[str] = None
+
+
+class UserImportJob(BaseModel):
+    job_id: str
+    status: UserImportStatus
+    format: str
+    rows: int = 0
+    inserted: int = 0
+    invalid: int = 0
+    rejected: int = 0
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    errors: list[UserImportError] = []
+
+
+class UserCredentials(BaseModel):
+    uuid: UUID
+    hashed_password: str
+    is_active: bool
+    role_uuids: list[UUID]
+
+
 class UserTokenResult(BaseModel):
     access_token: str
     refresh_token: str
+
+
+class TokenIntrospectBatch(BaseModel):
+    tokens: list[str] = Field(min_length=1, max_length=1000)
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    status: str
+    claims: Optional[dict[str, Any]] = None
+    ttl: Optional[int] = None
+
+
+class TokenIntrospectionResult(BaseModel):
+    results: list[TokenIntrospection]
+
+
+class SessionInfo(BaseModel):
+    session_id: str
+    created_at: datetime
+    expires_at: datetime
+    current: bool
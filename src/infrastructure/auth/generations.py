@@ -0,0 +1,146 @@
+from typing import Any, Iterable, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from infrastructure.cache.near_cache import NearCache
+
+GLOBAL_GENERATION_KEY = "auth:gen:global"
+USER_GENERATION_PREFIX = "auth:gen:user:"
+ROLE_GENERATION_PREFIX = "auth:gen:role:"
+
+
+class GenerationRegistry:
+    """
+    Revocation counters embedded in every issued token as the `gen` claim:
+    {"g": global, "u": user, "r": {role_uuid: role}}. A token is valid only
+    while none of its counters is behind the current value, so a single
+    INCR revokes every outstanding token of a user, a role or everyone.
+    Current values are read through a near cache invalidated on INCR.
+    """
+
+    def __init__(self, redis_client: Redis, near_cache: NearCache) -> None:
+        self.redis_client = redis_client
+        self.near_cache = near_cache
+
+    @staticmethod
+    def user_key(user_uuid: str) -> str:
+        return f"{USER_GENERATION_PREFIX}{user_uuid}"
+
+    @staticmethod
+    def role_key(role_uuid: str) -> str:
+        return f"{ROLE_GENERATION_PREFIX}{role_uuid}"
+
+    def _cached(self, keys: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+        values: dict[str, int] = {}
+        missing: list[str] = []
+        for key in dict.fromkeys(keys):
+            cached = self.near_cache.get(key)
+            if cached is None:
+                missing.append(key)
+            else:
+                values[key] = cached
+        return values, missing
+
+    def _store(
+        self,
+        values: dict[str, int],
+        missing: list[str],
+        reply: list[Optional[bytes]],
+    ) -> None:
+        for key, value in zip(missing, reply):
+            values[key] = int(value or 0)
+            self.near_cache.put(key, values[key])
+
+    async def _values(self, keys: list[str]) -> dict[str, int]:
+        values, missing = self._cached(keys)
+        if missing:
+            self._store(values, missing, await self.redis_client.mget(missing))
+        return values
+
+    def _keys(self, payload: dict[str, Any]) -> list[str]:
+        if not (token_generation := payload.get("gen")):
+            return []
+        return [
+            GLOBAL_GENERATION_KEY,
+            self.user_key(payload["sub"]),
+            *[self.role_key(role_uuid) for role_uuid in token_generation["r"]],
+        ]
+
+    def _is_current(self, payload: dict[str, Any], values: dict[str, int]) -> bool:
+        token_generation = payload.get("gen")
+        if not token_generation:
+            return False
+        return (
+            token_generation["g"] >= values[GLOBAL_GENERATION_KEY]
+            and token_generation["u"] >= values[self.user_key(payload["sub"])]
+            and all(
+                generation >= values[self.role_key(role_uuid)]
+                for role_uuid, generation in token_generation["r"].items()
+            )
+        )
+
+    async def current(
+        self,
+        user_uuid: str,
+        role_uuids: Iterable[str] = (),
+    ) -> dict[str, Any]:
+        role_uuids = [str(role_uuid) for role_uuid in role_uuids]
+        values = await self._values(
+            [
+                GLOBAL_GENERATION_KEY,
+                self.user_key(user_uuid),
+                *[self.role_key(role_uuid) for role_uuid in role_uuids],
+            ],
+        )
+        return {
+            "g": values[GLOBAL_GENERATION_KEY],
+            "u": values[self.user_key(user_uuid)],
+            "r": {
+                role_uuid: values[self.role_key(role_uuid)] for role_uuid in role_uuids
+            },
+        }
+
+    async def is_current(self, payload: dict[str, Any]) -> bool:
+        return self._is_current(payload, await self._values(self._keys(payload)))
+
+    def queue_lookup(
+        self,
+        pipe: Pipeline,
+        payloads: list[dict[str, Any]],
+    ) -> tuple[dict[str, int], list[str]]:
+        """
+        Queue one MGET for every counter of `payloads` the near cache does
+        not hold; pass the result and the MGET reply to `parse_lookup`
+        """
+        values, missing = self._cached(
+            key for payload in payloads for key in self._keys(payload)
+        )
+        if missing:
+            pipe.mget(missing)
+        return values, missing
+
+    def parse_lookup(
+        self,
+        payloads: list[dict[str, Any]],
+        lookup: tuple[dict[str, int], list[str]],
+        reply: Optional[list[Optional[bytes]]],
+    ) -> list[bool]:
+        values, missing = lookup
+        if missing:
+            self._store(values, missing, reply)
+        return [self._is_current(payload, values) for payload in payloads]
+
+    async def _bump(self, key: str) -> int:
+        generation = await self.redis_client.incr(key)
+        await self.near_cache.invalidate(key)
+        return generation
+
+    async def bump_global(self) -> int:
+        return await self._bump(GLOBAL_GENERATION_KEY)
+
+    async def bump_user(self, user_uuid: str) -> int:
+        return await self._bump(self.user_key(user_uuid))
+
+    async def bump_role(self, role_uuid: str) -> int:
+        return await self._bump(self.role_key(role_uuid))
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+from asyncio import get_running_loop
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from infrastructure.exceptions.token_exceptions import HashingUnavailable
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+
+def _timed_call(func: Callable, *args) -> tuple[Any, float, float]:
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+
+class HashWorkerPool:
+    """
+    Bounded process pool for CPU-heavy password hashing.
+    Callables must be module-level functions so they can be pickled.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int],
+        queue_size: int,
+        metrics: MetricsRegistry,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.metrics = metrics
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Created lazily so that forked background processes do not inherit it
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            logging.info(f"Пул хеширования запущен, процессов: {self.workers}")
+        return self._executor
+
+    async def submit(self, func: Callable, *args) -> Any:
+        if self._pending >= self.capacity:
+            self.metrics.inc("hash_pool.rejected")
+            raise HashingUnavailable
+        self._pending += 1
+        self.metrics.set_gauge("hash_pool.pending", self._pending)
+        submitted = time.monotonic()
+        try:
+            result, started, finished = await get_running_loop().run_in_executor(
+                self.executor,
+                partial(_timed_call, func, *args),
+            )
+        finally:
+            self._pending -= 1
+            self.metrics.set_gauge("hash_pool.pending", self._pending)
+        self.metrics.inc("hash_pool.completed")
+        self.metrics.observe("hash_pool.queue_wait", started - submitted)
+        self.metrics.observe("hash_pool.hash_time", finished - started)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logging.info("Пул хеширования остановлен")
@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi is an optional dependency
+    PasswordHasher = None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _split(encoded: str) -> tuple[str, dict[str, int], bytes, bytes]:
+    """
+    Parse `$scheme$k=v,k=v$salt$hash`
+    """
+    _, scheme, params, salt, digest = encoded.split("$")
+    return (
+        scheme,
+        {
+            key: int(value)
+            for key, value in (item.split("=") for item in params.split(","))
+        },
+        _b64decode(salt),
+        _b64decode(digest),
+    )
+
+
+def _join(scheme: str, params: dict[str, int], salt: bytes, digest: bytes) -> str:
+    encoded_params = ",".join(f"{key}={value}" for key, value in params.items())
+    return f"${scheme}${encoded_params}${_b64encode(salt)}${_b64encode(digest)}"
+
+
+class BaseHasher(ABC):
+    scheme: str
+    defaults: dict[str, int]
+
+    def params(self, params: Optional[dict[str, Any]] = None) -> dict[str, int]:
+        return {
+            key: int((params or {}).get(key, value))
+            for key, value in self.defaults.items()
+        }
+
+    @abstractmethod
+    def hash(self, password: str, params: dict[str, Any]) -> str:
+        pass
+
+    @abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        pass
+
+    def needs_rehash(self, encoded: str, params: dict[str, Any]) -> bool:
+        return _split(encoded)[1] != self.params(params)
+
+
+class PBKDF2Hasher(BaseHasher):
+    scheme = "pbkdf2-sha256"
+    defaults = {"iterations": 1000}
+
+    def _derive(self, password: str, salt: bytes, params: dict[str, int]) -> bytes:
+        return hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), salt, params["iterations"]
+        )
+
+    def hash(self, password: str, params: dict[str, Any]) -> str:
+        params, salt = self.params(params), os.urandom(16)
+        return _join(self.scheme, params, salt, self._derive(password, salt, params))
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, params, salt, digest = _split(encoded)
+        return hmac.compare_digest(self._derive(password, salt, params), digest)
+
+
+class ScryptHasher(BaseHasher):
+    scheme = "scrypt"
+    defaults = {"n": 16384, "r": 8, "p": 1}
+
+    def _derive(self, password: str, salt: bytes, params: dict[str, int]) -> bytes:
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt,
+            n=params["n"],
+            r=params["r"],
+            p=params["p"],
+            maxmem=256 * params["n"] * params["r"] * params["p"],
+            dklen=32,
+        )
+
+    def hash(self, password: str, params: dict[str, Any]) -> str:
+        params, salt = self.params(params), os.urandom(16)
+        return _join(self.scheme, params, salt, self._derive(password, salt, params))
+
+    def verify(self, password: str, encoded: str) -> bool:
+        _, params, salt, digest = _split(encoded)
+        return hmac.compare_digest(self._derive(password, salt, params), digest)
+
+
+class Argon2Hasher(BaseHasher):
+    """
+    Delegates to argon2-cffi, which already produces PHC strings:
+    `$argon2id$v=19$m=...,t=...,p=...$salt$hash`
+    """
+
+    scheme = "argon2id"
+    defaults = {"time_cost": 3, "memory_cost": 65536, "parallelism": 1}
+
+    def _hasher(self, params: Optional[dict[str, Any]] = None):
+        if PasswordHasher is None:
+            raise RuntimeError("argon2id requires the argon2-cffi package")
+        return PasswordHasher(**self.params(params))
+
+    def hash(self, password: str, params: dict[str, Any]) -> str:
+        return self._hasher(params).hash(password)
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            return self._hasher().verify(encoded, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, encoded: str, params: dict[str, Any]) -> bool:
+        return self._hasher(params).check_needs_rehash(encoded)
+
+
+HASHERS: dict[str, BaseHasher] = {
+    hasher.scheme: hasher for hasher in (PBKDF2Hasher(), ScryptHasher(), Argon2Hasher())
+}
+
+
+def get_hasher(scheme: str) -> BaseHasher:
+    if scheme not in HASHERS:
+        raise ValueError(f"Unknown password hashing scheme {scheme!r}")
+    if scheme == Argon2Hasher.scheme and PasswordHasher is None:
+        raise RuntimeError("argon2id requires the argon2-cffi package")
+    return HASHERS[scheme]
+
+
+def identify(encoded: str) -> Optional[str]:
+    """
+    Scheme of a self-describing hash; None for legacy hex digests
+    """
+    if encoded.startswith("$") and (scheme := encoded.split("$")[1]) in HASHERS:
+        return scheme
+    return None
+
+
+# Module-level entry points so they can run in the hashing process pool
+
+
+def hash_password(password: str, scheme: str, params: dict[str, Any]) -> str:
+    return HASHERS[scheme].hash(password, params)
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    return HASHERS[identify(encoded)].verify(password, encoded)
+
+
+def hash_passwords(
+    passwords: list[str], scheme: str, params: dict[str, Any]
+) -> list[str]:
+    hasher = HASHERS[scheme]
+    return [hasher.hash(password, params) for password in passwords]
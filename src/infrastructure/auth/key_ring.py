@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from jwt.algorithms import get_default_algorithms
+
+from infrastructure.exceptions.token_exceptions import InvalidToken, SigningKeyUnavailable
+
+SYMMETRIC_ALGORITHMS = ("HS256", "HS384", "HS512")
+DEFAULT_KID = "default"
+
+
+class SigningKey:
+    def __init__(self, kid: str, algorithm: str, key_data: str | bytes) -> None:
+        self.kid = kid
+        self.algorithm = algorithm
+        self._algorithm_impl = get_default_algorithms()[algorithm]
+        self.signing_key = self._algorithm_impl.prepare_key(key_data)
+        self.verifying_key = (
+            self.signing_key if self.is_symmetric else self.signing_key.public_key()
+        )
+
+    @property
+    def is_symmetric(self) -> bool:
+        return self.algorithm in SYMMETRIC_ALGORITHMS
+
+    def to_jwk(self) -> Optional[dict[str, Any]]:
+        if self.is_symmetric:
+            return None
+        jwk = self._algorithm_impl.to_jwk(self.verifying_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+def _timestamp(value: Any) -> float:
+    if value is None or value == "":
+        return 0.0
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+class KeyRing:
+    """
+    Signing keys indexed by `kid`. Tokens are signed with the newest key
+    whose `activates_at` has passed and verified with whichever key their
+    header names. A key superseded by a newer one stays valid for
+    `max_token_lifetime`, so every token it signed can expire naturally,
+    and is then retired. A key superseded by an unscheduled one (no
+    `activates_at`) can only count that from process start, so give it a
+    `not_after` to keep it retired across restarts; `not_after` retires
+    any key but the active one at that time. Keys scheduled for the
+    future are published in JWKS ahead of activation. Only public keys
+    are published.
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        algorithm: str,
+        keys: Optional[list[dict]] = None,
+        active_kid: Optional[str] = None,
+        max_token_lifetime: int = 0,
+        secret_not_after: Any = None,
+    ) -> None:
+        self._keys: dict[str, SigningKey] = {}
+        self._verifying: dict[str, SigningKey] = {}
+        self._schedule: list[tuple[float, str]] = []
+        self._not_after: dict[str, float] = {}
+        self._started_at = time.time()
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            self.add(
+                SigningKey(kid=DEFAULT_KID, algorithm=algorithm, key_data=secret),
+                not_after=_timestamp(secret_not_after) or None,
+            )
+        for key in keys or []:
+            self.add(
+                SigningKey(
+                    kid=key["kid"],
+                    algorithm=key["algorithm"],
+                    key_data=(
+                        key["secret"]
+                        if key["algorithm"] in SYMMETRIC_ALGORITHMS
+                        else Path(key["private_key_path"]).read_bytes()
+                    ),
+                ),
+                activates_at=_timestamp(key.get("activates_at")),
+                not_after=_timestamp(key.get("not_after")) or None,
+            )
+        if active_kid and active_kid not in self._keys:
+            raise ValueError(
+                f"AUTH.ACTIVE_KID {active_kid!r} is not a configured signing key,"
+                f" expected one of {sorted(self._keys)}"
+            )
+        for (_, kid), (superseded_at, _) in zip(self._schedule, self._schedule[1:]):
+            if not superseded_at and kid not in self._not_after:
+                logging.warning(
+                    f"Ключ подписи {kid} вытеснен ключом без activates_at и без"
+                    f" not_after: срок его отзыва отсчитывается заново при каждом запуске"
+                )
+        self._active_override = active_kid
+        self.max_token_lifetime = max_token_lifetime
+        self._refresh(time.time())
+
+    def add(
+        self,
+        key: SigningKey,
+        activates_at: float = 0.0,
+        not_after: Optional[float] = None,
+    ) -> None:
+        self._keys[key.kid] = key
+        if not_after is None:
+            self._not_after.pop(key.kid, None)
+        else:
+            self._not_after[key.kid] = not_after
+        self._schedule = sorted(
+            [
+                *[item for item in self._schedule if item[1] != key.kid],
+                (activates_at, key.kid),
+            ],
+            key=lambda item: item[0],
+        )
+        self._next_transition = 0.0
+
+    def _refresh(self, now: float) -> None:
+        activated = [kid for activates_at, kid in self._schedule if activates_at <= now]
+        # None until the first scheduled key activates; nothing can sign then
+        active_kid = self._active_override or (activated[-1] if activated else None)
+        transitions = [
+            activates_at for activates_at, _ in self._schedule if activates_at > now
+        ]
+        superseded = {
+            kid: superseded_at
+            for (_, kid), (superseded_at, _) in zip(self._schedule, self._schedule[1:])
+        }
+        retired = set()
+        for _, kid in self._schedule:
+            if kid == active_kid:
+                continue
+            if kid in self._not_after:
+                retire_at = self._not_after[kid]
+            elif kid in superseded:
+                # Keys superseded by an unscheduled key count as superseded
+                # when this process started; scheduled supersessions are absolute
+                retire_at = (
+                    superseded[kid] or self._started_at
+                ) + self.max_token_lifetime
+            else:
+                continue
+            if retire_at <= now:
+                retired.add(kid)
+            else:
+                transitions.append(retire_at)
+        if getattr(self, "_active_kid", None) != active_kid:
+            logging.info(f"Активный ключ подписи: {active_kid}")
+        self._active_kid = active_kid
+        self._verifying = {
+            kid: key for kid, key in self._keys.items() if kid not in retired
+        }
+        self._next_transition = min(transitions, default=float("inf"))
+        self._refresh_jwks()
+
+    def _maybe_refresh(self) -> None:
+        if (now := time.time()) >= self._next_transition:
+            self._refresh(now)
+
+    @property
+    def active(self) -> SigningKey:
+        self._maybe_refresh()
+        if self._active_kid is None:
+            raise SigningKeyUnavailable
+        return self._keys[self._active_kid]
+
+    def get(self, kid: Optional[str]) -> SigningKey:
+        self._maybe_refresh()
+        # Tokens issued before kid headers were introduced use the shared secret
+        if key := self._verifying.get(kid or DEFAULT_KID):
+            return key
+        raise InvalidToken
+
+    def jwks(self) -> tuple[bytes, str]:
+        self._maybe_refresh()
+        return self._jwks_body, self._jwks_etag
+
+    def _refresh_jwks(self) -> None:
+        jwks = {
+            "keys": [jwk for key in self._verifying.values() if (jwk := key.to_jwk())]
+        }
+        self._jwks_body = orjson.dumps(jwks)
+        self._jwks_etag = f'"{hashlib.sha256(self._jwks_body).hexdigest()[:32]}"'
@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from redis.asyncio import Redis
+
+from infrastructure.auth.redis_scripts import SLIDING_WINDOW, RedisScripts
+from infrastructure.exceptions.user_exceptions import TooManyAttempts
+from infrastructure.utils.asyncio.asyncio_handlers import run_with_timeout
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+THROTTLE_PREFIX = "auth:throttle:"
+
+
+class LocalWindows:
+    """
+    In-process sliding window counters used while Redis is unavailable.
+    Each key keeps (window index, previous count, current count).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._windows: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+
+    def _counts(self, key: str, window_index: int) -> tuple[int, int]:
+        index, previous, current = self._windows.get(key, (window_index, 0, 0))
+        if index == window_index:
+            return previous, current
+        if index == window_index - 1:
+            return current, 0
+        return 0, 0
+
+    def hit(self, checks: list[tuple[str, int, float, int, int]]) -> int:
+        for position, (key, window_index, elapsed, limit, _) in enumerate(checks, 1):
+            previous, current = self._counts(key, window_index)
+            if previous * (1 - elapsed) + current >= limit:
+                return position
+        for key, window_index, *_ in checks:
+            previous, current = self._counts(key, window_index)
+            self._windows[key] = (window_index, previous, current + 1)
+            self._windows.move_to_end(key)
+        while len(self._windows) > self.max_size:
+            self._windows.popitem(last=False)
+        return 0
+
+
+class LoginThrottle:
+    """
+    Sliding window limits on login attempts per login, per client IP and a
+    global budget, checked and counted in one Redis script before any
+    database or hashing work. The window is approximated from the previous
+    and current fixed window counters. When Redis does not answer within
+    `timeout`, the same limits are enforced per replica in process.
+    """
+
+    scopes = ("login", "ip", "global")
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        metrics: MetricsRegistry,
+        limits: dict[str, Any],
+        timeout: float,
+        enabled: bool = True,
+        fallback_size: int = 100000,
+    ) -> None:
+        self.redis_client = redis_client
+        self.scripts = RedisScripts(redis_client=redis_client)
+        self.metrics = metrics
+        self.limits = {
+            scope: (int(limits[scope]["limit"]), int(limits[scope]["window"]))
+            for scope in self.scopes
+        }
+        self.timeout = timeout
+        self.enabled = enabled
+        self.fallback = LocalWindows(max_size=fallback_size)
+
+    def _checks(
+        self, login: str, client_ip: str
+    ) -> list[tuple[str, int, float, int, int]]:
+        now = time.time()
+        subjects = {"login": login.lower(), "ip": client_ip, "global": "all"}
+        checks = []
+        for scope in self.scopes:
+            limit, window = self.limits[scope]
+            window_index, offset = divmod(now, window)
+            checks.append(
+                (
+                    f"{THROTTLE_PREFIX}{scope}:{subjects[scope]}",
+                    int(window_index),
+                    offset / window,
+                    limit,
+                    window,
+                ),
+            )
+        return checks
+
+    async def _hit_redis(self, checks: list[tuple[str, int, float, int, int]]) -> int:
+        keys, args = [], []
+        for key, window_index, elapsed, limit, window in checks:
+            keys.extend([f"{key}:{window_index - 1}", f"{key}:{window_index}"])
+            args.extend([elapsed, limit, 2 * window])
+        return await self.scripts.call(SLIDING_WINDOW, keys=keys, args=args)
+
+    async def check(self, login: str, client_ip: str) -> None:
+        if not self.enabled:
+            return
+        checks = self._checks(login=login, client_ip=client_ip)
+        exhausted = await run_with_timeout(
+            self._hit_redis(checks),
+            timeout=self.timeout,
+            operation_name="login throttle",
+        )
+        if exhausted is None:
+            self.metrics.inc("login_throttle.fallback")
+            exhausted = self.fallback.hit(checks)
+        if exhausted:
+            self.metrics.inc(f"login_throttle.rejected.{self.scopes[exhausted - 1]}")
+            raise TooManyAttempts
+        self.metrics.inc("login_throttle.allowed")
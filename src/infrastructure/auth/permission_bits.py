@@ -0,0 +1,76 @@
+from typing import Iterable, Optional
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+
+from infrastructure.auth.redis_scripts import INTERN_PERMISSIONS, RedisScripts
+
+PERMISSION_BITS_KEY = "authz:permission_bits"
+# Not a uuid, so it cannot clash with an interned permission
+EPOCH_FIELD = "epoch"
+
+
+class PermissionBitIndex:
+    """
+    Interns every permission uuid to a stable bit position shared by all
+    replicas, so permission sets become Python ints and a check is a
+    single AND. Positions are only ever appended.
+
+    The hash carries a random epoch set when it is created. If it is
+    flushed or evicted, positions are handed out again under a new epoch:
+    positions cached from another epoch are dropped, and masks must be
+    built under the epoch they are checked against.
+    """
+
+    def __init__(self, redis_client: Redis, key: str = PERMISSION_BITS_KEY) -> None:
+        self.redis_client = redis_client
+        self.key = key
+        self.scripts = RedisScripts(redis_client=redis_client)
+        self.epoch: Optional[str] = None
+        self._indexes: dict[str, int] = {}
+
+    def _reset(self, epoch: Optional[str]) -> None:
+        if epoch != self.epoch:
+            self._indexes.clear()
+            self.epoch = epoch
+
+    async def sync(self) -> Optional[str]:
+        """
+        Read the epoch of the hash, dropping positions cached from another one;
+        None while nothing has been interned
+        """
+        self._reset(await self.redis_client.hget(self.key, EPOCH_FIELD))
+        return self.epoch
+
+    async def intern(self, perm_uuids: Iterable[UUID | str]) -> dict[str, int]:
+        perm_uuids = {str(perm_uuid) for perm_uuid in perm_uuids}
+        while missing := [uuid for uuid in perm_uuids if uuid not in self._indexes]:
+            epoch, *indexes = await self.scripts.call(
+                INTERN_PERMISSIONS,
+                keys=[self.key],
+                args=[uuid4().hex, *missing],
+            )
+            self._reset(epoch)
+            self._indexes.update(zip(missing, indexes))
+        return {uuid: self._indexes[uuid] for uuid in perm_uuids}
+
+    async def lookup(self, perm_uuids: Iterable[UUID | str]) -> dict[str, int]:
+        """
+        Like `intern` but never assigns: unknown uuids are left out
+        """
+        perm_uuids = {str(perm_uuid) for perm_uuid in perm_uuids}
+        if missing := [uuid for uuid in perm_uuids if uuid not in self._indexes]:
+            epoch, *indexes = await self.redis_client.hmget(
+                self.key, [EPOCH_FIELD, *missing]
+            )
+            if epoch != self.epoch:
+                self._reset(epoch)
+                return await self.lookup(perm_uuids)
+            self._indexes.update(
+                (uuid, int(index))
+                for uuid, index in zip(missing, indexes)
+                if index is not None
+            )
+        return {
+            uuid: self._indexes[uuid] for uuid in perm_uuids if uuid in self._indexes
+        }
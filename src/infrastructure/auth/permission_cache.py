@@ -0,0 +1,112 @@
+from typing import Any, Optional
+from uuid import UUID
+
+import orjson
+from redis.asyncio import Redis
+
+from infrastructure.auth.redis_scripts import SET_IF_VERSION, RedisScripts
+from infrastructure.cache.near_cache import NearCache
+
+EFFECTIVE_PERMISSIONS_PREFIX = "authz:effective:"
+EFFECTIVE_VERSION_PREFIX = "authz:effective_version:"
+
+
+class EffectivePermissionCache:
+    """
+    Resolved permission sets per user, kept in Redis and in a near cache.
+    Every RBAC write invalidates exactly the users whose sets it changes
+    and bumps their version counter. A resolve reads the versions before
+    loading from the database and only stores sets whose version is
+    unchanged, so a resolve racing with a write cannot cache the set from
+    before it.
+    """
+
+    def __init__(self, redis_client: Redis, near_cache: NearCache, ttl: int) -> None:
+        self.redis_client = redis_client
+        self.near_cache = near_cache
+        self.ttl = ttl
+        self.scripts = RedisScripts(redis_client=redis_client)
+
+    @staticmethod
+    def effective_key(user_uuid: UUID | str) -> str:
+        return f"{EFFECTIVE_PERMISSIONS_PREFIX}{user_uuid}"
+
+    @staticmethod
+    def version_key(user_uuid: UUID | str) -> str:
+        return f"{EFFECTIVE_VERSION_PREFIX}{user_uuid}"
+
+    async def get(self, user_uuid: UUID | str) -> Optional[dict[str, Any]]:
+        key = self.effective_key(user_uuid)
+        if (cached := self.near_cache.get(key)) is not None:
+            return cached
+        if raw := await self.redis_client.get(key):
+            cached = orjson.loads(raw)
+            self.near_cache.put(key, cached)
+        return cached
+
+    async def get_many(self, user_uuids: list[UUID | str]) -> dict[str, dict[str, Any]]:
+        """
+        Cached sets for the given users in at most one MGET; misses are omitted
+        """
+        found, missing = {}, []
+        for user_uuid in user_uuids:
+            key = self.effective_key(user_uuid)
+            if (cached := self.near_cache.get(key)) is not None:
+                found[str(user_uuid)] = cached
+            else:
+                missing.append(user_uuid)
+        if missing:
+            keys = [self.effective_key(user_uuid) for user_uuid in missing]
+            for user_uuid, key, raw in zip(
+                missing, keys, await self.redis_client.mget(keys)
+            ):
+                if raw:
+                    found[str(user_uuid)] = orjson.loads(raw)
+                    self.near_cache.put(key, found[str(user_uuid)])
+        return found
+
+    async def versions(self, user_uuids: list[UUID | str]) -> dict[str, str]:
+        """
+        Current version of every user, to be read before resolving their sets
+        and passed to `put_many`
+        """
+        reply = await self.redis_client.mget(
+            [self.version_key(user_uuid) for user_uuid in user_uuids]
+        )
+        return {
+            str(user_uuid): version or "0"
+            for user_uuid, version in zip(user_uuids, reply)
+        }
+
+    async def put_many(
+        self,
+        effectives: dict[UUID | str, dict[str, Any]],
+        versions: dict[str, str],
+    ) -> None:
+        """
+        Store the sets of the users whose version is still the one in
+        `versions`; the others were invalidated while resolving
+        """
+        if not effectives:
+            return
+        keys, args = [], [self.ttl]
+        for user_uuid, effective in effectives.items():
+            keys += [self.version_key(user_uuid), self.effective_key(user_uuid)]
+            args += [versions[str(user_uuid)], orjson.dumps(effective)]
+        stored = await self.scripts.call(SET_IF_VERSION, keys=keys, args=args)
+        for (user_uuid, effective), ok in zip(effectives.items(), stored):
+            if ok:
+                self.near_cache.put(self.effective_key(user_uuid), effective)
+
+    async def invalidate(self, *user_uuids: UUID | str) -> None:
+        if not user_uuids:
+            return
+        keys = [self.effective_key(user_uuid) for user_uuid in user_uuids]
+        # Versions first: a resolve storing between the two steps must fail
+        pipe = self.redis_client.pipeline(transaction=False)
+        for user_uuid in user_uuids:
+            pipe.incr(self.version_key(user_uuid))
+            pipe.expire(self.version_key(user_uuid), self.ttl)
+        pipe.delete(*keys)
+        await pipe.execute()
+        await self.near_cache.invalidate(*keys)
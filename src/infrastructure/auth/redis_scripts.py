@@ -0,0 +1,182 @@
+import logging
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+# KEYS[1] - session hash, KEYS[2] - user sessions index
+# ARGV[1] - presented refresh token digest, ARGV[2] - new refresh token digest,
+# ARGV[3] - new access token jti, ARGV[4] - ttl, ARGV[5] - session id,
+# ARGV[6] - new expiry timestamp, ARGV[7] - now
+# Returns 1 when rotated, 0 when the session is missing, -1 on token mismatch.
+ROTATE_SESSION = """
+local current = redis.call('HGET', KEYS[1], 'rt')
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    return -1
+end
+redis.call('HSET', KEYS[1], 'rt', ARGV[2], 'aj', ARGV[3], 'e', ARGV[6])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[7])
+redis.call('ZADD', KEYS[2], ARGV[6], ARGV[5])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return 1
+"""
+
+# KEYS[1] - session hash, KEYS[2] - user sessions index
+# ARGV[1] - session id, ARGV[2] - now
+# Returns {access jti, expires at} of the removed session,
+# or nil when the session does not belong to the user
+REVOKE_SESSION = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 then
+    return false
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+local current = redis.call('HMGET', KEYS[1], 'aj', 'e')
+redis.call('DEL', KEYS[1])
+return {current[1] or '', current[2] or ''}
+"""
+
+# KEYS[1] - baseline session (bare user uuid), KEYS[2] - session hash,
+# KEYS[3] - user sessions index
+# ARGV[1] - presented refresh token, ARGV[2] - its digest, ARGV[3] - user uuid,
+# ARGV[4] - session id, ARGV[5] - encoding version, ARGV[6] - created at,
+# ARGV[7] - now, ARGV[8] - ttl
+# Moves a baseline JSON session holding the presented refresh token to a hash
+# record with its remaining lifetime. Returns 1 when moved, 0 when there is no
+# baseline session, -1 when it holds another refresh token.
+MIGRATE_LEGACY_SESSION = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return 0
+end
+local ok, tokens = pcall(cjson.decode, raw)
+if not ok or type(tokens) ~= 'table' or tokens['refresh_token'] ~= ARGV[1] then
+    return -1
+end
+local ttl = redis.call('TTL', KEYS[1])
+if ttl <= 0 then
+    ttl = tonumber(ARGV[8])
+end
+local expires_at = tonumber(ARGV[7]) + ttl
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[2], 'v', ARGV[5], 'u', ARGV[3], 'rt', ARGV[2], 'c', ARGV[6], 'e', expires_at)
+redis.call('EXPIRE', KEYS[2], ttl)
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', ARGV[7])
+redis.call('ZADD', KEYS[3], expires_at, ARGV[4])
+redis.call('EXPIRE', KEYS[3], ARGV[8])
+return 1
+"""
+
+# KEYS[1] - user sessions index, KEYS[2..n] - session hashes
+# ARGV - session ids, in the order of their KEYS
+# Returns a flat list of (session id, access jti, expires at) for the removed sessions
+REVOKE_ALL_SESSIONS = """
+local removed = {}
+for i, session_id in ipairs(ARGV) do
+    local current = redis.call('HMGET', KEYS[i + 1], 'aj', 'e')
+    redis.call('DEL', KEYS[i + 1])
+    redis.call('ZREM', KEYS[1], session_id)
+    table.insert(removed, session_id)
+    table.insert(removed, current[1] or '')
+    table.insert(removed, current[2] or '')
+end
+return removed
+"""
+
+# KEYS - (previous window counter, current window counter) pairs, one per limit
+# ARGV - (elapsed fraction of the current window, limit, counter ttl) per limit
+# Returns 0 and counts the attempt when every sliding window is under its limit,
+# otherwise the 1-based position of the first exhausted limit without counting
+SLIDING_WINDOW = """
+for i = 1, #KEYS / 2 do
+    local previous = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local current = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    local elapsed = tonumber(ARGV[3 * i - 2])
+    if previous * (1 - elapsed) + current >= tonumber(ARGV[3 * i - 1]) then
+        return i
+    end
+end
+for i = 1, #KEYS / 2 do
+    redis.call('INCR', KEYS[2 * i])
+    redis.call('EXPIRE', KEYS[2 * i], ARGV[3 * i])
+end
+return 0
+"""
+
+# KEYS - (version counter, cached value) pairs, one per user
+# ARGV[1] - ttl, then (expected version, value) per pair
+# Writes every value whose version counter still holds the expected version
+# (a missing counter is version 0). Returns 1 or 0 per pair.
+SET_IF_VERSION = """
+local stored = {}
+for i = 1, #KEYS / 2 do
+    if (redis.call('GET', KEYS[2 * i - 1]) or '0') == ARGV[2 * i] then
+        redis.call('SET', KEYS[2 * i], ARGV[2 * i + 1], 'EX', ARGV[1])
+        stored[i] = 1
+    else
+        stored[i] = 0
+    end
+end
+return stored
+"""
+
+# KEYS[1] - permission bit index hash
+# ARGV[1] - epoch to start the hash with if it has none, ARGV[2..n] - permission uuids
+# Returns the epoch of the hash followed by the bit index of every uuid,
+# assigning the next free index to new ones. Indexes are never removed and
+# the epoch is the only other field, so HLEN - 1 is always the next free index.
+INTERN_PERMISSIONS = """
+local epoch = redis.call('HGET', KEYS[1], 'epoch')
+if not epoch then
+    epoch = ARGV[1]
+    redis.call('HSET', KEYS[1], 'epoch', epoch)
+end
+local indexes = {epoch}
+for i = 2, #ARGV do
+    local index = redis.call('HGET', KEYS[1], ARGV[i])
+    if not index then
+        index = redis.call('HLEN', KEYS[1]) - 1
+        redis.call('HSET', KEYS[1], ARGV[i], index)
+    end
+    indexes[i] = tonumber(index)
+end
+return indexes
+"""
+
+
+class RedisScripts:
+    """
+    Lua scripts loaded once with SCRIPT LOAD and invoked with EVALSHA.
+    A NOSCRIPT reply (e.g. after a Redis restart) reloads the script once.
+    """
+
+    scripts: tuple[str, ...] = (
+        ROTATE_SESSION,
+        REVOKE_SESSION,
+        REVOKE_ALL_SESSIONS,
+        MIGRATE_LEGACY_SESSION,
+    )
+
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis_client = redis_client
+        self._shas: dict[str, str] = {}
+
+    async def _load(self, script: str) -> str:
+        self._shas[script] = await self.redis_client.script_load(script)
+        return self._shas[script]
+
+    async def load(self) -> None:
+        for script in self.scripts:
+            await self._load(script)
+        logging.info("Lua скрипты загружены в redis")
+
+    async def call(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        sha = self._shas.get(script) or await self._load(script)
+        try:
+            return await self.redis_client.evalsha(sha, len(keys), *keys, *args)
+        except NoScriptError:
+            sha = await self._load(script)
+            return await self.redis_client.evalsha(sha, len(keys), *keys, *args)
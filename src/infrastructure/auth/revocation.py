@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import AsyncIterator, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+REVOKED_SET = "auth:revoked:jtis"
+REVOKED_STREAM = "auth:revoked:stream"
+REBUILD_PAGE = 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.items = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> list[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8]), int.from_bytes(digest[8:]) | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.items += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def estimated_error_rate(self) -> float:
+        return (
+            1 - math.exp(-self.hash_count * self.items / self.size)
+        ) ** self.hash_count
+
+
+class RevocationList:
+    """
+    Deny-list of revoked access token `jti`s, kept in one sorted set scored
+    by the expiry of each token and announced on a Redis stream. Every
+    replica folds the stream into a local Bloom filter, so Redis is only
+    consulted when the filter reports a possible hit. The filter is rebuilt
+    periodically from the unexpired members, after trimming expired ones,
+    so neither costs more than the deny-list itself.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        metrics: MetricsRegistry,
+        capacity: int,
+        error_rate: float,
+        rebuild_interval: int,
+        stream_maxlen: int,
+    ) -> None:
+        self.redis_client = redis_client
+        self.metrics = metrics
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.stream_maxlen = stream_maxlen
+        self._bloom: Optional[BloomFilter] = None
+        self._last_id = "0-0"
+        self._checks = 0
+        self._false_positives = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    def _report(self) -> None:
+        if self._bloom is None:
+            return
+        self.metrics.set_gauge("revocation.bloom.items", self._bloom.items)
+        self.metrics.set_gauge(
+            "revocation.bloom.memory_bytes", self._bloom.memory_bytes
+        )
+        self.metrics.set_gauge(
+            "revocation.bloom.estimated_error_rate",
+            self._bloom.estimated_error_rate,
+        )
+
+    async def revoke(self, jti: str, expires_at: int) -> None:
+        ttl = int(expires_at) - int(time.time())
+        if ttl <= 0:
+            return
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zadd(REVOKED_SET, {jti: int(expires_at)})
+        pipe.xadd(
+            REVOKED_STREAM,
+            {"jti": jti},
+            maxlen=self.stream_maxlen,
+            approximate=True,
+        )
+        await pipe.execute()
+        if self._bloom is not None:
+            self._bloom.add(jti)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """
+        False means definitely not revoked; True needs a Redis confirmation
+        """
+        if self._bloom is None:
+            return True
+        self._checks += 1
+        if jti in self._bloom:
+            self.metrics.inc("revocation.bloom.positives")
+            return True
+        self.metrics.inc("revocation.bloom.negatives")
+        return False
+
+    def confirm(self, jti: str, revoked: bool) -> bool:
+        if not revoked and self._bloom is not None:
+            self._false_positives += 1
+            self.metrics.inc("revocation.bloom.false_positives")
+            self.metrics.set_gauge(
+                "revocation.bloom.false_positive_rate",
+                self._false_positives / self._checks,
+            )
+        return revoked
+
+    @staticmethod
+    def queue_lookup(pipe: Pipeline, jti: str) -> None:
+        pipe.zscore(REVOKED_SET, jti)
+
+    def parse_lookup(self, jti: str, reply: Optional[float]) -> bool:
+        # Expired members stay until the next rebuild trims them
+        return self.confirm(jti, reply is not None and reply > time.time())
+
+    async def is_revoked(self, jti: str) -> bool:
+        if not self.might_be_revoked(jti):
+            return False
+        return self.parse_lookup(jti, await self.redis_client.zscore(REVOKED_SET, jti))
+
+    async def _unexpired(self, now: int) -> AsyncIterator[str]:
+        """
+        Members scored after `now`, paged by score. Members sharing the
+        last score of a page are skipped by offset on the next one.
+        """
+        minimum, offset = f"({now}", 0
+        while True:
+            page = await self.redis_client.zrangebyscore(
+                REVOKED_SET,
+                minimum,
+                "+inf",
+                start=offset,
+                num=REBUILD_PAGE,
+                withscores=True,
+            )
+            for jti, _ in page:
+                yield jti
+            if len(page) < REBUILD_PAGE:
+                return
+            last = int(page[-1][1])
+            ties = sum(1 for _, score in page if int(score) == last)
+            if minimum == last:
+                offset += len(page)
+            else:
+                minimum, offset = last, ties
+
+    async def rebuild(self) -> None:
+        # Take the stream position first so entries added while paging are replayed
+        last_entries = await self.redis_client.xrevrange(REVOKED_STREAM, count=1)
+        last_id = last_entries[0][0] if last_entries else "0-0"
+        now = int(time.time())
+        await self.redis_client.zremrangebyscore(REVOKED_SET, "-inf", now)
+        bloom = BloomFilter(capacity=self.capacity, error_rate=self.error_rate)
+        async for jti in self._unexpired(now):
+            bloom.add(jti)
+        self._bloom, self._last_id = bloom, last_id
+        self._report()
+        logging.info(f"Bloom фильтр отозванных токенов перестроен: {bloom.items}")
+
+    async def _follow(self) -> None:
+        rebuilt_at = 0.0
+        while True:
+            try:
+                if time.monotonic() - rebuilt_at > self.rebuild_interval:
+                    await self.rebuild()
+                    rebuilt_at = time.monotonic()
+                response = await self.redis_client.xread(
+                    {REVOKED_STREAM: self._last_id},
+                    block=5000,
+                    count=1000,
+                )
+                for _, entries in response:
+                    for entry_id, fields in entries:
+                        self._bloom.add(fields["jti"])
+                        self._last_id = entry_id
+                self._report()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logging.error(f"Ошибка чтения потока отозванных токенов: {error}")
+                # Fall back to Redis lookups until the filter is rebuilt
+                self._bloom, rebuilt_at = None, 0.0
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._follow())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
@@ -0,0 +1,270 @@
+import hashlib
+import time
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+from infrastructure.auth.redis_scripts import (
+    MIGRATE_LEGACY_SESSION,
+    REVOKE_ALL_SESSIONS,
+    REVOKE_SESSION,
+    ROTATE_SESSION,
+    RedisScripts,
+)
+from infrastructure.cache.near_cache import NearCache
+
+SESSION_VERSION = "2"
+SESSION_PREFIX = "auth:session:v2:"
+USER_SESSIONS_PREFIX = "auth:user_sessions:"
+
+
+def refresh_digest(refresh_token: str) -> str:
+    return hashlib.blake2b(refresh_token.encode(), digest_size=16).hexdigest()
+
+
+class SessionStore:
+    """
+    One record per device session, keyed by user and session id, plus a
+    per-user sorted set of session ids scored by expiry. Expired index
+    entries are trimmed lazily on every write and listing. The user uuid is
+    the hash tag of both keys, so the scripts touching a user's sessions
+    stay within one Redis Cluster slot.
+
+    Records are small Redis hashes holding a fixed-size refresh token digest:
+    v - encoding version, u - user uuid, rt - refresh token digest,
+    aj - access token jti, c - created at, e - expires at.
+
+    Reads may be served from an optional near cache; every write that
+    changes or removes a record invalidates it on all replicas.
+
+    Rollout: sessions written before this layout are JSON blobs holding
+    both tokens under the bare user uuid. They are moved to a record the
+    first time their refresh token is presented (see `migrate_legacy`), so
+    the fallback can be removed once one AUTH.EXPIRATION has passed after
+    deploy.
+    """
+
+    lookup_size = 2
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        scripts: RedisScripts,
+        ttl: int,
+        near_cache: Optional[NearCache] = None,
+    ) -> None:
+        self.redis_client = redis_client
+        self.scripts = scripts
+        self.ttl = ttl
+        self.near_cache = near_cache
+
+    @staticmethod
+    def session_key(user_uuid: str, session_id: str) -> str:
+        return f"{SESSION_PREFIX}{{{user_uuid}}}:{session_id}"
+
+    @staticmethod
+    def index_key(user_uuid: str) -> str:
+        return f"{USER_SESSIONS_PREFIX}{{{user_uuid}}}"
+
+    @staticmethod
+    def legacy_key(user_uuid: str) -> str:
+        # Hashes to the same Cluster slot as the `{user_uuid}` tagged keys
+        return user_uuid
+
+    def queue_lookup(self, pipe: Pipeline, user_uuid: str, session_id: str) -> None:
+        """
+        Queue the `lookup_size` commands parsed by `parse_lookup`
+        """
+        pipe.hgetall(self.session_key(user_uuid, session_id))
+        pipe.ttl(self.session_key(user_uuid, session_id))
+
+    @staticmethod
+    def parse_lookup(replies: list[Any]) -> Optional[dict[str, Any]]:
+        record, ttl = replies
+        if not record:
+            return None
+        return {
+            "user_uuid": record["u"],
+            "refresh_digest": record["rt"],
+            "access_jti": record.get("aj"),
+            "created_at": int(record["c"]),
+            "expires_at": int(record["e"]),
+            "ttl": ttl,
+        }
+
+    async def create(
+        self,
+        session_id: str,
+        user_uuid: str,
+        refresh_token: str,
+        access_jti: str,
+    ) -> None:
+        now = int(time.time())
+        session_key = self.session_key(user_uuid, session_id)
+        index_key = self.index_key(user_uuid)
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.hset(
+            session_key,
+            mapping={
+                "v": SESSION_VERSION,
+                "u": user_uuid,
+                "rt": refresh_digest(refresh_token),
+                "aj": access_jti,
+                "c": now,
+                "e": now + self.ttl,
+            },
+        )
+        pipe.expire(session_key, self.ttl)
+        pipe.zremrangebyscore(index_key, "-inf", now)
+        pipe.zadd(index_key, {session_id: now + self.ttl})
+        pipe.expire(index_key, self.ttl)
+        await pipe.execute()
+
+    async def migrate_legacy(
+        self,
+        session_id: str,
+        user_uuid: str,
+        refresh_token: str,
+        created_at: int,
+    ) -> bool:
+        """
+        Move the baseline session holding `refresh_token` to a record under
+        `session_id`, keeping its remaining lifetime
+        """
+        now = int(time.time())
+        migrated = await self.scripts.call(
+            MIGRATE_LEGACY_SESSION,
+            keys=[
+                self.legacy_key(user_uuid),
+                self.session_key(user_uuid, session_id),
+                self.index_key(user_uuid),
+            ],
+            args=[
+                refresh_token,
+                refresh_digest(refresh_token),
+                user_uuid,
+                session_id,
+                SESSION_VERSION,
+                created_at,
+                now,
+                self.ttl,
+            ],
+        )
+        return migrated == 1
+
+    async def _invalidate(self, *session_ids: str) -> None:
+        if self.near_cache:
+            await self.near_cache.invalidate(*session_ids)
+
+    async def get(self, user_uuid: str, session_id: str) -> Optional[dict[str, Any]]:
+        if self.near_cache and (session := self.near_cache.get(session_id)):
+            return session
+        pipe = self.redis_client.pipeline(transaction=False)
+        self.queue_lookup(pipe=pipe, user_uuid=user_uuid, session_id=session_id)
+        session = self.parse_lookup(await pipe.execute())
+        if self.near_cache and session:
+            self.near_cache.put(session_id, session)
+        return session
+
+    async def rotate(
+        self,
+        session_id: str,
+        user_uuid: str,
+        presented_refresh_token: str,
+        refresh_token: str,
+        access_jti: str,
+    ) -> bool:
+        now = int(time.time())
+        rotated = await self.scripts.call(
+            ROTATE_SESSION,
+            keys=[self.session_key(user_uuid, session_id), self.index_key(user_uuid)],
+            args=[
+                refresh_digest(presented_refresh_token),
+                refresh_digest(refresh_token),
+                access_jti,
+                self.ttl,
+                session_id,
+                now + self.ttl,
+                now,
+            ],
+        )
+        await self._invalidate(session_id)
+        return rotated == 1
+
+    async def list_sessions(self, user_uuid: str) -> list[dict[str, Any]]:
+        now = int(time.time())
+        index_key = self.index_key(user_uuid)
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.zremrangebyscore(index_key, "-inf", now)
+        pipe.zrangebyscore(index_key, now, "+inf")
+        _, session_ids = await pipe.execute()
+        if not session_ids:
+            return []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for session_id in session_ids:
+            self.queue_lookup(pipe=pipe, user_uuid=user_uuid, session_id=session_id)
+        replies = await pipe.execute()
+        sessions = []
+        for position, session_id in enumerate(session_ids):
+            offset = position * self.lookup_size
+            if session := self.parse_lookup(
+                replies[offset : offset + self.lookup_size]
+            ):
+                sessions.append({"session_id": session_id, **session})
+        return sessions
+
+    async def revoke(self, session_id: str, user_uuid: str) -> Optional[dict[str, Any]]:
+        """
+        Remove the session; returns its current access token jti and expiry
+        """
+        revoked = await self.scripts.call(
+            REVOKE_SESSION,
+            keys=[self.session_key(user_uuid, session_id), self.index_key(user_uuid)],
+            args=[session_id, int(time.time())],
+        )
+        await self._invalidate(session_id)
+        if revoked is None:
+            return None
+        access_jti, expires_at = revoked
+        return {
+            "session_id": session_id,
+            "access_jti": access_jti or None,
+            "expires_at": int(expires_at) if expires_at else None,
+        }
+
+    async def revoke_all(self, user_uuid: str) -> list[dict[str, Any]]:
+        """
+        Remove every session in the user's index. The script only touches
+        keys passed in KEYS, so the ids are read first; a session created
+        in between is left to the next revocation.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.delete(self.legacy_key(user_uuid))
+        pipe.zrange(self.index_key(user_uuid), 0, -1)
+        _, session_ids = await pipe.execute()
+        if not session_ids:
+            return []
+        removed = await self.scripts.call(
+            REVOKE_ALL_SESSIONS,
+            keys=[
+                self.index_key(user_uuid),
+                *[
+                    self.session_key(user_uuid, session_id)
+                    for session_id in session_ids
+                ],
+            ],
+            args=session_ids,
+        )
+        sessions = [
+            {
+                "session_id": session_id,
+                "access_jti": access_jti or None,
+                "expires_at": int(expires_at) if expires_at else None,
+            }
+            for session_id, access_jti, expires_at in zip(
+                removed[::3], removed[1::3], removed[2::3]
+            )
+        ]
+        await self._invalidate(*[session["session_id"] for session in sessions])
+        return sessions
@@ -1,14 +1,22 @@
 import hashlib
-from datetime import datetime
-from typing import Optional
-from uuid import UUID
+import hmac
+import time
+from typing import Any, Iterable, Optional
+from uuid import UUID, uuid4
 
 import jwt
-import orjson
 from fastapi import Security
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from redis.asyncio import Redis
 
+from infrastructure.auth import hashers
+from infrastructure.auth.generations import GenerationRegistry
+from infrastructure.auth.hash_pool import HashWorkerPool
+from infrastructure.auth.key_ring import KeyRing
+from infrastructure.auth.redis_scripts import RedisScripts
+from infrastructure.auth.revocation import RevocationList
+from infrastructure.auth.session_store import SessionStore, refresh_digest
+from infrastructure.cache.near_cache import NearCache
 from infrastructure.exceptions.token_exceptions import (
     InvalidRefreshToken,
     InvalidScopeToken,
@@ -19,38 +27,88 @@ from infrastructure.exceptions.token_exceptions import (
 )
 
 
+def encode_password(
+    password: str,
+    salt: str,
+    hash_name: str,
+    iterations: int,
+    formats: str,
+) -> str:
+    hashed_pass = hashlib.pbkdf2_hmac(
+        hash_name,
+        password=password.encode(formats),
+        salt=salt.encode(formats),
+        iterations=iterations,
+    )
+    return hashed_pass.hex()
+
+
 class AuthHandler:
     def __init__(
         self,
-        secret: str,
+        key_ring: KeyRing,
         exp: int,
         api_x_key_header: str,
         iterations: int,
         hash_name: str,
         formats: str,
-        algorythm: str,
+        leeway: int,
+        password_scheme: str,
+        password_params: dict[str, Any],
         redis_client: Redis,
+        hash_pool: HashWorkerPool,
+        generations: GenerationRegistry,
+        revocations: RevocationList,
+        session_cache: Optional[NearCache] = None,
     ):
-        self._secret = secret
+        self.key_ring = key_ring
         self._exp = exp
         self._api_x_key_header = APIKeyHeader(name=api_x_key_header)
         self._iterations = iterations
         self._hash_name = hash_name
         self._formats = formats
-        self._algorythm = algorythm
+        self._password_hasher = hashers.get_hasher(password_scheme)
+        self._password_params = self._password_hasher.params(password_params)
+        self._leeway = leeway
         self._jwt_header = HTTPBearer()
         self.redis_client = redis_client
+        self.scripts = RedisScripts(redis_client=redis_client)
+        self.sessions = SessionStore(
+            redis_client=redis_client,
+            scripts=self.scripts,
+            ttl=exp,
+            near_cache=session_cache,
+        )
+        self.hash_pool = hash_pool
+        self.generations = generations
+        self.revocations = revocations
 
-    def encode_pass(self, password: str, salt: str) -> str:
-        password = password.encode(self._formats)
-        salt = salt.encode(self._formats)
-        hashed_pass = hashlib.pbkdf2_hmac(
-            self._hash_name,
-            password=password,
-            salt=salt,
-            iterations=self._iterations,
+    def encode_pass(self, password: str) -> str:
+        return hashers.hash_password(
+            password,
+            self._password_hasher.scheme,
+            self._password_params,
+        )
+
+    async def hash_password(self, password: str) -> str:
+        return await self.hash_pool.submit(
+            hashers.hash_password,
+            password,
+            self._password_hasher.scheme,
+            self._password_params,
+        )
+
+    async def hash_passwords(self, passwords: list[str]) -> list[str]:
+        """
+        Hash a chunk of passwords in a single pool task, so bulk callers pay
+        one round trip to the worker process per chunk instead of per password
+        """
+        return await self.hash_pool.submit(
+            hashers.hash_passwords,
+            passwords,
+            self._password_hasher.scheme,
+            self._password_params,
         )
-        return hashed_pass.hex()
 
     async def verify_password(
         self,
@@ -58,65 +116,179 @@ class AuthHandler:
         salt: str,
         encoded_pass: str,
     ) -> bool:
-        hashed_password = self.encode_pass(password=password, salt=salt)
-        return hashed_password == encoded_pass
+        """
+        `salt` is only used by legacy hex hashes, which were salted with the login
+        """
+        if hashers.identify(encoded_pass):
+            return await self.hash_pool.submit(
+                hashers.verify_password,
+                password,
+                encoded_pass,
+            )
+        hashed_password = await self.hash_pool.submit(
+            encode_password,
+            password,
+            salt,
+            self._hash_name,
+            self._iterations,
+            self._formats,
+        )
+        return hmac.compare_digest(hashed_password, encoded_pass)
+
+    def needs_rehash(self, encoded_pass: str) -> bool:
+        if hashers.identify(encoded_pass) != self._password_hasher.scheme:
+            return True
+        return self._password_hasher.needs_rehash(encoded_pass, self._password_params)
 
-    def encode_token(self, user_id: UUID) -> str:
-        expiration = self._exp
-        timestamp = datetime.now().timestamp()
+    def _build_payload(
+        self,
+        user_id: UUID | str,
+        scope: str,
+        session_id: Optional[str] = None,
+        generation: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        timestamp = int(time.time())
         payload = {
-            "expiration": int(timestamp + expiration),
-            "iat": int(timestamp),
-            "scope": "access_token",
+            "exp": timestamp + self._exp,
+            "iat": timestamp,
+            "nbf": timestamp,
+            "jti": uuid4().hex,
+            "scope": scope,
             "sub": str(user_id),
         }
-        return jwt.encode(payload, self._secret, algorithm=self._algorythm)
+        if session_id:
+            payload["sid"] = session_id
+        if generation:
+            payload["gen"] = generation
+        return payload
 
-    def decode_token(self, token: str) -> str:
+    def _encode(self, payload: dict[str, Any]) -> str:
+        key = self.key_ring.active
+        return jwt.encode(
+            payload,
+            key.signing_key,
+            algorithm=key.algorithm,
+            headers={"kid": key.kid},
+        )
+
+    def _decode(self, token: str) -> dict[str, Any]:
+        key = self.key_ring.get(jwt.get_unverified_header(token).get("kid"))
+        return jwt.decode(
+            token,
+            key.verifying_key,
+            algorithms=[key.algorithm],
+            leeway=self._leeway,
+            options={"require": ["exp", "iat", "jti", "sub"]},
+        )
+
+    def encode_token(
+        self,
+        user_id: UUID | str,
+        session_id: Optional[str] = None,
+        generation: Optional[dict[str, Any]] = None,
+    ) -> str:
+        payload = self._build_payload(
+            user_id=user_id,
+            scope="access_token",
+            session_id=session_id,
+            generation=generation,
+        )
+        return self._encode(payload)
+
+    def verify_access_token(self, token: str) -> dict[str, Any]:
+        """
+        Local, CPU-only validation of signature, exp/nbf and scope
+        """
         try:
-            payload = jwt.decode(token, self._secret, algorithms=[self._algorythm])
-            if payload["scope"] == "refresh_token":
-                return payload["sub"]
-            raise InvalidScopeToken
+            payload = self._decode(token)
         except jwt.ExpiredSignatureError:
             raise TokenExpired
         except jwt.InvalidTokenError:
             raise InvalidToken
+        if payload.get("scope") == "access_token":
+            return payload
+        raise InvalidScopeToken
 
-    def encode_refresh_token(self, user_id: UUID | str) -> str:
-        expiration = self._exp
-        timestamp = datetime.now().timestamp()
-        payload = {
-            "expiration": int(timestamp + expiration),
-            "iat": int(timestamp),
-            "scope": "refresh_token",
-            "sub": str(user_id),
-        }
-        return jwt.encode(payload, self._secret, algorithm=self._algorythm)
+    def decode_token(self, token: str) -> str:
+        return self.verify_access_token(token)["sub"]
 
-    def decode_refresh_token(self, token: str) -> str:
-        payload = jwt.decode(token, self._secret, algorithms=[self._algorythm])
-        if payload["scope"] == "refresh_token":
-            return payload["sub"]
-        raise InvalidScopeToken
+    def encode_refresh_token(
+        self,
+        user_id: UUID | str,
+        session_id: Optional[str] = None,
+        generation: Optional[dict[str, Any]] = None,
+    ) -> str:
+        payload = self._build_payload(
+            user_id=user_id,
+            scope="refresh_token",
+            session_id=session_id,
+            generation=generation,
+        )
+        return self._encode(payload)
 
-    def refresh_token(self, refresh_token: str) -> dict[str, str]:
+    def verify_refresh_token(self, token: str) -> dict[str, Any]:
         try:
-            payload = jwt.decode(
-                refresh_token,
-                self._secret,
-                algorithms=[self._algorythm],
-            )
-            if payload["scope"] == "refresh_token":
-                user_id = payload["sub"]
-                new_token = self.encode_token(user_id)
-                new_refresh = self.encode_refresh_token(user_id)
-                return {"new_access_token": new_token, "new_refresh_token": new_refresh}
-            raise InvalidScopeToken
+            payload = self._decode(token)
         except jwt.ExpiredSignatureError:
             raise RefreshTokenExpired
         except jwt.InvalidTokenError:
             raise InvalidRefreshToken
+        if payload.get("scope") != "refresh_token":
+            raise InvalidScopeToken
+        if "sid" not in payload:
+            raise InvalidRefreshToken
+        return payload
+
+    def decode_refresh_token(self, token: str) -> str:
+        return self.verify_refresh_token(token)["sub"]
+
+    def _legacy_refresh_payload(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Refresh tokens issued before per-device sessions carry no kid, jti
+        or sid and keep their expiry in an `expiration` claim. They get the
+        session id derived from their digest and the zero generation they
+        predate, so any revocation issued since rejects them.
+        """
+        try:
+            if jwt.get_unverified_header(token).get("kid"):
+                return None
+            key = self.key_ring.get(None)
+            payload = jwt.decode(
+                token,
+                key.verifying_key,
+                algorithms=[key.algorithm],
+                options={"require": ["sub", "expiration"]},
+            )
+        except (jwt.InvalidTokenError, InvalidToken):
+            return None
+        if payload.get("scope") != "refresh_token" or "sid" in payload:
+            return None
+        if payload["expiration"] + self._leeway < time.time():
+            raise RefreshTokenExpired
+        return {
+            **payload,
+            "exp": payload["expiration"],
+            "sid": refresh_digest(token),
+            "gen": {"g": 0, "u": 0, "r": {}},
+        }
+
+    async def _verify_session_refresh_token(self, token: str) -> dict[str, Any]:
+        """
+        `verify_refresh_token`, also accepting a baseline refresh token whose
+        session is moved to a record on the way
+        """
+        try:
+            return self.verify_refresh_token(token)
+        except InvalidRefreshToken:
+            if not (payload := self._legacy_refresh_payload(token)):
+                raise
+        await self.sessions.migrate_legacy(
+            session_id=payload["sid"],
+            user_uuid=payload["sub"],
+            refresh_token=token,
+            created_at=int(payload.get("iat", time.time())),
+        )
+        return payload
 
     def check_jwt(self) -> str:
         credentials: HTTPAuthorizationCredentials = Security(self._jwt_header)
@@ -125,23 +297,214 @@ class AuthHandler:
             raise Unauthorized
         return token
 
-    async def save_tokens_to_session(
+    def _issue_pair(
         self,
-        access_token: str,
-        refresh_token: str,
-        user_uuid: str,
-    ) -> None:
-        _tokens: dict[str:str] = {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
+        user_id: UUID | str,
+        session_id: str,
+        generation: dict[str, Any],
+    ) -> dict[str, str]:
+        access_payload = self._build_payload(
+            user_id=user_id,
+            scope="access_token",
+            session_id=session_id,
+            generation=generation,
+        )
+        return {
+            "access_token": self._encode(access_payload),
+            "refresh_token": self.encode_refresh_token(
+                user_id=user_id,
+                session_id=session_id,
+                generation=generation,
+            ),
+            "access_jti": access_payload["jti"],
+        }
+
+    async def create_session(
+        self,
+        user_id: UUID | str,
+        role_uuids: Iterable[UUID | str] = (),
+    ) -> dict[str, str]:
+        session_id = uuid4().hex
+        generation = await self.generations.current(
+            user_uuid=str(user_id),
+            role_uuids=role_uuids,
+        )
+        tokens = self._issue_pair(
+            user_id=user_id,
+            session_id=session_id,
+            generation=generation,
+        )
+        await self.sessions.create(
+            session_id=session_id,
+            user_uuid=str(user_id),
+            refresh_token=tokens["refresh_token"],
+            access_jti=tokens["access_jti"],
+        )
+        return {
+            "access_token": tokens["access_token"],
+            "refresh_token": tokens["refresh_token"],
         }
-        saved_data = orjson.dumps(_tokens)
-        await self.redis_client.set(name=user_uuid, value=saved_data, ex=self._exp)
 
-    async def del_tokes_from_session(self, user_uuid: str) -> None:
-        await self.redis_client.delete(user_uuid)
+    async def rotate_session(self, refresh_token: str) -> Optional[dict[str, str]]:
+        """
+        Compare-and-rotate in a single EVALSHA: concurrent refreshes with the
+        same token cannot both succeed
+        """
+        payload = await self._verify_session_refresh_token(refresh_token)
+        if not await self.generations.is_current(payload):
+            return None
+        user_uuid, session_id = payload["sub"], payload["sid"]
+        generation = await self.generations.current(
+            user_uuid=user_uuid,
+            role_uuids=payload["gen"]["r"],
+        )
+        tokens = self._issue_pair(
+            user_id=user_uuid,
+            session_id=session_id,
+            generation=generation,
+        )
+        if await self.sessions.rotate(
+            session_id=session_id,
+            user_uuid=user_uuid,
+            presented_refresh_token=refresh_token,
+            refresh_token=tokens["refresh_token"],
+            access_jti=tokens["access_jti"],
+        ):
+            return {
+                "new_access_token": tokens["access_token"],
+                "new_refresh_token": tokens["refresh_token"],
+            }
+        return None
+
+    @staticmethod
+    def _matches_session(session: Optional[dict[str, Any]], refresh_token: str) -> bool:
+        return bool(session) and hmac.compare_digest(
+            session["refresh_digest"],
+            refresh_digest(refresh_token),
+        )
 
-    async def get_tokens_from_session(self, user_uuid: str) -> Optional[dict[str:str]]:
-        if raw_data := await self.redis_client.get(user_uuid):
-            return orjson.loads(raw_data)
+    async def get_session(self, refresh_token: str) -> Optional[dict[str, Any]]:
+        """
+        Session record matching the presented refresh token, if it is current
+        """
+        payload = await self._verify_session_refresh_token(refresh_token)
+        if not await self.generations.is_current(payload):
+            return None
+        session = await self.sessions.get(
+            user_uuid=payload["sub"], session_id=payload["sid"]
+        )
+        if self._matches_session(session=session, refresh_token=refresh_token):
+            return {"session_id": payload["sid"], **session}
         return None
+
+    async def revoke_access_token(self, payload: dict[str, Any]) -> None:
+        await self.revocations.revoke(
+            jti=payload["jti"],
+            expires_at=int(payload["exp"]) + self._leeway,
+        )
+
+    async def is_access_token_revoked(self, payload: dict[str, Any]) -> bool:
+        if not await self.generations.is_current(payload):
+            return True
+        return await self.revocations.is_revoked(payload["jti"])
+
+    async def _revoke_session_access(self, session: dict[str, Any]) -> None:
+        # Legacy records do not know their access token, it expires on its own
+        if session["access_jti"] and session["expires_at"]:
+            await self.revocations.revoke(
+                jti=session["access_jti"],
+                expires_at=session["expires_at"] + self._leeway,
+            )
+
+    async def revoke_session(self, session_id: str, user_uuid: str) -> bool:
+        """
+        Drop the session and deny-list the access token issued with it
+        """
+        session = await self.sessions.revoke(session_id=session_id, user_uuid=user_uuid)
+        if not session:
+            return False
+        await self._revoke_session_access(session)
+        return True
+
+    async def revoke_all_sessions(self, user_uuid: str) -> int:
+        sessions = await self.sessions.revoke_all(user_uuid=user_uuid)
+        for session in sessions:
+            await self._revoke_session_access(session)
+        return len(sessions)
+
+    async def introspect_tokens(self, tokens: list[str]) -> list[dict[str, Any]]:
+        """
+        Decode every token locally, then resolve the generation counters the
+        near cache misses and all session and revocation lookups in one
+        pipelined round trip. Access tokens the Bloom filter rules out never
+        reach Redis.
+        """
+        now = int(time.time())
+        decoded: list[tuple[str, Optional[dict[str, Any]]]] = []
+        for token in tokens:
+            try:
+                decoded.append(("active", self._decode(token)))
+            except jwt.ExpiredSignatureError:
+                decoded.append(("expired", None))
+            except (jwt.InvalidTokenError, InvalidToken):
+                decoded.append(("invalid", None))
+
+        payloads = [payload for _, payload in decoded if payload]
+        pipe = self.redis_client.pipeline(transaction=False)
+        generation_lookup = self.generations.queue_lookup(pipe=pipe, payloads=payloads)
+        generation_size = len(pipe)
+        lookups: dict[str, int] = {}
+        for payload in payloads:
+            if payload.get("scope") == "refresh_token":
+                key = self.sessions.session_key(payload["sub"], payload.get("sid", ""))
+                if key not in lookups:
+                    lookups[key] = len(pipe)
+                    self.sessions.queue_lookup(
+                        pipe=pipe,
+                        user_uuid=payload["sub"],
+                        session_id=payload.get("sid", ""),
+                    )
+            elif self.revocations.might_be_revoked(payload["jti"]):
+                if payload["jti"] not in lookups:
+                    lookups[payload["jti"]] = len(pipe)
+                    self.revocations.queue_lookup(pipe=pipe, jti=payload["jti"])
+        replies = await pipe.execute() if len(pipe) else []
+
+        current = iter(
+            self.generations.parse_lookup(
+                payloads=payloads,
+                lookup=generation_lookup,
+                reply=replies[0] if generation_size else None,
+            ),
+        )
+        results = []
+        for token, (status, payload) in zip(tokens, decoded):
+            if payload and not next(current):
+                status, payload = "revoked", None
+            if not payload:
+                results.append({"active": False, "status": status})
+                continue
+            if payload.get("scope") == "refresh_token":
+                position = lookups[
+                    self.sessions.session_key(payload["sub"], payload.get("sid", ""))
+                ]
+                session = self.sessions.parse_lookup(
+                    replies[position : position + self.sessions.lookup_size],
+                )
+                active = self._matches_session(session=session, refresh_token=token)
+                ttl = session["ttl"] if session else None
+            else:
+                position = lookups.get(payload["jti"])
+                active = position is None or not self.revocations.parse_lookup(
+                    jti=payload["jti"], reply=replies[position]
+                )
+                ttl = int(payload["exp"]) - now
+            results.append(
+                {
+                    "active": active,
+                    "status": status if active else "revoked",
+                    "claims": payload,
+                    "ttl": ttl if active else None,
+                },
+            )
+        return results
@@ -0,0 +1,52 @@
+from typing import Iterable
+
+from redis.asyncio import Redis
+
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+UNKNOWN_LOGIN_PREFIX = "auth:unknown_login:"
+
+
+class UnknownLoginCache:
+    """
+    Short-lived negative cache of logins that do not exist, so repeated
+    attempts with them are answered without a database query. Entries are
+    dropped as soon as the login is registered; the TTL bounds how long a
+    lookup racing with a registration can keep the login marked unknown.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        metrics: MetricsRegistry,
+        ttl: int,
+        enabled: bool = True,
+    ) -> None:
+        self.redis_client = redis_client
+        self.metrics = metrics
+        self.ttl = ttl
+        self.enabled = enabled
+
+    @staticmethod
+    def unknown_key(login: str) -> str:
+        return f"{UNKNOWN_LOGIN_PREFIX}{login}"
+
+    async def is_unknown(self, login: str) -> bool:
+        if not self.enabled:
+            return False
+        if await self.redis_client.exists(self.unknown_key(login)):
+            self.metrics.inc("unknown_logins.hits")
+            return True
+        return False
+
+    async def remember(self, login: str) -> None:
+        if self.enabled:
+            self.metrics.inc("unknown_logins.misses")
+            await self.redis_client.set(self.unknown_key(login), 1, ex=self.ttl)
+
+    async def forget(self, login: str) -> None:
+        await self.redis_client.delete(self.unknown_key(login))
+
+    async def forget_many(self, logins: Iterable[str]) -> None:
+        if keys := [self.unknown_key(login) for login in logins]:
+            await self.redis_client.delete(*keys)
@@ -1,5 +1,9 @@
+from typing import Generic, Optional, TypeVar
+
 from pydantic import BaseModel
 
+T = TypeVar("T")
+
 
 class BaseResultModel(BaseModel):
     """
@@ -7,3 +11,12 @@ class BaseResultModel(BaseModel):
     """
 
     status: bool
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    One page of a keyset-paginated listing
+    """
+
+    items: list[T]
+    next_cursor: Optional[str] = None
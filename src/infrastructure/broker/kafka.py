@@ -75,6 +75,32 @@ class KafkaProducer(BaseMQ):
             await self.__producer.abort_transaction()
             logging.error(f"Ошибка при отправке сообщения: {e}, транзакция откатана")
 
+    async def transactional_send_batch(
+        self,
+        messages: List[Union[str, bytes, list, dict]],
+        topic: str,
+    ) -> None:
+        """
+        All messages in one transaction; sends are pipelined and the commit
+        waits for them, instead of one round trip per message
+        """
+        await self._init_logger()
+        try:
+            await self.__producer.begin_transaction()
+            for message in messages:
+                await self.__producer.send(
+                    topic=topic,
+                    value=self.serialize_message(message),
+                )
+            await self.__producer.commit_transaction()
+            logging.info(
+                f"Отправлено сообщений: {len(messages)}, транзакция зафиксирована"
+            )
+
+        except Exception as e:
+            await self.__producer.abort_transaction()
+            logging.error(f"Ошибка при отправке сообщений: {e}, транзакция откатана")
+
 
 class KafkaConsumer(BaseMQ):
     def __init__(
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Coroutine, Optional
+
+from redis.asyncio import Redis
+
+IMPORT_JOB_PREFIX = "user_import:"
+
+
+class ImportJobStore:
+    """
+    Progress and per-row errors of bulk import jobs. They live in Redis so
+    any replica can answer a status request. The running tasks are held
+    here so they are not garbage collected and can be cancelled on shutdown.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        ttl: int,
+        max_errors: int,
+    ) -> None:
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.max_errors = max_errors
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def job_key(job_id: str) -> str:
+        return f"{IMPORT_JOB_PREFIX}{job_id}"
+
+    @staticmethod
+    def errors_key(job_id: str) -> str:
+        return f"{IMPORT_JOB_PREFIX}{job_id}:errors"
+
+    async def save(self, job_id: str, **fields: Any) -> None:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(self.job_key(job_id), mapping=fields)
+        pipe.expire(self.job_key(job_id), self.ttl)
+        await pipe.execute()
+
+    async def progress(
+        self,
+        job_id: str,
+        counters: dict[str, int],
+        errors: list[str],
+    ) -> None:
+        """
+        Add a batch's counters and errors; only the first `max_errors`
+        errors are kept, the counters still cover every row
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for name, value in counters.items():
+            pipe.hincrby(self.job_key(job_id), name, value)
+        if errors:
+            pipe.rpush(self.errors_key(job_id), *errors)
+            pipe.ltrim(self.errors_key(job_id), 0, self.max_errors - 1)
+            pipe.expire(self.errors_key(job_id), self.ttl)
+        await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[tuple[dict[str, str], list[str]]]:
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hgetall(self.job_key(job_id))
+        pipe.lrange(self.errors_key(job_id), 0, -1)
+        job, errors = await pipe.execute()
+        return (job, errors) if job else None
+
+    def run(self, coroutine: Coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+from redis.asyncio import Redis
+
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+
+class NearCache:
+    """
+    Bounded in-process LRU kept coherent across replicas through a Redis
+    pub/sub invalidation channel. Entries also carry a short TTL so that a
+    missed invalidation can only serve stale data for a bounded time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        redis_client: Redis,
+        channel: str,
+        metrics: MetricsRegistry,
+        enabled: bool = True,
+        max_size: int = 10000,
+        ttl: float = 30,
+    ) -> None:
+        self.name = name
+        self.redis_client = redis_client
+        self.channel = channel
+        self.metrics = metrics
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    def _count(self, event: str, value: int = 1) -> None:
+        self.metrics.inc(f"near_cache.{self.name}.{event}", value)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._count("misses")
+            return None
+        self._entries.move_to_end(key)
+        self._count("hits")
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._count("evictions")
+        self.metrics.set_gauge(f"near_cache.{self.name}.size", len(self._entries))
+
+    def _evict(self, keys: Iterable[Hashable]) -> None:
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self._count("invalidations")
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Evict locally and broadcast the eviction to every other replica
+        """
+        if not self.enabled or not keys:
+            return
+        self._evict(keys)
+        await self.redis_client.publish(self.channel, " ".join(keys))
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                self._entries.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._evict(message["data"].split())
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logging.error(f"Ошибка подписки near cache {self.name!r}: {error}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        if self.enabled and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            logging.info(f"Near cache {self.name!r} подписан на {self.channel!r}")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
@@ -49,3 +49,7 @@ class SessionManager(Singleton):
     @property
     def async_session_factory(self):
         return self._async_session_factory
+
+    @property
+    def engine(self):
+        return self._engine
@@ -0,0 +1,37 @@
+from enum import Enum
+
+from pydantic import BaseModel
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+from sqlalchemy.orm.relationships import Relationship
+
+
+class LoaderProfile(str, Enum):
+    """
+    How a repository method loads relationships. Mapped relationships
+    default to `raise_on_sql`, so anything not asked for here fails loudly
+    instead of issuing a query per row.
+    """
+
+    NONE = "none"
+    SELECTIN = "selectin"
+    JOINED = "joined"
+
+
+def loader_options(
+    profile: LoaderProfile,
+    *relationships: Relationship,
+) -> list[LoaderOption]:
+    if profile == LoaderProfile.SELECTIN:
+        return [selectinload(relationship) for relationship in relationships]
+    if profile == LoaderProfile.JOINED:
+        return [joinedload(relationship) for relationship in relationships]
+    return [raiseload(relationship, sql_only=True) for relationship in relationships]
+
+
+def schema_columns(model: type, schema: type[BaseModel]) -> list[InstrumentedAttribute]:
+    """
+    Columns of `model` named after the fields of `schema`: selecting just
+    these yields rows that serialize to the schema without loading entities
+    """
+    return [getattr(model, name) for name in schema.model_fields]
@@ -22,10 +22,7 @@ depends_on = None
 
 def upgrade() -> None:
     auth_handler = Container.auth_handler()
-    salted_pass = auth_handler.encode_pass(
-        settings.USERS.default_superuser.password,
-        settings.USERS.default_superuser.login,
-    )
+    salted_pass = auth_handler.encode_pass(settings.USERS.default_superuser.password)
     conn = op.get_bind()
     with sa.orm.Session(bind=conn) as session:
         try:
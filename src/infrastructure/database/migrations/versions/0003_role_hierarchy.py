@@ -0,0 +1,79 @@
+"""0003_role_hierarchy
+
+Revision ID: 9c1f4e2ab7d3
+Revises: 5b08fc804d28
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1f4e2ab7d3"
+down_revision: Union[str, None, tuple] = "5b08fc804d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("uuid", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "role_inherits",
+        sa.Column("role_uuid", sa.UUID(), nullable=False),
+        sa.Column("parent_uuid", sa.UUID(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["role_uuid"], ["roles.uuid"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["parent_uuid"], ["roles.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("role_uuid", "parent_uuid", "uuid"),
+        sa.UniqueConstraint("role_uuid", "parent_uuid", name="idx_unique_role_inherit"),
+    )
+    op.create_index(
+        op.f("ix_role_inherits_parent_uuid"),
+        "role_inherits",
+        ["parent_uuid"],
+    )
+    op.create_table(
+        "role_closure",
+        sa.Column("role_uuid", sa.UUID(), nullable=False),
+        sa.Column("inherited_uuid", sa.UUID(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["role_uuid"], ["roles.uuid"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["inherited_uuid"], ["roles.uuid"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("role_uuid", "inherited_uuid", "uuid"),
+        sa.UniqueConstraint(
+            "role_uuid", "inherited_uuid", name="idx_unique_role_closure"
+        ),
+    )
+    op.create_index(
+        op.f("ix_role_closure_inherited_uuid"),
+        "role_closure",
+        ["inherited_uuid"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_role_closure_inherited_uuid"), table_name="role_closure")
+    op.drop_table("role_closure")
+    op.drop_index(op.f("ix_role_inherits_parent_uuid"), table_name="role_inherits")
+    op.drop_table("role_inherits")
@@ -0,0 +1,55 @@
+"""0004_listing_indexes
+
+Revision ID: 3e7a9d51c2f8
+Revises: 9c1f4e2ab7d3
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7a9d51c2f8"
+down_revision: Union[str, None, tuple] = "9c1f4e2ab7d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset sort keys of the list endpoints (unique columns already have an
+# index) and the role side of the association tables for member counts
+INDEXES = (
+    ("ix_users_created_at_uuid", "users", ["created_at", "uuid"]),
+    ("ix_users_updated_at_uuid", "users", ["updated_at", "uuid"]),
+    ("ix_roles_created_at_uuid", "roles", ["created_at", "uuid"]),
+    ("ix_roles_updated_at_uuid", "roles", ["updated_at", "uuid"]),
+    ("ix_permissions_created_at_uuid", "permissions", ["created_at", "uuid"]),
+    ("ix_permissions_updated_at_uuid", "permissions", ["updated_at", "uuid"]),
+    ("ix_permissions_name_uuid", "permissions", ["name", "uuid"]),
+    ("ix_user_roles_role_uuid", "user_roles", ["role_uuid"]),
+    ("ix_role_permissions_role_uuid", "role_permissions", ["role_uuid"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps large tables writable but can not run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,68 @@
+"""0005_user_search_indexes
+
+Revision ID: b84d1f6e3a90
+Revises: 3e7a9d51c2f8
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b84d1f6e3a90"
+down_revision: Union[str, None, tuple] = "3e7a9d51c2f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("login", "email", "phone_number")
+PARTIAL_INDEXES = (
+    ("ix_users_inactive_created_at_uuid", "NOT is_active"),
+    ("ix_users_unverified_created_at_uuid", "NOT is_verified"),
+)
+
+
+def upgrade() -> None:
+    # Needs a role allowed to create extensions (or pg_trgm preinstalled)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CONCURRENTLY keeps the users table writable while indexes build
+    with op.get_context().autocommit_block():
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f"ix_users_{column}_trgm",
+                "users",
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        for name, predicate in PARTIAL_INDEXES:
+            op.create_index(
+                name,
+                "users",
+                ["created_at", "uuid"],
+                postgresql_where=sa.text(predicate),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(
+                name,
+                table_name="users",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        for column in reversed(TRIGRAM_COLUMNS):
+            op.drop_index(
+                f"ix_users_{column}_trgm",
+                table_name="users",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,4 +1,4 @@
-from .association import RolePermission, UserRole
+from .association import RoleClosure, RoleInherit, RolePermission, UserRole
 from .base import Base
 from .permission import Permission
 from .role import Role
@@ -11,4 +11,6 @@ __all__: tuple[str] = (
     "Base",
     "UserRole",
     "RolePermission",
+    "RoleInherit",
+    "RoleClosure",
 )
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from infrastructure.database.models.base import Base
@@ -14,7 +14,11 @@ class UserRole(Base):
     )
 
     user_uuid: Mapped[UUID] = mapped_column(ForeignKey("users.uuid"), primary_key=True)
-    role_uuid: Mapped[UUID] = mapped_column(ForeignKey("roles.uuid"), primary_key=True)
+    role_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid"),
+        primary_key=True,
+        index=True,
+    )
 
 
 class RolePermission(Base):
@@ -32,4 +36,54 @@ class RolePermission(Base):
         ForeignKey("permissions.uuid"),
         primary_key=True,
     )
-    role_uuid: Mapped[UUID] = mapped_column(ForeignKey("roles.uuid"), primary_key=True)
+    role_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class RoleInherit(Base):
+    __tablename__ = "role_inherits"
+    __table_args__ = (
+        UniqueConstraint("role_uuid", "parent_uuid", name="idx_unique_role_inherit"),
+        {"extend_existing": True},
+    )
+
+    role_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    parent_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class RoleClosure(Base):
+    """
+    Transitive closure of `role_inherits`: `role_uuid` inherits the
+    permissions of `inherited_uuid` through a shortest chain of `depth` edges
+    """
+
+    __tablename__ = "role_closure"
+    __table_args__ = (
+        UniqueConstraint(
+            "role_uuid",
+            "inherited_uuid",
+            name="idx_unique_role_closure",
+        ),
+        {"extend_existing": True},
+    )
+
+    role_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    inherited_uuid: Mapped[UUID] = mapped_column(
+        ForeignKey("roles.uuid", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -1,6 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
 
 class Permission(Base):
+    __table_args__ = (
+        Index("ix_permissions_created_at_uuid", "created_at", "uuid"),
+        Index("ix_permissions_updated_at_uuid", "updated_at", "uuid"),
+        Index("ix_permissions_name_uuid", "name", "uuid"),
+    )
 
     name: Mapped[str] = mapped_column(
         String,
@@ -27,8 +32,8 @@ class Permission(Base):
         comment="Разрешения",
     )
 
-    roles: Mapped["Role"] = relationship(
+    roles: Mapped[List["Role"]] = relationship(
         secondary="role_permissions",
         back_populates="permissions",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
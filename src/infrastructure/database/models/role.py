@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 
 
 class Role(Base):
+    __table_args__ = (
+        Index("ix_roles_created_at_uuid", "created_at", "uuid"),
+        Index("ix_roles_updated_at_uuid", "updated_at", "uuid"),
+    )
 
     name: Mapped[str] = mapped_column(String, unique=True, comment="Название")
 
@@ -25,11 +29,11 @@ class Role(Base):
     users: Mapped[List["User"]] = relationship(
         secondary="user_roles",
         back_populates="roles",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
 
     permissions: Mapped[List["Permission"]] = relationship(
         secondary="role_permissions",
         back_populates="roles",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
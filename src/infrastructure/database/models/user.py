@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import Boolean, Integer, String, Text
+from sqlalchemy import Boolean, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from infrastructure.database.models.base import Base
@@ -10,6 +10,33 @@ if TYPE_CHECKING:
 
 
 class User(Base):
+    __table_args__ = (
+        Index("ix_users_created_at_uuid", "created_at", "uuid"),
+        Index("ix_users_updated_at_uuid", "updated_at", "uuid"),
+        # /user/search: trigram indexes serve prefix and substring patterns,
+        # partial indexes the rare side of the boolean flags
+        *(
+            Index(
+                f"ix_users_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("login", "email", "phone_number")
+        ),
+        Index(
+            "ix_users_inactive_created_at_uuid",
+            "created_at",
+            "uuid",
+            postgresql_where=text("NOT is_active"),
+        ),
+        Index(
+            "ix_users_unverified_created_at_uuid",
+            "created_at",
+            "uuid",
+            postgresql_where=text("NOT is_verified"),
+        ),
+    )
 
     nickname: Mapped[str] = mapped_column(
         String,
@@ -59,5 +86,5 @@ class User(Base):
     roles: Mapped[List["Role"]] = relationship(
         secondary="user_roles",
         back_populates="users",
-        lazy="joined",
+        lazy="raise_on_sql",
     )
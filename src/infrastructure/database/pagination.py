@@ -0,0 +1,108 @@
+import base64
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from infrastructure.base_entities.base_model import Page
+from infrastructure.exceptions.pagination_exceptions import InvalidCursor, InvalidSortKey
+
+# Cursor values travel as JSON; these restore the bound parameter types
+PARSERS = {datetime: datetime.fromisoformat, UUID: UUID}
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class Keyset:
+    """
+    Cursor (keyset) pagination over whitelisted sort keys. Every key is a
+    tuple of columns that ends in a unique one and has a matching composite
+    index, so a page is one index range scan regardless of its depth.
+    """
+
+    def __init__(self, **sort_keys: tuple[InstrumentedAttribute, ...]) -> None:
+        self.sort_keys = sort_keys
+
+    def columns(self, sort: str) -> tuple[InstrumentedAttribute, ...]:
+        if sort not in self.sort_keys:
+            raise InvalidSortKey
+        return self.sort_keys[sort]
+
+    @staticmethod
+    def encode(sort: str, order: SortOrder, values: Sequence[Any]) -> str:
+        payload = orjson.dumps([sort, order.value, list(values)], default=str)
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor: str, sort: str, order: SortOrder) -> tuple[Any, ...]:
+        columns = self.columns(sort)
+        try:
+            cursor_sort, cursor_order, values = orjson.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)),
+            )
+            if (cursor_sort, cursor_order) != (sort, order.value) or len(values) != len(
+                columns
+            ):
+                raise InvalidCursor
+            return tuple(
+                PARSERS.get(column.type.python_type, lambda value: value)(value)
+                for column, value in zip(columns, values)
+            )
+        except (ValueError, TypeError):
+            raise InvalidCursor
+
+    def apply(
+        self,
+        stmt: Select,
+        sort: str,
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Select:
+        """
+        Restrict `stmt` to the page after `cursor`; fetches one extra row to
+        tell whether another page follows
+        """
+        columns = self.columns(sort)
+        if cursor:
+            values = self.decode(cursor, sort, order)
+            keys = tuple_(*columns)
+            stmt = stmt.where(
+                keys > values if order == SortOrder.ASC else keys < values
+            )
+        return stmt.order_by(
+            *(
+                column.asc() if order == SortOrder.ASC else column.desc()
+                for column in columns
+            ),
+        ).limit(limit + 1)
+
+    def page(
+        self,
+        items: Sequence[Any],
+        sort: str,
+        order: SortOrder,
+        limit: int,
+        projection: bool = False,
+    ) -> Page:
+        """
+        With `projection` the items are rows of a column select and are
+        returned as plain dicts
+        """
+        next_cursor = None
+        if len(items) > limit:
+            items, last = items[:limit], items[limit - 1]
+            next_cursor = self.encode(
+                sort,
+                order,
+                [getattr(last, column.key) for column in self.columns(sort)],
+            )
+        if projection:
+            items = [row._asdict() for row in items]
+        return Page(items=list(items), next_cursor=next_cursor)
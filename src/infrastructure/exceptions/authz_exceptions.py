@@ -0,0 +1,23 @@
+from fastapi import status
+
+from infrastructure.base_entities.base_exception import BaseAPIException
+
+
+class RoleHierarchyCycle(BaseAPIException):
+    message = "Role can not inherit from itself or from its descendants"
+    status_code = status.HTTP_409_CONFLICT
+
+
+class RoleNotFound(BaseAPIException):
+    message = "Role not found"
+    status_code = status.HTTP_404_NOT_FOUND
+
+
+class PermissionNotFound(BaseAPIException):
+    message = "Permission not found"
+    status_code = status.HTTP_404_NOT_FOUND
+
+
+class RoleInUse(BaseAPIException):
+    message = "Role is still assigned to users or grants permissions"
+    status_code = status.HTTP_409_CONFLICT
@@ -0,0 +1,18 @@
+from fastapi import status
+
+from infrastructure.base_entities.base_exception import BaseAPIException
+
+
+class InvalidSortKey(BaseAPIException):
+    message = "Sorting by this field is not supported"
+    status_code = status.HTTP_400_BAD_REQUEST
+
+
+class InvalidCursor(BaseAPIException):
+    message = "Invalid or foreign page cursor"
+    status_code = status.HTTP_400_BAD_REQUEST
+
+
+class SearchTermTooShort(BaseAPIException):
+    message = "Pattern filters need at least 3 characters"
+    status_code = status.HTTP_400_BAD_REQUEST
@@ -53,6 +53,21 @@ class SessionExpired(BaseAPIException):
     status_code = status.HTTP_406_NOT_ACCEPTABLE
 
 
+class SessionNotFound(BaseAPIException):
+    message = "Session not found"
+    status_code = status.HTTP_404_NOT_FOUND
+
+
 class Unapproved(BaseAPIException):
     message = "User is not approved"
     status_code = status.HTTP_401_UNAUTHORIZED
+
+
+class HashingUnavailable(BaseAPIException):
+    message = "Authentication is temporarily overloaded, retry later"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class SigningKeyUnavailable(BaseAPIException):
+    message = "No signing key has been activated yet"
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
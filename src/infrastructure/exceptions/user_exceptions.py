@@ -16,3 +16,18 @@ class UserAlreadyExists(BaseAPIException):
 class WrongPassword(BaseAPIException):
     message = "Wrong password"
     status_code = status.HTTP_401_UNAUTHORIZED
+
+
+class UserInactive(BaseAPIException):
+    message = "This account is deactivated"
+    status_code = status.HTTP_403_FORBIDDEN
+
+
+class TooManyAttempts(BaseAPIException):
+    message = "Too many login attempts, retry later"
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class ImportJobNotFound(BaseAPIException):
+    message = "This import job does not exists"
+    status_code = status.HTTP_404_NOT_FOUND
@@ -0,0 +1,68 @@
+from typing import Any, Iterable, Union
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from infrastructure.base_entities.base_model import Page
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also renders asyncpg's UUID subclass, which orjson
+    only accepts through `default`
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ResponseSerializer:
+    """
+    Opt-in fast serialization. When enabled, read endpoints return a ready
+    Response, which FastAPI passes through instead of validating it against
+    the route's response_model and encoding it again:
+    - single objects are copied into the model without validation (they
+      were read back from our own tables) and dumped to JSON bytes by
+      TypeAdapters built once, when the container creates the serializer
+    - list pages hold rows projected straight to dicts and are dumped by
+      orjson without any model
+    When disabled the content is returned as is.
+    """
+
+    def __init__(self, enabled: bool, models: Iterable[type] = ()) -> None:
+        self.enabled = enabled
+        self._adapters: dict[type, TypeAdapter] = {
+            model: TypeAdapter(model) for model in models
+        }
+
+    @property
+    def response_class(self) -> type[JSONResponse]:
+        return FastJSONResponse if self.enabled else JSONResponse
+
+    def adapter(self, model: type) -> TypeAdapter:
+        if (adapter := self._adapters.get(model)) is None:
+            adapter = self._adapters[model] = TypeAdapter(model)
+        return adapter
+
+    def dump(self, model: type, content: Any) -> Union[Response, Any]:
+        if not self.enabled:
+            return content
+        instance = model.model_construct(
+            **{name: getattr(content, name) for name in model.model_fields},
+        )
+        return Response(
+            content=self.adapter(model).dump_json(instance),
+            media_type="application/json",
+        )
+
+    def page(self, page: Page) -> Union[Response, Page]:
+        """
+        `page` must come from a repository listing with `projection=True`
+        """
+        if not self.enabled:
+            return page
+        return FastJSONResponse(
+            content={"items": page.items, "next_cursor": page.next_cursor},
+        )
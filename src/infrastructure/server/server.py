@@ -2,6 +2,7 @@ import logging
 from typing import NoReturn
 
 from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
 
 from infrastructure.base_entities.singleton import Singleton
 
@@ -13,9 +14,10 @@ class Server(Singleton):
         routers: list[APIRouter] = None,
         start_callbacks: list[callable] = None,
         stop_callbacks: list[callable] = None,
+        default_response_class: type[JSONResponse] = JSONResponse,
     ) -> NoReturn:
         self.name = name
-        self.app = FastAPI(title=name)
+        self.app = FastAPI(title=name, default_response_class=default_response_class)
         self.routers = routers or []
         self._init_routers()
         self.start_callbacks = start_callbacks or []
@@ -0,0 +1,88 @@
+import csv
+from typing import Any, AsyncIterator, Optional
+
+import orjson
+
+from infrastructure.utils.export.row_encoders import ExportFormat
+
+# (line number, record, error); exactly one of record and error is set
+DecodedRow = tuple[int, Optional[dict[str, Any]], Optional[str]]
+
+
+async def _split_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, bytes]]:
+    line_no = 0
+    tail = b""
+    async for chunk in chunks:
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            line_no += 1
+            yield line_no, line
+    if tail:
+        yield line_no + 1, tail
+
+
+def _decode_ndjson_line(line: bytes) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError as error:
+        return None, f"invalid JSON: {error}"
+    if not isinstance(record, dict):
+        return None, "expected a JSON object"
+    return record, None
+
+
+def _parse_csv_line(line: bytes) -> list[str]:
+    return next(csv.reader([line.decode().rstrip("\r")]), [])
+
+
+async def decode_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[DecodedRow]:
+    async for line_no, line in _split_lines(chunks):
+        if line.strip():
+            yield line_no, *_decode_ndjson_line(line)
+
+
+async def decode_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[DecodedRow]:
+    """
+    The first line is the header. Records are one per line, so quoted
+    values can not contain line breaks
+    """
+    header: Optional[list[str]] = None
+    async for line_no, line in _split_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            values = _parse_csv_line(line)
+        except (UnicodeDecodeError, csv.Error) as error:
+            if header is None:
+                raise ValueError(f"invalid CSV header: {error}")
+            yield line_no, None, f"invalid CSV: {error}"
+            continue
+        if header is None:
+            header = values
+        elif len(values) != len(header):
+            yield line_no, None, f"expected {len(header)} values, got {len(values)}"
+        else:
+            yield line_no, dict(zip(header, values)), None
+
+
+async def decode_rows(
+    import_format: ExportFormat,
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+) -> AsyncIterator[list[DecodedRow]]:
+    """
+    Decode a byte stream into batches of rows; malformed rows are passed on
+    with their error, so one bad line does not fail the rest of the stream
+    """
+    rows: list[DecodedRow] = []
+    decoder = decode_csv if import_format == ExportFormat.CSV else decode_ndjson
+    async for row in decoder(chunks):
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
@@ -0,0 +1,64 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+import orjson
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def encode_ndjson(
+    columns: Sequence[str],
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        # asyncpg returns its own UUID type, which orjson does not know
+        yield b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=str) + b"\n"
+            for row in rows
+        )
+
+
+async def encode_csv(
+    columns: Sequence[str],
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_rows(
+    export_format: ExportFormat,
+    columns: Sequence[str],
+    batches: AsyncIterator[Sequence[Sequence[Any]]],
+) -> AsyncIterator[bytes]:
+    """
+    Encode row batches one at a time, so only a single batch is ever
+    held in memory
+    """
+    if export_format == ExportFormat.CSV:
+        return encode_csv(columns, batches)
+    return encode_ndjson(columns, batches)
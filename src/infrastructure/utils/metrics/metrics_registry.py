@@ -0,0 +1,42 @@
+from collections import defaultdict
+from typing import Any
+
+from infrastructure.base_entities.singleton import Singleton
+
+
+class MetricsRegistry(Singleton):
+    """
+    In-process counters, gauges and timings exported by /metrics
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, list[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def inc(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        timing = self._timings[name]
+        timing[0] += 1
+        timing[1] += seconds
+        timing[2] = max(timing[2], seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "timings": {
+                name: {
+                    "count": count,
+                    "sum": total,
+                    "avg": total / count if count else 0.0,
+                    "max": maximum,
+                }
+                for name, (count, total, maximum) in self._timings.items()
+            },
+        }
@@ -1,10 +1,21 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 
-from domain.user.schema import CreateUser, GetUserByUUID, LoginUser, UpdateUser, UserReturnData, UserTokenResult
+from domain.role.schema import GetRoleByUUID
+from domain.user.schema import (
+    CreateUser,
+    GetUserByUUID,
+    LoginUser,
+    SessionInfo,
+    TokenIntrospectBatch,
+    TokenIntrospectionResult,
+    UpdateUser,
+    UserReturnData,
+    UserTokenResult,
+)
 from infrastructure.base_entities.base_model import BaseResultModel
 from service.authenticate import AuthService
 
@@ -46,17 +57,23 @@ class AuthRouter:
     @api_router.post("/login", response_model=UserTokenResult)
     async def login_user(
         cmd: LoginUser,
+        request: Request,
         service=service_client,
     ) -> UserTokenResult:
-        return await service.login_user(cmd=cmd)
+        return await service.login_user(
+            cmd=cmd, client_ip=request.client.host if request.client else ""
+        )
 
     @staticmethod
     @api_router.post("/logout", response_model=BaseResultModel)
     async def logout_user(
         refresh_token: str,
+        access_token: Optional[str] = None,
         service=service_client,
     ) -> BaseResultModel:
-        return await service.logout_user(refresh_token=refresh_token)
+        return await service.logout_user(
+            refresh_token=refresh_token, access_token=access_token
+        )
 
     @staticmethod
     @api_router.get("/refresh_token", response_model=UserTokenResult)
@@ -73,3 +90,76 @@ class AuthRouter:
         service=service_client,
     ) -> BaseResultModel:
         return await service.check_auth(refresh_token=refresh_token)
+
+    @staticmethod
+    @api_router.get("/verify", response_model=BaseResultModel)
+    async def verify_access(
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.check_access(access_token=access_token)
+
+    @staticmethod
+    @api_router.post("/introspect/batch", response_model=TokenIntrospectionResult)
+    async def introspect_batch(
+        cmd: TokenIntrospectBatch,
+        service=service_client,
+    ) -> TokenIntrospectionResult:
+        return await service.introspect_batch(cmd=cmd)
+
+    @staticmethod
+    @api_router.get("/sessions", response_model=List[SessionInfo])
+    async def list_sessions(
+        access_token: str,
+        service=service_client,
+    ) -> List[SessionInfo]:
+        return await service.list_sessions(access_token=access_token)
+
+    @staticmethod
+    @api_router.delete("/sessions/{session_id}", response_model=BaseResultModel)
+    async def revoke_session(
+        session_id: str,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_session(
+            access_token=access_token, session_id=session_id
+        )
+
+    @staticmethod
+    @api_router.delete("/sessions", response_model=BaseResultModel)
+    async def revoke_all_sessions(
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_all_sessions(access_token=access_token)
+
+    @staticmethod
+    @api_router.post("/revoke/user/{user_uuid}", response_model=BaseResultModel)
+    async def revoke_user_tokens(
+        user_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_user_tokens(
+            access_token=access_token, user_uuid=GetUserByUUID(uuid=user_uuid)
+        )
+
+    @staticmethod
+    @api_router.post("/revoke/role/{role_uuid}", response_model=BaseResultModel)
+    async def revoke_role_tokens(
+        role_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_role_tokens(
+            access_token=access_token, role_uuid=GetRoleByUUID(uuid=role_uuid)
+        )
+
+    @staticmethod
+    @api_router.post("/revoke/all", response_model=BaseResultModel)
+    async def revoke_all_tokens(
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_all_tokens(access_token=access_token)
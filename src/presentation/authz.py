@@ -0,0 +1,171 @@
+from typing import List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+
+from domain.authz.schema import (
+    AuthzCheckBatch,
+    AuthzCheckResult,
+    EffectivePermissions,
+    RoleAncestor,
+    RoleMembersBatch,
+    RoleMembersResult,
+)
+from domain.permission.schema import GetPermissionByUUID
+from domain.role.schema import GetRoleByUUID
+from domain.user.schema import GetUserByUUID
+from infrastructure.base_entities.base_model import BaseResultModel
+from service.authz import AuthzService
+
+
+class AuthzRouter:
+    api_router = APIRouter(prefix="/authz", tags=["Authz"])
+    service_client: AuthzService = Depends(AuthzService)
+
+    @staticmethod
+    @api_router.get("/effective/{user_uuid}", response_model=EffectivePermissions)
+    async def get_effective(
+        user_uuid: str | UUID,
+        service=service_client,
+    ) -> EffectivePermissions:
+        return await service.get_effective(user_uuid=GetUserByUUID(uuid=user_uuid))
+
+    @staticmethod
+    @api_router.post("/check", response_model=AuthzCheckResult)
+    async def check(
+        cmd: AuthzCheckBatch,
+        service=service_client,
+    ) -> AuthzCheckResult:
+        return await service.check(cmd=cmd)
+
+    @staticmethod
+    @api_router.post(
+        "/users/{user_uuid}/roles/{role_uuid}", response_model=BaseResultModel
+    )
+    async def assign_role(
+        user_uuid: str | UUID,
+        role_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.assign_role(
+            access_token=access_token,
+            user_uuid=GetUserByUUID(uuid=user_uuid),
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+        )
+
+    @staticmethod
+    @api_router.delete(
+        "/users/{user_uuid}/roles/{role_uuid}", response_model=BaseResultModel
+    )
+    async def unassign_role(
+        user_uuid: str | UUID,
+        role_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.unassign_role(
+            access_token=access_token,
+            user_uuid=GetUserByUUID(uuid=user_uuid),
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+        )
+
+    @staticmethod
+    @api_router.post("/roles/{role_uuid}/users", response_model=RoleMembersResult)
+    async def assign_role_bulk(
+        role_uuid: str | UUID,
+        cmd: RoleMembersBatch,
+        access_token: str,
+        service=service_client,
+    ) -> RoleMembersResult:
+        return await service.assign_role_bulk(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            cmd=cmd,
+        )
+
+    @staticmethod
+    @api_router.delete("/roles/{role_uuid}/users", response_model=RoleMembersResult)
+    async def unassign_role_bulk(
+        role_uuid: str | UUID,
+        cmd: RoleMembersBatch,
+        access_token: str,
+        service=service_client,
+    ) -> RoleMembersResult:
+        return await service.unassign_role_bulk(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            cmd=cmd,
+        )
+
+    @staticmethod
+    @api_router.post(
+        "/roles/{role_uuid}/permissions/{perm_uuid}", response_model=BaseResultModel
+    )
+    async def grant_permission(
+        role_uuid: str | UUID,
+        perm_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.grant_permission(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            perm_uuid=GetPermissionByUUID(uuid=perm_uuid),
+        )
+
+    @staticmethod
+    @api_router.delete(
+        "/roles/{role_uuid}/permissions/{perm_uuid}", response_model=BaseResultModel
+    )
+    async def revoke_permission(
+        role_uuid: str | UUID,
+        perm_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.revoke_permission(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            perm_uuid=GetPermissionByUUID(uuid=perm_uuid),
+        )
+
+    @staticmethod
+    @api_router.get("/roles/{role_uuid}/ancestors", response_model=List[RoleAncestor])
+    async def get_ancestors(
+        role_uuid: str | UUID,
+        service=service_client,
+    ) -> List[RoleAncestor]:
+        return await service.get_ancestors(role_uuid=GetRoleByUUID(uuid=role_uuid))
+
+    @staticmethod
+    @api_router.post(
+        "/roles/{role_uuid}/parents/{parent_uuid}", response_model=BaseResultModel
+    )
+    async def add_parent(
+        role_uuid: str | UUID,
+        parent_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.add_parent(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            parent_uuid=GetRoleByUUID(uuid=parent_uuid),
+        )
+
+    @staticmethod
+    @api_router.delete(
+        "/roles/{role_uuid}/parents/{parent_uuid}", response_model=BaseResultModel
+    )
+    async def remove_parent(
+        role_uuid: str | UUID,
+        parent_uuid: str | UUID,
+        access_token: str,
+        service=service_client,
+    ) -> BaseResultModel:
+        return await service.remove_parent(
+            access_token=access_token,
+            role_uuid=GetRoleByUUID(uuid=role_uuid),
+            parent_uuid=GetRoleByUUID(uuid=parent_uuid),
+        )
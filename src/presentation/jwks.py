@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+
+from application.container import Container
+from infrastructure.auth.key_ring import KeyRing
+from infrastructure.config.config import settings
+
+
+class JWKSRouter:
+    api_router = APIRouter(prefix="/.well-known", tags=["JWKS"])
+    key_ring_client: KeyRing = Depends(Container.key_ring)
+
+    @staticmethod
+    @api_router.get("/jwks.json")
+    async def get_jwks(
+        request: Request,
+        key_ring=key_ring_client,
+    ) -> Response:
+        body, etag = key_ring.jwks()
+        headers = {
+            "Cache-Control": f"public, max-age={settings.AUTH.jwks_max_age}, "
+            f"stale-while-revalidate={settings.AUTH.jwks_max_age}",
+            "ETag": etag,
+        }
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=headers,
+        )
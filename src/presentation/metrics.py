@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from application.container import Container
+from infrastructure.utils.metrics.metrics_registry import MetricsRegistry
+
+
+class MetricsRouter:
+    api_router = APIRouter(prefix="/metrics", tags=["Metrics"])
+    metrics_client: MetricsRegistry = Depends(Container.metrics)
+
+    @staticmethod
+    @api_router.get("")
+    async def get_metrics(
+        metrics=metrics_client,
+    ) -> dict[str, Any]:
+        return metrics.snapshot()
@@ -1,10 +1,15 @@
-from typing import List
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 
-from domain.role.schema import CreateRole, GetRoleByUUID, RoleReturnData
+from application.container import Container
+from domain.role.schema import CreateRole, GetRoleByUUID, RoleListData, RoleReturnData
+from infrastructure.base_entities.base_model import Page
+from infrastructure.config.config import settings
+from infrastructure.database.pagination import SortOrder
+from infrastructure.server.serialization import ResponseSerializer
 from service.role import RoleService
 
 
@@ -13,22 +18,42 @@ class RoleRouter:
     output_model: BaseModel = RoleReturnData
     input_model: BaseModel = CreateRole
     service_client: RoleService = Depends(RoleService)
+    serializer_client: ResponseSerializer = Depends(Container.response_serializer)
 
     @staticmethod
     @api_router.get("/one", response_model=output_model)
     async def get(
         role_uuid: str | UUID,
         service=service_client,
+        serializer=serializer_client,
     ) -> output_model:
-        return await service.get(cmd=GetRoleByUUID(uuid=role_uuid))
+        return serializer.dump(
+            RoleReturnData, await service.get(cmd=GetRoleByUUID(uuid=role_uuid))
+        )
 
     @staticmethod
-    @api_router.get("/all", response_model=List[output_model])
+    @api_router.get("/all", response_model=Page[RoleListData])
     async def get_list(
         parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = Query(
+            settings.PAGINATION.default_limit,
+            ge=1,
+            le=settings.PAGINATION.max_limit,
+        ),
+        cursor: Optional[str] = None,
         service=service_client,
-    ) -> List[output_model]:
-        return await service.get_list(parameter=parameter)
+        serializer=serializer_client,
+    ) -> Page[RoleListData]:
+        return serializer.page(
+            await service.get_list(
+                parameter=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+                projection=serializer.enabled,
+            ),
+        )
 
     @staticmethod
     @api_router.post("/create", response_model=output_model)
@@ -1,11 +1,29 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi_filters import create_filters_from_set
 from pydantic import BaseModel
 
-from domain.user.schema import CreateUser, GetUserByUUID, UpdateUser, UserReturnData
+from application.container import Container
+from domain.user.schema import (
+    CreateUser,
+    GetUserByUUID,
+    UpdateUser,
+    UserExportColumn,
+    UserImportJob,
+    UserReturnData,
+    UserSearchFilters,
+)
+from infrastructure.base_entities.base_model import Page
+from infrastructure.config.config import settings
+from infrastructure.database.pagination import SortOrder
+from infrastructure.server.serialization import ResponseSerializer
+from infrastructure.utils.export.row_encoders import MEDIA_TYPES, ExportFormat
 from service.user import UserService
+from service.user_import import UserImportService
 
 
 class UserRouter:
@@ -13,22 +31,112 @@ class UserRouter:
     output_model: BaseModel = UserReturnData
     input_model: BaseModel = CreateUser
     service_client: UserService = Depends(UserService)
+    serializer_client: ResponseSerializer = Depends(Container.response_serializer)
+    import_client: UserImportService = Depends(UserImportService)
 
     @staticmethod
     @api_router.get("/one", response_model=output_model)
     async def show_user(
         user_uuid: str | UUID,
         service=service_client,
+        serializer=serializer_client,
     ) -> output_model:
-        return await service.get(cmd=GetUserByUUID(uuid=user_uuid))
+        return serializer.dump(
+            UserReturnData, await service.get(cmd=GetUserByUUID(uuid=user_uuid))
+        )
 
     @staticmethod
-    @api_router.get("/all", response_model=List[output_model])
+    @api_router.get("/all", response_model=Page[output_model])
     async def get_users(
         parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = Query(
+            settings.PAGINATION.default_limit,
+            ge=1,
+            le=settings.PAGINATION.max_limit,
+        ),
+        cursor: Optional[str] = None,
+        service=service_client,
+        serializer=serializer_client,
+    ) -> Page[output_model]:
+        return serializer.page(
+            await service.get_list(
+                parameter=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+                projection=serializer.enabled,
+            ),
+        )
+
+    @staticmethod
+    @api_router.get("/search", response_model=Page[output_model])
+    async def search(
+        filters: UserSearchFilters = Depends(
+            create_filters_from_set(UserSearchFilters),
+        ),
+        parameter: str = "created_at",
+        order: SortOrder = SortOrder.ASC,
+        limit: int = Query(
+            settings.PAGINATION.default_limit,
+            ge=1,
+            le=settings.PAGINATION.max_limit,
+        ),
+        cursor: Optional[str] = None,
         service=service_client,
-    ) -> List[output_model]:
-        return await service.get_list(parameter=parameter)
+        serializer=serializer_client,
+    ) -> Page[output_model]:
+        return serializer.page(
+            await service.search(
+                filters=filters,
+                parameter=parameter,
+                order=order,
+                limit=limit,
+                cursor=cursor,
+                projection=serializer.enabled,
+            ),
+        )
+
+    @staticmethod
+    @api_router.get("/export", response_class=StreamingResponse)
+    async def export(
+        export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        columns: List[UserExportColumn] = Query([]),
+        updated_since: Optional[datetime] = None,
+        service=service_client,
+    ) -> StreamingResponse:
+        return StreamingResponse(
+            service.export(
+                export_format=export_format,
+                columns=columns,
+                updated_since=updated_since,
+            ),
+            media_type=MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="users.{export_format.value}"',
+            },
+        )
+
+    @staticmethod
+    @api_router.post(
+        "/import",
+        response_model=UserImportJob,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+    async def import_users(
+        request: Request,
+        import_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+        service=import_client,
+    ) -> UserImportJob:
+        return await service.start(import_format=import_format, body=request.stream())
+
+    @staticmethod
+    @api_router.get("/import/{job_id}", response_model=UserImportJob)
+    async def import_status(
+        job_id: str,
+        service=import_client,
+    ) -> UserImportJob:
+        return await service.status(job_id=job_id)
 
     @staticmethod
     @api_router.post("/create", response_model=output_model)
@@ -1,17 +1,34 @@
 import asyncio
-from typing import Optional
+import logging
+from typing import Any, List, Optional
+from uuid import UUID
 
 from fastapi import Depends
 
 from application.container import Container
+from domain.role.schema import GetRoleByUUID
 from domain.user.registry import UserReadRepository, UserWriteRepository
-from domain.user.schema import CreateUser, GetUserByUUID, LoginUser, UpdateUser, UserReturnData, UserTokenResult
+from domain.user.schema import (
+    CreateUser,
+    GetUserByUUID,
+    LoginUser,
+    SessionInfo,
+    TokenIntrospectBatch,
+    TokenIntrospection,
+    TokenIntrospectionResult,
+    UpdateUser,
+    UserReturnData,
+    UserTokenResult,
+)
+from infrastructure.auth.login_throttle import LoginThrottle
 from infrastructure.auth.token_handler import AuthHandler
+from infrastructure.auth.unknown_logins import UnknownLoginCache
 from infrastructure.base_entities.base_model import BaseResultModel
 from infrastructure.broker.kafka import KafkaProducer
 from infrastructure.config.config import settings
-from infrastructure.exceptions.token_exceptions import Unauthorized
-from infrastructure.exceptions.user_exceptions import UserNotFound, WrongPassword
+from infrastructure.exceptions.token_exceptions import NoRights, SessionNotFound, Unauthorized
+from infrastructure.exceptions.user_exceptions import UserInactive, UserNotFound, WrongPassword
+from service.authz import AuthzService
 
 
 class AuthService:
@@ -23,14 +40,20 @@ class AuthService:
         ),
         auth_handler: AuthHandler = Depends(Container.auth_handler),
         kafka_handler: KafkaProducer = Depends(Container.producer_client),
+        login_throttle: LoginThrottle = Depends(Container.login_throttle),
+        unknown_logins: UnknownLoginCache = Depends(Container.unknown_logins),
+        authz_service: AuthzService = Depends(AuthzService),
     ):
         self.read_repo = read_repository
         self.write_repo = write_repository
         self.auth_repo = auth_handler
         self.kafka_repo = kafka_handler
+        self.login_throttle = login_throttle
+        self.unknown_logins = unknown_logins
+        self.authz_service = authz_service
 
     async def register(self, data: CreateUser) -> Optional[UserReturnData]:
-        _salted_pass = self.auth_repo.encode_pass(data.hashed_password, data.login)
+        _salted_pass = await self.auth_repo.hash_password(data.hashed_password)
         cmd = CreateUser(
             login=data.login,
             hashed_password=_salted_pass,
@@ -39,6 +62,7 @@ class AuthService:
             age=data.age,
         )
         if created_user := await self.write_repo.create(cmd=cmd):
+            await self.unknown_logins.forget(login=data.login)
             data_dict = cmd.model_dump()
             data_dict["user_uuid"] = str(created_user.uuid)
             data_dict["event_type"] = "create"
@@ -56,6 +80,7 @@ class AuthService:
         if updated_user := await self.write_repo.update(
             cmd=data, user_uuid=user_uuid.uuid
         ):
+            await self.unknown_logins.forget(login=data.login)
             data_dict = data.model_dump()
             data_dict["user_uuid"] = str(updated_user.uuid)
             data_dict["event_type"] = "update"
@@ -78,61 +103,158 @@ class AuthService:
             )
         return deleted_user
 
-    async def login_user(self, cmd: LoginUser) -> UserTokenResult:
-        user = await self.read_repo.get_by_login(login=cmd.login)
-        if not user:
+    async def login_user(self, cmd: LoginUser, client_ip: str) -> UserTokenResult:
+        await self.login_throttle.check(login=cmd.login, client_ip=client_ip)
+        if await self.unknown_logins.is_unknown(login=cmd.login):
+            raise UserNotFound
+        credentials = await self.read_repo.get_credentials_by_login(login=cmd.login)
+        if not credentials:
+            await self.unknown_logins.remember(login=cmd.login)
             raise UserNotFound
         if not await self.auth_repo.verify_password(
             password=cmd.hashed_password,
             salt=cmd.login,
-            encoded_pass=user.hashed_password,
+            encoded_pass=credentials.hashed_password,
         ):
             raise WrongPassword
-        access_token = self.auth_repo.encode_token(user_id=user.uuid)
-        refresh_token = self.auth_repo.encode_refresh_token(user_id=user.uuid)
-        await self.auth_repo.save_tokens_to_session(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            user_uuid=str(user.uuid),
+        if not credentials.is_active:
+            raise UserInactive
+        if self.auth_repo.needs_rehash(encoded_pass=credentials.hashed_password):
+            asyncio.create_task(
+                self._rehash_password(
+                    user_uuid=credentials.uuid,
+                    password=cmd.hashed_password,
+                ),
+            )
+        tokens = await self.auth_repo.create_session(
+            user_id=credentials.uuid,
+            role_uuids=credentials.role_uuids,
         )
-        return UserTokenResult(
-            access_token=access_token,
-            refresh_token=refresh_token,
+        return UserTokenResult(**tokens)
+
+    async def _rehash_password(self, user_uuid: UUID, password: str) -> None:
+        try:
+            await self.write_repo.update_password(
+                user_uuid=user_uuid,
+                hashed_password=await self.auth_repo.hash_password(password),
+            )
+        except Exception as error:
+            logging.warning(f"Не удалось обновить хэш пароля {user_uuid}: {error}")
+
+    async def logout_user(
+        self,
+        refresh_token: str,
+        access_token: Optional[str] = None,
+    ) -> BaseResultModel:
+        session = await self.auth_repo.get_session(refresh_token=refresh_token)
+        if not session:
+            raise Unauthorized
+        await self.auth_repo.revoke_session(
+            session_id=session["session_id"],
+            user_uuid=session["user_uuid"],
         )
+        if access_token:
+            payload = self.auth_repo.verify_access_token(token=access_token)
+            await self.auth_repo.revoke_access_token(payload=payload)
+        return BaseResultModel(status=True)
 
-    async def logout_user(self, refresh_token: str) -> BaseResultModel:
-        user_uuid = self.auth_repo.decode_refresh_token(token=refresh_token)
-        tokens = await self.auth_repo.get_tokens_from_session(user_uuid=user_uuid)
-        if not tokens:
+    async def refresh_token(self, refresh_token: str) -> UserTokenResult:
+        new_tokens = await self.auth_repo.rotate_session(refresh_token=refresh_token)
+        if not new_tokens:
             raise Unauthorized
-        if tokens["refresh_token"] == refresh_token:
-            await self.auth_repo.del_tokes_from_session(user_uuid=user_uuid)
+        return UserTokenResult(
+            access_token=new_tokens["new_access_token"],
+            refresh_token=new_tokens["new_refresh_token"],
+        )
+
+    async def check_auth(self, refresh_token: str) -> BaseResultModel:
+        if await self.auth_repo.get_session(refresh_token=refresh_token):
             return BaseResultModel(status=True)
         raise Unauthorized
 
-    async def refresh_token(self, refresh_token: str) -> UserTokenResult:
-        user_uuid = self.auth_repo.decode_refresh_token(token=refresh_token)
-        tokens = await self.auth_repo.get_tokens_from_session(user_uuid=user_uuid)
-        if not tokens:
+    async def _authorized_payload(self, access_token: str) -> dict[str, Any]:
+        payload = self.auth_repo.verify_access_token(token=access_token)
+        if await self.auth_repo.is_access_token_revoked(payload=payload):
             raise Unauthorized
-        if tokens["refresh_token"] == refresh_token:
-            new_tokens = self.auth_repo.refresh_token(refresh_token=refresh_token)
-            await self.auth_repo.save_tokens_to_session(
-                access_token=new_tokens["new_access_token"],
-                refresh_token=new_tokens["new_refresh_token"],
-                user_uuid=user_uuid,
-            )
-            return UserTokenResult(
-                access_token=new_tokens["new_access_token"],
-                refresh_token=new_tokens["new_refresh_token"],
+        return payload
+
+    async def check_access(self, access_token: str) -> BaseResultModel:
+        await self._authorized_payload(access_token=access_token)
+        return BaseResultModel(status=True)
+
+    async def introspect_batch(
+        self, cmd: TokenIntrospectBatch
+    ) -> TokenIntrospectionResult:
+        results = await self.auth_repo.introspect_tokens(tokens=cmd.tokens)
+        return TokenIntrospectionResult(
+            results=[TokenIntrospection(**result) for result in results],
+        )
+
+    async def list_sessions(self, access_token: str) -> List[SessionInfo]:
+        payload = await self._authorized_payload(access_token=access_token)
+        sessions = await self.auth_repo.sessions.list_sessions(user_uuid=payload["sub"])
+        return [
+            SessionInfo(
+                session_id=session["session_id"],
+                created_at=session["created_at"],
+                expires_at=session["expires_at"],
+                current=session["session_id"] == payload.get("sid"),
             )
-        raise Unauthorized
+            for session in sessions
+        ]
 
-    async def check_auth(self, refresh_token: str) -> BaseResultModel:
-        user_uuid = self.auth_repo.decode_refresh_token(token=refresh_token)
-        tokens = await self.auth_repo.get_tokens_from_session(user_uuid=user_uuid)
-        if not tokens:
-            raise Unauthorized
-        if tokens["refresh_token"] == refresh_token:
+    async def revoke_session(
+        self, access_token: str, session_id: str
+    ) -> BaseResultModel:
+        payload = await self._authorized_payload(access_token=access_token)
+        if await self.auth_repo.revoke_session(
+            session_id=session_id,
+            user_uuid=payload["sub"],
+        ):
             return BaseResultModel(status=True)
-        raise Unauthorized
+        raise SessionNotFound
+
+    async def revoke_all_sessions(self, access_token: str) -> BaseResultModel:
+        payload = await self._authorized_payload(access_token=access_token)
+        await self.auth_repo.revoke_all_sessions(user_uuid=payload["sub"])
+        return BaseResultModel(status=True)
+
+    async def _require_revoke_permission(
+        self, access_token: str, own_user_uuid: Optional[UUID] = None
+    ) -> None:
+        """
+        Bulk revocation needs AUTH.REVOKE_PERMISSION among the caller's
+        effective permissions; users may always revoke their own tokens
+        """
+        payload = await self._authorized_payload(access_token=access_token)
+        if own_user_uuid and payload["sub"] == str(own_user_uuid):
+            return
+        effective = await self.authz_service.get_effective(
+            user_uuid=GetUserByUUID(uuid=payload["sub"]),
+        )
+        if not any(
+            permission.name == settings.AUTH.REVOKE_PERMISSION
+            for permission in effective.permissions
+        ):
+            raise NoRights
+
+    async def revoke_user_tokens(
+        self, access_token: str, user_uuid: GetUserByUUID
+    ) -> BaseResultModel:
+        await self._require_revoke_permission(
+            access_token=access_token, own_user_uuid=user_uuid.uuid
+        )
+        await self.auth_repo.generations.bump_user(user_uuid=str(user_uuid.uuid))
+        return BaseResultModel(status=True)
+
+    async def revoke_role_tokens(
+        self, access_token: str, role_uuid: GetRoleByUUID
+    ) -> BaseResultModel:
+        await self._require_revoke_permission(access_token=access_token)
+        await self.auth_repo.generations.bump_role(role_uuid=str(role_uuid.uuid))
+        return BaseResultModel(status=True)
+
+    async def revoke_all_tokens(self, access_token: str) -> BaseResultModel:
+        await self._require_revoke_permission(access_token=access_token)
+        await self.auth_repo.generations.bump_global()
+        return BaseResultModel(status=True)
@@ -0,0 +1,333 @@
+import asyncio
+import time
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from application.container import Container
+from domain.authz.registry import AuthzReadRepository, AuthzWriteRepository
+from domain.authz.schema import (
+    AuthzCheckBatch,
+    AuthzCheckResult,
+    AuthzDecision,
+    EffectivePermissions,
+    RoleAncestor,
+    RoleMemberOutcome,
+    RoleMembersBatch,
+    RoleMembersResult,
+)
+from domain.permission.schema import GetPermissionByUUID
+from domain.role.schema import GetRoleByUUID
+from domain.user.schema import GetUserByUUID
+from infrastructure.auth.permission_bits import PermissionBitIndex
+from infrastructure.auth.permission_cache import EffectivePermissionCache
+from infrastructure.auth.token_handler import AuthHandler
+from infrastructure.base_entities.base_model import BaseResultModel
+from infrastructure.broker.kafka import KafkaProducer
+from infrastructure.config.config import settings
+from infrastructure.exceptions.token_exceptions import NoRights, Unauthorized
+
+
+class AuthzService:
+    def __init__(
+        self,
+        read_repository: AuthzReadRepository = Depends(Container.authz_read_repository),
+        write_repository: AuthzWriteRepository = Depends(
+            Container.authz_write_repository,
+        ),
+        permission_cache: EffectivePermissionCache = Depends(
+            Container.permission_cache,
+        ),
+        permission_bits: PermissionBitIndex = Depends(Container.permission_bits),
+        auth_handler: AuthHandler = Depends(Container.auth_handler),
+        kafka_handler: KafkaProducer = Depends(Container.producer_client),
+    ):
+        self.read_repo = read_repository
+        self.write_repo = write_repository
+        self.permission_cache = permission_cache
+        self.permission_bits = permission_bits
+        self.auth_repo = auth_handler
+        self.kafka_repo = kafka_handler
+
+    async def _resolve_many(self, user_uuids: list[UUID]) -> dict[UUID, dict[str, Any]]:
+        """
+        Load users' permissions from the database in one batch and cache
+        them together with their bitset (hex) over the interned permission
+        indexes and the epoch of those indexes. Versions are read first so that sets invalidated meanwhile
+        are not cached
+        """
+        versions = await self.permission_cache.versions(user_uuids=user_uuids)
+        effectives = await self.read_repo.get_effective_many(user_uuids=user_uuids)
+        indexes = await self.permission_bits.intern(
+            permission.uuid
+            for effective in effectives.values()
+            for permission in effective.permissions
+        )
+        resolved = {}
+        for user_uuid, effective in effectives.items():
+            mask = 0
+            for permission in effective.permissions:
+                mask |= 1 << indexes[str(permission.uuid)]
+            resolved[user_uuid] = {
+                **effective.model_dump(mode="json"),
+                "bits": format(mask, "x"),
+                "epoch": self.permission_bits.epoch,
+            }
+        await self.permission_cache.put_many(effectives=resolved, versions=versions)
+        return resolved
+
+    async def _resolve(self, user_uuid: UUID) -> dict[str, Any]:
+        return (await self._resolve_many(user_uuids=[user_uuid]))[user_uuid]
+
+    async def get_effective(self, user_uuid: GetUserByUUID) -> EffectivePermissions:
+        if cached := await self.permission_cache.get(user_uuid=user_uuid.uuid):
+            return EffectivePermissions(**cached)
+        return EffectivePermissions(**await self._resolve(user_uuid=user_uuid.uuid))
+
+    @staticmethod
+    def _is_current_mask(effective: dict[str, Any], epoch: Optional[str]) -> bool:
+        """
+        A cached mask is only valid under the bit index epoch it was built in
+        (an empty one under any)
+        """
+        return "bits" in effective and (
+            effective["bits"] == "0" or effective.get("epoch") == epoch
+        )
+
+    async def _check(self, cmd: AuthzCheckBatch) -> Optional[AuthzCheckResult]:
+        """
+        Answer the batch, or None if the bit index epoch changed meanwhile
+        """
+        epoch = await self.permission_bits.sync()
+        user_uuids = list({check.user_uuid for check in cmd.checks})
+        cached = await self.permission_cache.get_many(user_uuids=user_uuids)
+        missing = [
+            user_uuid
+            for user_uuid in user_uuids
+            if not self._is_current_mask(cached.get(str(user_uuid), {}), epoch)
+        ]
+        if missing:
+            resolved = await self._resolve_many(user_uuids=missing)
+            cached.update(
+                (str(user_uuid), resolved[user_uuid]) for user_uuid in missing
+            )
+        user_bits = {
+            user_uuid: int(cached[str(user_uuid)]["bits"], 16)
+            for user_uuid in user_uuids
+        }
+        permission_bits = await self.permission_bits.lookup(
+            check.permission_uuid for check in cmd.checks
+        )
+        if self.permission_bits.epoch != epoch:
+            return None
+        decisions = []
+        for check in cmd.checks:
+            index = permission_bits.get(str(check.permission_uuid))
+            decisions.append(
+                AuthzDecision(
+                    user_uuid=check.user_uuid,
+                    permission_uuid=check.permission_uuid,
+                    allowed=index is not None
+                    and bool(user_bits[check.user_uuid] >> index & 1),
+                ),
+            )
+        return AuthzCheckResult(results=decisions)
+
+    async def check(self, cmd: AuthzCheckBatch) -> AuthzCheckResult:
+        while (result := await self._check(cmd)) is None:
+            pass
+        return result
+
+    async def _require_admin_permission(self, access_token: str) -> None:
+        """
+        Role, permission and hierarchy changes need AUTHZ.ADMIN_PERMISSION
+        among the caller's effective permissions
+        """
+        payload = self.auth_repo.verify_access_token(token=access_token)
+        if await self.auth_repo.is_access_token_revoked(payload=payload):
+            raise Unauthorized
+        effective = await self.get_effective(
+            user_uuid=GetUserByUUID(uuid=payload["sub"]),
+        )
+        if not any(
+            permission.name == settings.AUTHZ.ADMIN_PERMISSION
+            for permission in effective.permissions
+        ):
+            raise NoRights
+
+    async def assign_role(
+        self, access_token: str, user_uuid: GetUserByUUID, role_uuid: GetRoleByUUID
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.assign_role(
+            user_uuid=user_uuid.uuid,
+            role_uuid=role_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(user_uuid.uuid)
+        return BaseResultModel(status=changed)
+
+    async def unassign_role(
+        self, access_token: str, user_uuid: GetUserByUUID, role_uuid: GetRoleByUUID
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.unassign_role(
+            user_uuid=user_uuid.uuid,
+            role_uuid=role_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(user_uuid.uuid)
+        return BaseResultModel(status=changed)
+
+    async def _members_changed(
+        self, event_type: str, role_uuid: UUID, user_uuids: Iterable[UUID]
+    ) -> None:
+        """
+        One cache invalidation and one event for the whole batch
+        """
+        if not (user_uuids := list(user_uuids)):
+            return
+        await self.permission_cache.invalidate(*user_uuids)
+        asyncio.create_task(
+            self.kafka_repo.transactional_send_message(
+                message={
+                    "event_type": event_type,
+                    "role_uuid": str(role_uuid),
+                    "user_uuids": [str(user_uuid) for user_uuid in user_uuids],
+                },
+                topic=settings.KAFKA.topics.register_topic,
+            ),
+        )
+
+    @staticmethod
+    def _members_result(
+        role_uuid: UUID,
+        user_uuids: list[UUID],
+        statuses: dict[UUID, str],
+        default: str,
+        changed: int,
+        elapsed: float,
+    ) -> RoleMembersResult:
+        return RoleMembersResult(
+            role_uuid=role_uuid,
+            changed=changed,
+            elapsed_ms=elapsed * 1000,
+            assignments_per_second=len(user_uuids) / elapsed if elapsed else 0.0,
+            results=[
+                RoleMemberOutcome(
+                    user_uuid=user_uuid,
+                    status=statuses.get(user_uuid, default),
+                )
+                for user_uuid in user_uuids
+            ],
+        )
+
+    async def assign_role_bulk(
+        self, access_token: str, role_uuid: GetRoleByUUID, cmd: RoleMembersBatch
+    ) -> RoleMembersResult:
+        await self._require_admin_permission(access_token=access_token)
+        user_uuids = list(dict.fromkeys(cmd.user_uuids))
+        started = time.perf_counter()
+        found, assigned = await self.write_repo.assign_role_bulk(
+            role_uuid=role_uuid.uuid,
+            user_uuids=user_uuids,
+        )
+        elapsed = time.perf_counter() - started
+        await self._members_changed("role_assign", role_uuid.uuid, assigned)
+        statuses = {user_uuid: "unchanged" for user_uuid in found}
+        statuses.update((user_uuid, "assigned") for user_uuid in assigned)
+        return self._members_result(
+            role_uuid.uuid,
+            user_uuids,
+            statuses,
+            "user_not_found",
+            len(assigned),
+            elapsed,
+        )
+
+    async def unassign_role_bulk(
+        self, access_token: str, role_uuid: GetRoleByUUID, cmd: RoleMembersBatch
+    ) -> RoleMembersResult:
+        await self._require_admin_permission(access_token=access_token)
+        user_uuids = list(dict.fromkeys(cmd.user_uuids))
+        started = time.perf_counter()
+        unassigned = await self.write_repo.unassign_role_bulk(
+            role_uuid=role_uuid.uuid,
+            user_uuids=user_uuids,
+        )
+        elapsed = time.perf_counter() - started
+        await self._members_changed("role_unassign", role_uuid.uuid, unassigned)
+        return self._members_result(
+            role_uuid.uuid,
+            user_uuids,
+            {user_uuid: "unassigned" for user_uuid in unassigned},
+            "not_assigned",
+            len(unassigned),
+            elapsed,
+        )
+
+    async def grant_permission(
+        self,
+        access_token: str,
+        role_uuid: GetRoleByUUID,
+        perm_uuid: GetPermissionByUUID,
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.grant_permission(
+            role_uuid=role_uuid.uuid,
+            perm_uuid=perm_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(
+                *await self.read_repo.get_role_user_uuids(role_uuid=role_uuid.uuid),
+            )
+        return BaseResultModel(status=changed)
+
+    async def revoke_permission(
+        self,
+        access_token: str,
+        role_uuid: GetRoleByUUID,
+        perm_uuid: GetPermissionByUUID,
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.revoke_permission(
+            role_uuid=role_uuid.uuid,
+            perm_uuid=perm_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(
+                *await self.read_repo.get_role_user_uuids(role_uuid=role_uuid.uuid),
+            )
+        return BaseResultModel(status=changed)
+
+    async def get_ancestors(self, role_uuid: GetRoleByUUID) -> list[RoleAncestor]:
+        return await self.read_repo.get_ancestors(role_uuid=role_uuid.uuid)
+
+    async def add_parent(
+        self, access_token: str, role_uuid: GetRoleByUUID, parent_uuid: GetRoleByUUID
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.add_parent(
+            role_uuid=role_uuid.uuid,
+            parent_uuid=parent_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(
+                *await self.read_repo.get_role_user_uuids(role_uuid=role_uuid.uuid),
+            )
+        return BaseResultModel(status=changed)
+
+    async def remove_parent(
+        self, access_token: str, role_uuid: GetRoleByUUID, parent_uuid: GetRoleByUUID
+    ) -> BaseResultModel:
+        await self._require_admin_permission(access_token=access_token)
+        changed = await self.write_repo.remove_parent(
+            role_uuid=role_uuid.uuid,
+            parent_uuid=parent_uuid.uuid,
+        )
+        if changed:
+            await self.permission_cache.invalidate(
+                *await self.read_repo.get_role_user_uuids(role_uuid=role_uuid.uuid),
+            )
+        return BaseResultModel(status=changed)
@@ -1,10 +1,14 @@
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import Depends
 
 from application.container import Container
+from domain.authz.registry import AuthzReadRepository
 from domain.permission.registry import PermissionReadRepository, PermissionWriteRepository
 from domain.permission.schema import CreatePermission, GetPermissionByUUID, PermissionReturnData
+from infrastructure.auth.permission_cache import EffectivePermissionCache
+from infrastructure.base_entities.base_model import Page
+from infrastructure.database.pagination import SortOrder
 
 
 class PermissionService:
@@ -16,15 +20,36 @@ class PermissionService:
         write_repository: PermissionWriteRepository = Depends(
             Container.perm_write_repository,
         ),
+        authz_repository: AuthzReadRepository = Depends(
+            Container.authz_read_repository,
+        ),
+        permission_cache: EffectivePermissionCache = Depends(
+            Container.permission_cache,
+        ),
     ):
         self.read_repo = read_repository
         self.write_repo = write_repository
+        self.authz_repo = authz_repository
+        self.permission_cache = permission_cache
 
     async def get(self, cmd: GetPermissionByUUID) -> Optional[PermissionReturnData]:
-        raise await self.read_repo.get(perm_uuid=cmd.uuid)
+        return await self.read_repo.get(perm_uuid=cmd.uuid)
 
-    async def get_list(self, parameter: str) -> Optional[List[PermissionReturnData]]:
-        return await self.read_repo.get_list(parameter=parameter)
+    async def get_list(
+        self,
+        parameter: str,
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str],
+        projection: bool = False,
+    ) -> Page[PermissionReturnData]:
+        return await self.read_repo.get_list(
+            parameter=parameter,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            projection=projection,
+        )
 
     async def create(self, data: CreatePermission) -> Optional[PermissionReturnData]:
 
@@ -33,9 +58,24 @@ class PermissionService:
     async def update(
         self, data: CreatePermission, perm_uuid: GetPermissionByUUID
     ) -> Optional[PermissionReturnData]:
-        return await self.write_repo.update(cmd=data, perm_uuid=perm_uuid.uuid)
+        updated_permission = await self.write_repo.update(
+            cmd=data, perm_uuid=perm_uuid.uuid
+        )
+        if updated_permission:
+            await self.permission_cache.invalidate(
+                *await self.authz_repo.get_permission_user_uuids(
+                    perm_uuid=perm_uuid.uuid
+                ),
+            )
+        return updated_permission
 
     async def delete(
         self, perm_uuid: GetPermissionByUUID
     ) -> Optional[PermissionReturnData]:
-        return await self.write_repo.delete(perm_uuid=perm_uuid.uuid)
+        user_uuids = await self.authz_repo.get_permission_user_uuids(
+            perm_uuid=perm_uuid.uuid
+        )
+        deleted_permission = await self.write_repo.delete(perm_uuid=perm_uuid.uuid)
+        if deleted_permission:
+            await self.permission_cache.invalidate(*user_uuids)
+        return deleted_permission
@@ -1,10 +1,14 @@
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import Depends
 
 from application.container import Container
+from domain.authz.registry import AuthzReadRepository, AuthzWriteRepository
 from domain.role.registry import RoleReadRepository, RoleWriteRepository
-from domain.role.schema import CreateRole, GetRoleByUUID, RoleReturnData
+from domain.role.schema import CreateRole, GetRoleByUUID, RoleListData, RoleReturnData
+from infrastructure.auth.permission_cache import EffectivePermissionCache
+from infrastructure.base_entities.base_model import Page
+from infrastructure.database.pagination import SortOrder
 
 
 class RoleService:
@@ -14,15 +18,40 @@ class RoleService:
         write_repository: RoleWriteRepository = Depends(
             Container.role_write_repository,
         ),
+        authz_repository: AuthzReadRepository = Depends(
+            Container.authz_read_repository,
+        ),
+        authz_write_repository: AuthzWriteRepository = Depends(
+            Container.authz_write_repository,
+        ),
+        permission_cache: EffectivePermissionCache = Depends(
+            Container.permission_cache,
+        ),
     ):
         self.read_repo = read_repository
         self.write_repo = write_repository
+        self.authz_repo = authz_repository
+        self.authz_write_repo = authz_write_repository
+        self.permission_cache = permission_cache
 
     async def get(self, cmd: GetRoleByUUID) -> Optional[RoleReturnData]:
-        raise await self.read_repo.get(role_uuid=cmd.uuid)
+        return await self.read_repo.get(role_uuid=cmd.uuid)
 
-    async def get_list(self, parameter: str) -> Optional[List[RoleReturnData]]:
-        return await self.read_repo.get_list(parameter=parameter)
+    async def get_list(
+        self,
+        parameter: str,
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str],
+        projection: bool = False,
+    ) -> Page[RoleListData]:
+        return await self.read_repo.get_list(
+            parameter=parameter,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            projection=projection,
+        )
 
     async def create(self, data: CreateRole) -> Optional[RoleReturnData]:
         return await self.write_repo.create(cmd=data)
@@ -33,4 +62,8 @@ class RoleService:
         return await self.write_repo.update(cmd=data, role_uuid=role_uuid.uuid)
 
     async def delete(self, role_uuid: GetRoleByUUID) -> Optional[RoleReturnData]:
-        return await self.write_repo.delete(role_uuid=role_uuid.uuid)
+        user_uuids = await self.authz_repo.get_role_user_uuids(role_uuid=role_uuid.uuid)
+        deleted_role = await self.authz_write_repo.delete_role(role_uuid=role_uuid.uuid)
+        if deleted_role:
+            await self.permission_cache.invalidate(*user_uuids)
+        return deleted_role
@@ -1,15 +1,26 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
 
 from fastapi import Depends
 
 from application.container import Container
 from domain.user.registry import UserReadRepository, UserWriteRepository
-from domain.user.schema import CreateUser, GetUserByUUID, UpdateUser, UserReturnData
+from domain.user.schema import (
+    CreateUser,
+    GetUserByUUID,
+    UpdateUser,
+    UserExportColumn,
+    UserReturnData,
+    UserSearchFilters,
+)
 from infrastructure.auth.token_handler import AuthHandler
-from infrastructure.base_entities.base_model import BaseResultModel
+from infrastructure.auth.unknown_logins import UnknownLoginCache
+from infrastructure.base_entities.base_model import BaseResultModel, Page
 from infrastructure.broker.kafka import KafkaProducer
+from infrastructure.database.pagination import SortOrder
 from infrastructure.exceptions.token_exceptions import Unauthorized
 from infrastructure.exceptions.user_exceptions import UserNotFound, WrongPassword
+from infrastructure.utils.export.row_encoders import ExportFormat, encode_rows
 
 
 class UserService:
@@ -21,27 +32,82 @@ class UserService:
         ),
         auth_handler: AuthHandler = Depends(Container.auth_handler),
         kafka_handler: KafkaProducer = Depends(Container.producer_client),
+        unknown_logins: UnknownLoginCache = Depends(Container.unknown_logins),
     ):
         self.read_repo = read_repository
         self.write_repo = write_repository
         self.auth_repo = auth_handler
         self.kafka_repo = kafka_handler
+        self.unknown_logins = unknown_logins
 
     async def get(self, cmd: GetUserByUUID) -> Optional[UserReturnData]:
         if result := await self.read_repo.get(user_uuid=cmd.uuid):
             return result
         raise UserNotFound
 
-    async def get_list(self, parameter: str) -> Optional[List[UserReturnData]]:
-        return await self.read_repo.get_list(parameter=parameter)
+    async def get_list(
+        self,
+        parameter: str,
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str],
+        projection: bool = False,
+    ) -> Page[UserReturnData]:
+        return await self.read_repo.get_list(
+            parameter=parameter,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            projection=projection,
+        )
+
+    async def search(
+        self,
+        filters: UserSearchFilters,
+        parameter: str,
+        order: SortOrder,
+        limit: int,
+        cursor: Optional[str],
+        projection: bool = False,
+    ) -> Page[UserReturnData]:
+        return await self.read_repo.search(
+            filters=filters,
+            parameter=parameter,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            projection=projection,
+        )
+
+    def export(
+        self,
+        export_format: ExportFormat,
+        columns: Sequence[UserExportColumn],
+        updated_since: Optional[datetime],
+    ) -> AsyncIterator[bytes]:
+        columns = list(dict.fromkeys(columns)) or list(UserExportColumn)
+        return encode_rows(
+            export_format,
+            [column.value for column in columns],
+            self.read_repo.stream_columns(
+                columns=columns,
+                updated_since=updated_since,
+            ),
+        )
 
     async def create(self, data: CreateUser) -> Optional[UserReturnData]:
-        return await self.write_repo.create(cmd=data)
+        if created_user := await self.write_repo.create(cmd=data):
+            await self.unknown_logins.forget(login=data.login)
+        return created_user
 
     async def update(
         self, data: UpdateUser, user_uuid: GetUserByUUID
     ) -> Optional[UserReturnData]:
-        return await self.write_repo.update(cmd=data, user_uuid=user_uuid.uuid)
+        if updated_user := await self.write_repo.update(
+            cmd=data, user_uuid=user_uuid.uuid
+        ):
+            await self.unknown_logins.forget(login=data.login)
+        return updated_user
 
     async def delete(self, user_uuid: GetUserByUUID) -> Optional[UserReturnData]:
         return await self.write_repo.delete(user_uuid=user_uuid.uuid)
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator
+from uuid import uuid4
+
+import orjson
+from fastapi import Depends
+from pydantic import ValidationError
+
+from application.container import Container
+from domain.user.registry import UserWriteRepository
+from domain.user.schema import CreateUser, UserImportError, UserImportJob, UserImportStatus
+from infrastructure.auth.token_handler import AuthHandler
+from infrastructure.auth.unknown_logins import UnknownLoginCache
+from infrastructure.broker.kafka import KafkaProducer
+from infrastructure.cache.import_jobs import ImportJobStore
+from infrastructure.config.config import settings
+from infrastructure.exceptions.token_exceptions import HashingUnavailable
+from infrastructure.exceptions.user_exceptions import ImportJobNotFound
+from infrastructure.utils.asyncio.asyncio_handlers import safe_gather
+from infrastructure.utils.export.row_decoders import DecodedRow, decode_rows
+from infrastructure.utils.export.row_encoders import ExportFormat
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+async def _read_chunks(spool: IO[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    while chunk := spool.read(chunk_size):
+        yield chunk
+
+
+class UserImportService:
+    def __init__(
+        self,
+        write_repository: UserWriteRepository = Depends(
+            Container.user_write_repository,
+        ),
+        auth_handler: AuthHandler = Depends(Container.auth_handler),
+        kafka_handler: KafkaProducer = Depends(Container.producer_client),
+        unknown_logins: UnknownLoginCache = Depends(Container.unknown_logins),
+        import_jobs: ImportJobStore = Depends(Container.user_import_jobs),
+    ):
+        self.write_repo = write_repository
+        self.auth_repo = auth_handler
+        self.kafka_repo = kafka_handler
+        self.unknown_logins = unknown_logins
+        self.import_jobs = import_jobs
+
+    async def start(
+        self, import_format: ExportFormat, body: AsyncIterator[bytes]
+    ) -> UserImportJob:
+        """
+        Spool the upload and import it in the background: the request only
+        waits for the bytes, hashing the passwords is what takes the time
+        """
+        spool = SpooledTemporaryFile(max_size=settings.USER_IMPORT.spool_size)
+        async for chunk in body:
+            spool.write(chunk)
+        spool.seek(0)
+        job = UserImportJob(
+            job_id=uuid4().hex,
+            status=UserImportStatus.pending,
+            format=import_format.value,
+            created_at=datetime.now(),
+        )
+        await self.import_jobs.save(
+            job.job_id,
+            **job.model_dump(mode="json", include={"status", "format", "created_at"}),
+        )
+        self.import_jobs.run(self._run(job.job_id, import_format, spool))
+        return job
+
+    async def status(self, job_id: str) -> UserImportJob:
+        if not (stored := await self.import_jobs.get(job_id)):
+            raise ImportJobNotFound
+        job, errors = stored
+        return UserImportJob(
+            job_id=job_id,
+            errors=[orjson.loads(error) for error in errors],
+            **job,
+        )
+
+    async def _run(
+        self, job_id: str, import_format: ExportFormat, spool: IO[bytes]
+    ) -> None:
+        status, error = UserImportStatus.completed, None
+        try:
+            await self.import_jobs.save(job_id, status=UserImportStatus.running.value)
+            async for batch in decode_rows(
+                import_format,
+                _read_chunks(spool, settings.USER_IMPORT.read_chunk_size),
+                settings.USER_IMPORT.batch_size,
+            ):
+                await self._import_batch(job_id, batch)
+        except asyncio.CancelledError:
+            status, error = UserImportStatus.failed, "interrupted by shutdown"
+            raise
+        except Exception as exc:
+            logging.error(f"Ошибка импорта пользователей {job_id}: {exc}")
+            status, error = UserImportStatus.failed, str(exc)
+        finally:
+            spool.close()
+            await self.import_jobs.save(
+                job_id,
+                status=status.value,
+                finished_at=datetime.now().isoformat(),
+                **({"error": error} if error else {}),
+            )
+
+    async def _hash_chunk(self, passwords: list[str]) -> list[str]:
+        # Logins share the pool; back off instead of failing the import
+        while True:
+            try:
+                return await self.auth_repo.hash_passwords(passwords)
+            except HashingUnavailable:
+                await asyncio.sleep(settings.USER_IMPORT.hash_retry_delay)
+
+    async def _hash(self, passwords: list[str]) -> list[str]:
+        """
+        Chunks run in parallel on the hashing pool, but at most
+        `hash_concurrency` at a time so logins keep free workers
+        """
+        size = settings.USER_IMPORT.hash_chunk_size
+        chunks = await safe_gather(
+            *(
+                self._hash_chunk(passwords[start : start + size])
+                for start in range(0, len(passwords), size)
+            ),
+            parallelism_size=settings.USER_IMPORT.hash_concurrency,
+        )
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    async def _import_batch(self, job_id: str, batch: list[DecodedRow]) -> None:
+        errors: list[UserImportError] = []
+        users: dict[int, CreateUser] = {}
+        for line, record, error in batch:
+            if error is None:
+                try:
+                    users[line] = CreateUser.model_validate(record)
+                    continue
+                except ValidationError as exc:
+                    error = _validation_message(exc)
+            errors.append(
+                UserImportError(
+                    line=line,
+                    error=error,
+                    login=(
+                        str(record["login"]) if record and "login" in record else None
+                    ),
+                ),
+            )
+        invalid = len(errors)
+
+        events: list[dict] = []
+        if users:
+            hashed = await self._hash([user.hashed_password for user in users.values()])
+            rows = {
+                line: (
+                    line,
+                    user.login,
+                    password,
+                    user.email,
+                    user.age,
+                    user.phone_number,
+                )
+                for (line, user), password in zip(users.items(), hashed)
+            }
+            for line, login, reason, user_uuid in await self.write_repo.import_batch(
+                rows=list(rows.values()),
+            ):
+                if user_uuid is None:
+                    errors.append(
+                        UserImportError(
+                            line=line,
+                            error=reason or "already_exists",
+                            login=login,
+                        ),
+                    )
+                    continue
+                # Same event as a single registration
+                event = users[line].model_dump()
+                event["hashed_password"] = rows[line][2]
+                event["user_uuid"] = str(user_uuid)
+                event["event_type"] = "create"
+                events.append(event)
+        if events:
+            await self.unknown_logins.forget_many(event["login"] for event in events)
+            await self.kafka_repo.transactional_send_batch(
+                messages=events,
+                topic=settings.KAFKA.topics.register_topic,
+            )
+
+        await self.import_jobs.progress(
+            job_id,
+            counters={
+                "rows": len(batch),
+                "inserted": len(events),
+                "invalid": invalid,
+                "rejected": len(errors) - invalid,
+            },
+            errors=[orjson.dumps(error.model_dump()).decode() for error in errors],
+        )